@@ -4,6 +4,8 @@ import numpy as np
 import pandas as pd
 
 import phuzzy.contrib.tgo
+from phuzzy.expression import CachedExpression
+from phuzzy.fuzzyarray import FuzzyArray
 
 
 class FuzzyAnalysis(object):
@@ -51,11 +53,17 @@ class FuzzyAnalysis(object):
         """
         self._designvars.extend(designvars)
 
-    def eval(self, ntgo=1000):
+    def eval(self, ntgo=1000, method="tgo", **kwargs):
         """evaluate Function
 
+        :param ntgo: number of tgo sampling points (method="tgo")
+        :param method: "tgo" (interval arithmetic) or "vertex" (see eval_vertex)
         :return: FuzzyNumber
         """
+        if method == "vertex":
+            return self.eval_vertex(**kwargs)
+        elif method != "tgo":
+            raise ValueError("unknown method '{}'".format(method))
 
         bounds = [(x.min(), x.max()) for x in self.designvars]
 
@@ -76,6 +84,57 @@ class FuzzyAnalysis(object):
         print("!z0", z.df)
         return z
 
+    def eval_vertex(self, vectorized=True, check_monotonicity=False, n_check=100, seed=None):
+        """evaluate Function at the vertices of all alpha level boxes
+
+        The bounds of a function which is monotonic in each design variable are
+        found at the 2**d vertices of the alpha level box (vertex method). All
+        vertices of all alpha levels are evaluated in one call
+
+        f(X) with X.shape = (d, number_of_alpha_levels * 2**d)
+
+        :param vectorized: function accepts arrays (else it is called for each vertex)
+        :param check_monotonicity: check random points inside the alpha level boxes
+        :param n_check: number of check points per alpha level
+        :param seed: random seed of the check points
+        :return: FuzzyNumber
+        """
+        designvars = FuzzyArray.from_fuzzy_numbers(self.designvars)
+        bounds = designvars.bounds
+        d = len(designvars)
+        n = designvars.number_of_alpha_levels
+
+        # vertex k takes the right bound of variable i, if bit i of k is set
+        corners = (np.arange(2 ** d)[None, :] >> np.arange(d)[:, None]) & 1
+        X = bounds[np.arange(d)[:, None, None], np.arange(n)[None, :, None], corners[:, None, :]]
+        fun = self._eval_function(X.reshape(d, -1), vectorized).reshape(n, -1)
+        l = fun.min(axis=1)
+        r = fun.max(axis=1)
+
+        if check_monotonicity is True:
+            u = np.random.RandomState(seed).uniform(size=(d, n, int(n_check)))
+            X = bounds[..., :1] + u * (bounds[..., 1:] - bounds[..., :1])
+            fun = self._eval_function(X.reshape(d, -1), vectorized).reshape(n, -1)
+            tol = 1e-9 * np.maximum(1., np.maximum(abs(l), abs(r)))
+            if np.any(fun < (l - tol)[:, None]) or np.any(fun > (r + tol)[:, None]):
+                raise ValueError("function is not monotonic, vertex method is not applicable")
+
+        z = phuzzy.FuzzyNumber(name=getattr(self.function, "__name__", "z"), number_of_alpha_levels=n)
+        z.values = np.column_stack((designvars.alpha, l, r))
+        return z
+
+    def _eval_function(self, X, vectorized=True):
+        """evaluate function on crisp points
+
+        :param X: points (d, number_of_points)
+        :param vectorized: function accepts arrays (a CachedExpression is called point by point)
+        :return: function values (number_of_points,)
+        """
+        if vectorized is True and not isinstance(self.function, CachedExpression):
+            return np.broadcast_to(np.asarray(self.function(X), dtype=float), X.shape[1:])
+        # points shared by alpha levels (e.g. constant bounds) are read from the cache
+        return np.array([self.function(x) for x in X.T], dtype=float)
+
     def lcefa(self):
         """Local cost effectivness fuzzy analysis
 
@@ -4,39 +4,203 @@
 
 import phuzzy
 from phuzzy.mpl import MPL_Mixin
-from phuzzy.shapes import FuzzyNumber
+from phuzzy.shapes import FuzzyNumber, get_polygon_centroid
 
-from asteval import Interpreter
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 import numpy as np
 import pandas as pd
 import xarray as xr
-from asteval import Interpreter
+from asteval import make_symbol_table
 from scipy.optimize import minimize
-from shgo._shgo import SHGO
+from phuzzy.contrib.shgo._shgo import SHGO
 from tqdm import tqdm
 
-import phuzzy
 
-import sys
+class CompiledExpression(object):
+    """objective expression in x, e.g. 'x[0] ** 2 + x[1]', compiled once
+
+    The expression is compiled into a lambda over the asteval symbol table
+    (numpy functions, e.g. sin, exp, sqrt), evaluations do not go through the
+    interpreter. Pickling transfers the expression string only, the expression
+    is compiled again on first use (e.g. in a worker process).
+    """
+
+    def __init__(self, expression):
+        self.expression = expression
+        self._func = None
+
+    def __getstate__(self):
+        return {'expression': self.expression}
+
+    def __setstate__(self, state):
+        self.__init__(state['expression'])
+
+    def __repr__(self):
+        return "{}({!r})".format(self.__class__.__name__, self.expression)
+
+    def _compile(self):
+        namespace = make_symbol_table()
+        namespace['__builtins__'] = {}
+        code = compile("lambda x: ({})".format(self.expression.strip()), "<objective>", "eval")
+        self._func = eval(code, namespace)
+
+    def __call__(self, x):
+        """
+        Evaluate Expression
+        :param x:   Input Variable (dim,) or (dim, number of points)
+        :return:    Function Value
+        """
+        if self._func is None:
+            self._compile()
+        return self._func(x)
+
+    def evaluate(self, X):
+        """
+        Evaluate Expression on many Points in one Call
+        :param X:   Input Variables (number of points, dim)
+        :return:    Function Values (number of points,)
+        """
+        X = np.atleast_2d(np.asarray(X, dtype=float))
+        try:
+            res = np.asarray(self(X.T), dtype=float)
+            if res.shape == X.shape[:1]:
+                return res
+        except (TypeError, ValueError, IndexError):
+            pass
+        # expression is not vectorized (e.g. uses max(...) or sum(x))
+        return np.array([self(x) for x in X], dtype=float)
+
+
+def _get_expression(expression):
+    """objective callable of an expression string or a callable (e.g. phuzzy.expression.CachedExpression)
+
+    :param expression:  Objective Function
+    :return:            callable f(x)
+    """
+    if isinstance(expression, str):
+        return CompiledExpression(expression)
+    if not callable(expression):
+        raise ValueError('PLEASE IMPORT OBJECTIVE')
+    return expression
+
+
+class _Objective(object):
+    """picklable objective function for worker processes
+
+    Returns sign * f(x), constant variables (x_glob) are inserted into x.
+    A batch of points x (dim, number of points) is evaluated with one call of
+    a CompiledExpression (see vectorized).
+    """
+
+    def __init__(self, expression, sign=1., x_glob=None):
+        self.expression = _get_expression(expression)
+        self.sign = sign
+        self.x_glob = x_glob
+
+    @property
+    def vectorized(self):
+        return isinstance(self.expression, CompiledExpression)
+
+    def __call__(self, x):
+        if isinstance(self.x_glob, np.ndarray):
+            for row in self.x_glob:
+                x = np.insert(x, (row[0].astype(int)), row[1], axis=0)
+        if np.ndim(x) == 2:
+            return self.sign * self.expression.evaluate(x.T)
+        return self.sign * self.expression(x)
+
+
+def _create_shgo(func, bounds, n, iters, optimizer, vectorized=False):
+    """
+    Create SHGO Optimizer
+    :param func:        Objective Function
+    :param bounds:      Boundary of the current Alpha Level
+    :param n:           Number of Sampling Points
+    :param iters:       Number of max. Iterations
+    :param optimizer:   Selected Optimizer Strategy: "sobol" / "simplicial"
+    :param vectorized:  func evaluates batches of sampling points (dim, number of points)
+    :return:            SHGO
+    """
+    options = {'ftol': 1e-4, 'vectorized': vectorized}
+    if optimizer == 'sobol':
+        return SHGO(func, bounds=bounds, n=n, iters=iters,
+                    sampling_method='sobol', options=options, constraints=None)
+    else:
+        return SHGO(func, bounds=bounds, n=n, iters=iters,
+                    options=options, constraints=None)
+
+
+def _optimize_level(expression, bounds, sign, n, iters, optimizer):
+    """
+    Minimize sign * Objective on one Alpha Level (cold start, worker process)
+    :param expression:  Objective Function
+    :param bounds:      Boundary of the Alpha Level
+    :param sign:        1 (minimize) / -1 (maximize)
+    :return:            dict with fun (of sign * Objective), x, nfev, nit
+    """
+    bounds = np.asarray(bounds, dtype=float)
+    comp_bounds = bounds[:, 0] == bounds[:, 1]
+    if comp_bounds.all():  # if all bounds are constants
+        return {'fun': sign * _get_expression(expression)(bounds[:, 0]), 'x': bounds[:, 0].copy(),
+                'nfev': 0, 'nit': 0}
+
+    x_glob = []
+    pop = np.where(comp_bounds)[0]
+    if len(pop) > 0:  # if one or more bounds are constants
+        x_glob = np.concatenate((np.atleast_2d(pop).T, np.atleast_2d(bounds[pop, 0]).T), axis=1)
+    func = _Objective(expression, sign, x_glob)
+    shc = Alpha_Level_Optimization._find_result(_create_shgo(func, bounds[~comp_bounds], n, iters, optimizer,
+                                                             func.vectorized))
+    x = bounds[:, 0].copy()
+    x[~comp_bounds] = shc.res.x
+    return {'fun': shc.res.fun, 'x': x, 'nfev': shc.res.nfev, 'nit': shc.res.nit}
+
+
+def _optimize_chain(expression, boundlist, sign, n, iters, optimizer):
+    """
+    Minimize sign * Objective on a chain of Alpha Levels, warm-started from the previous Alpha Level
+    :param expression:  Objective Function
+    :param boundlist:   Boundaries of the Alpha Levels
+    :param sign:        1 (minimize) / -1 (maximize)
+    :return:            list of dicts with fun (of sign * Objective), x, nfev, nit
+    """
+    func = _Objective(expression, sign)
+    results = []
+    shc = None
+    nfev = 0
+    for bounds in boundlist:
+        if shc is None:
+            shc = Alpha_Level_Optimization._find_result(_create_shgo(func, bounds, n, iters, optimizer,
+                                                                     func.vectorized))
+        else:
+            shc.bounds = bounds
+            shc.iterate()
+            shc.find_minima()
+        results.append({'fun': shc.res.fun, 'x': np.array(shc.res.x), 'nfev': shc.res.nfev - nfev,
+                        'nit': shc.res.nit})
+        nfev = shc.res.nfev
+    return results
+
+
 class Alpha_Level_Optimization():
 
     def __init__(self, **kwargs):
         """
         :param kwargs:      Inputvariables / Fuzzyvariables / Name (name) / Objective Function (obj_function) / Objective Link (obj_link)
+                            obj_function is an expression string in x or a callable f(x), e.g. a
+                            phuzzy.expression.CachedExpression (points shared by alpha levels are evaluated once)
         """
         self.fuzzynumber = FuzzyNumber()
 
         # Define Bounds of Each Alpha Level
         self.global_bounds_DataArray = self._boundary_constraints(**kwargs)
-        print(self.global_bounds_DataArray)
-        print(self.global_bounds_DataArray.to_dataframe(name="a"))
-        sys.exit()
         self.x_glob = []
 
         # Filter Objective Function / Link and Safe it
         if kwargs.get('obj_function') is not None:
             self.objective = kwargs.get('obj_function')
+            self._expression = _get_expression(self.objective)
         else:
             raise ValueError('PLEASE IMPORT OBJECTIVE')
 
@@ -55,7 +219,8 @@ class Alpha_Level_Optimization():
     def __repr__(self):
         return "{}".format(self.name)
 
-    def calculation(self, n=60, iters=3, optimizer='sobol', backup=False, start_at=None):
+    def calculation(self, n=60, iters=3, optimizer='sobol', backup=False, start_at=None, workers=None,
+                    parallel='levels'):
         """
         Main Routine calculating the Minimum and Maximum of the Objective on each Alpha Level to generate
         the Fuzzy Objective Membershipfunction.
@@ -64,6 +229,10 @@ class Alpha_Level_Optimization():
         :param optimizer:   Selected Optimizer Strategy: "sobol" / "simplicial"
         :param backup:      Creates a Backup Folder saving the result of each Alpha Level Result
         :param start_at:    Start at certain Alpha Level (Counts starts from Alpha Level 1)
+        :param workers:     Number of Worker Processes (None: sequential calculation)
+        :param parallel:    Parallelization Strategy (workers is not None):
+                            "levels" - Minimum and Maximum of each Alpha Level independently (no warm-start)
+                            "hybrid" - Minimum and Maximum chains warm-started along the Alpha Levels
         """
 
         # Input Variables
@@ -82,6 +251,10 @@ class Alpha_Level_Optimization():
         for i in range(1, self.global_bounds_DataArray['number_of_alpha_levels'].size + 1):
             boundlist.append(np.delete(self.global_bounds_DataArray.values[:, -i, :], 0, 1))
 
+        if workers is not None:
+            self._parallel_calculation(boundlist, workers=workers, parallel=parallel)
+            return
+
         with tqdm(total=len(boundlist)) as pbar:
             for lvl, bounds in enumerate(boundlist):
                 comp_bounds = []
@@ -92,7 +265,7 @@ class Alpha_Level_Optimization():
                     if self.start_at is None:
                         if all(comp_bounds) == True:  # if all bounds are constants
                             ## calculate objective value
-                            zmin = self.objective_function(bounds[:, 0])
+                            zmin = self._objective_function(bounds[:, 0])
 
                             ## safe values in list
                             zmin_value_list.append(np.array(zmin))
@@ -198,6 +371,67 @@ class Alpha_Level_Optimization():
         self.total_nfev = sum(self.nfev_list_min) + sum(self.nfev_list_max)
         self.compact_output()
 
+    def _parallel_calculation(self, boundlist, workers, parallel='levels'):
+        """
+        Calculate the Minimum and Maximum of the Objective on each Alpha Level in a Process Pool
+        :param boundlist:   Boundaries of the Alpha Levels (starting at Alpha Level 1)
+        :param workers:     Number of Worker Processes
+        :param parallel:    Parallelization Strategy "levels" / "hybrid"
+        """
+        args = (self.n, self.iters, self.optimizer)
+        results = {}
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            if parallel == 'levels':
+                futures = {}
+                for lvl, bounds in enumerate(boundlist):
+                    for sign in (1, -1):
+                        futures[pool.submit(_optimize_level, self.objective, bounds, sign, *args)] = [(lvl, sign)]
+            elif parallel == 'hybrid':
+                # Alpha-Level = 1 is solved separately, like in the sequential calculation
+                futures = {pool.submit(_optimize_level, self.objective, boundlist[0], 1, *args): [(0, 1)],
+                           pool.submit(_optimize_level, self.objective, boundlist[0], -1, *args): [(0, -1)]}
+                if len(boundlist) > 1:
+                    keys = list(range(1, len(boundlist)))
+                    for sign in (1, -1):
+                        futures[pool.submit(_optimize_chain, self.objective, boundlist[1:], sign, *args)] = [
+                            (lvl, sign) for lvl in keys]
+            else:
+                raise ValueError('Please define -levels- or -hybrid- in parallel')
+
+            with tqdm(total=2 * len(boundlist)) as pbar:
+                for future in as_completed(futures):
+                    res = future.result()
+                    if isinstance(res, dict):
+                        res = [res]
+                    for key, res_i in zip(futures[future], res):
+                        results[key] = res_i
+                    pbar.update(len(futures[future]))
+
+        zmin_value_list = []
+        zmax_value_list = []
+        for lvl in range(len(boundlist)):
+            res_min = results[(lvl, 1)]
+            res_max = results[(lvl, -1)]
+            zmin_value_list.append(np.array(res_min['fun'] * (1)))
+            zmax_value_list.append(np.array(res_max['fun'] * (-1)))
+            self.best_indi_list_min.append(res_min['x'])
+            self.best_indi_list_max.append(res_max['x'])
+            self.nfev_list_min.append(res_min['nfev'])
+            self.nfev_list_max.append(res_max['nfev'])
+            self.nit_list_min.append(res_min['nit'])
+            self.nit_list_max.append(res_max['nit'])
+
+            if self.backup == True:
+                self.zmin_values = self._safe_z_values(min_max='min', z_value_list=list(zmin_value_list))
+                self.zmax_values = self._safe_z_values(min_max='max', z_value_list=list(zmax_value_list))
+                self._call_backup(iteration=lvl)
+
+        self.zmin_values = self._safe_z_values(min_max='min', z_value_list=zmin_value_list)
+        self.zmax_values = self._safe_z_values(min_max='max', z_value_list=zmax_value_list)
+
+        self.total_nfev = sum(self.nfev_list_min) + sum(self.nfev_list_max)
+        self.compact_output()
+
     def compact_output(self, round=None):
         """
         Returns Dataframe of Objective Memebership Function
@@ -298,8 +532,6 @@ class Alpha_Level_Optimization():
                 self.determin_objective = np.mean(np.concatenate((self.zmin_values, self.zmax_values), axis=0))
                 # self.determin_objective = np.mean((self.df['l'].values+self.df['r'].values)/2)
         elif method == 'centroid':
-            A = 0
-            B = 0
             if self.zmin_values[-1] == self.zmax_values[0]:
                 X = np.hstack((np.hstack((self.zmin_values[:-1], self.zmax_values)), self.zmin_values[0]))
                 Y = np.hstack((np.hstack(
@@ -311,12 +543,7 @@ class Alpha_Level_Optimization():
                     (np.linspace(0, 1, self.number_of_alpha_lvls), np.linspace(1, 0, self.number_of_alpha_lvls))),
                                np.array([0])))
 
-            for i in range(0, len(X) - 1):
-                a = (X[i] * Y[i + 1] - X[i + 1] * Y[i])
-                b = (X[i] + X[i + 1]) * (X[i] * Y[i + 1] - X[i + 1] * Y[i])
-                A = A + a
-                B = B + b
-            self.determin_objective = (1 / (3 * A)) * B
+            self.determin_objective = get_polygon_centroid(X, Y)
 
         if self.determin_objective < self.zmin_values[-1]:
             index_i = np.where(self.zmin_values < self.determin_objective)[0][-1]
@@ -341,12 +568,8 @@ class Alpha_Level_Optimization():
         :param bounds: Boundary of the current Alpha Level
         :return: Minimum
         """
-        if self.optimizer == 'sobol':
-            return SHGO(self._min_function_value, bounds=bounds, n=self.n, iters=self.iters,
-                        sampling_method='sobol', options={'ftol': 1e-4}, constraints=None)
-        else:
-            return SHGO(self._min_function_value, bounds=bounds, n=self.n, iters=self.iters,
-                        options={'ftol': 1e-4}, constraints=None)
+        return _create_shgo(self._min_function_value, bounds, self.n, self.iters, self.optimizer,
+                            isinstance(self._expression, CompiledExpression))
 
     def _call_maximizer_shgo(self, bounds):
         """
@@ -354,12 +577,8 @@ class Alpha_Level_Optimization():
         :param bounds: Boundary of the current Alpha Level
         :return: Maximum
         """
-        if self.optimizer == 'sobol':
-            return SHGO(self._max_function_value, bounds=bounds, n=self.n, iters=self.iters,
-                        sampling_method=self.optimizer, options={'ftol': 1e-4}, constraints=None)
-        else:
-            return SHGO(self._max_function_value, bounds=bounds, n=self.n, iters=self.iters,
-                        options={'ftol': 1e-4}, constraints=None)
+        return _create_shgo(self._max_function_value, bounds, self.n, self.iters, self.optimizer,
+                            isinstance(self._expression, CompiledExpression))
 
     def _objective_function(self, x):
         """
@@ -367,10 +586,17 @@ class Alpha_Level_Optimization():
         :param x:   Input Variable
         :return:    Function Value of Objective
         """
-        aeval = Interpreter()
-        exprc = aeval.parse(self.objective)
-        aeval.symtable['x'] = x
-        return aeval.run(exprc)
+        return self._expression(x)
+
+    def objective_values(self, X):
+        """
+        Batched Objective Function Call
+        :param X:   Input Variables (number of points, dim)
+        :return:    Function Values of Objective (number of points,)
+        """
+        if isinstance(self._expression, CompiledExpression):
+            return self._expression.evaluate(X)
+        return np.array([self._expression(x) for x in np.atleast_2d(X)], dtype=float)
 
     def _cut_global_blounds(self):
         """
@@ -388,23 +614,27 @@ class Alpha_Level_Optimization():
     def _min_function_value(self, x):
         """
         Call Minimization Opt Routine
-        :param x:       Input Variable
+        :param x:       Input Variable (dim,) or (dim, number of points)
         :return:        Objective Value
         """
         if isinstance(self.x_glob, np.ndarray):
             for row in self.x_glob:
-                x = np.insert(x, (row[0].astype(int)), row[1])
+                x = np.insert(x, (row[0].astype(int)), row[1], axis=0)
+        if np.ndim(x) == 2:
+            return self.objective_values(x.T)
         return self._objective_function(x)
 
     def _max_function_value(self, x):
         """
         Call Maximization Opt Routine
-        :param x:       Input Variable
+        :param x:       Input Variable (dim,) or (dim, number of points)
         :return:        Objective Value
         """
         if isinstance(self.x_glob, np.ndarray):
             for row in self.x_glob:
-                x = np.insert(x, (row[0].astype(int)), row[1])
+                x = np.insert(x, (row[0].astype(int)), row[1], axis=0)
+        if np.ndim(x) == 2:
+            return -1 * self.objective_values(x.T)
         return -1 * (self._objective_function(x))
 
     def _safe_best_array(self, comp_bounds, z_res):
@@ -493,10 +723,10 @@ class Alpha_Level_Optimization():
                 max_value = np.max(list_of_n_alpha_levels)
                 if isinstance(value, phuzzy.FuzzyNumber):
                     if value.number_of_alpha_levels < max_value: value.convert_df(alpha_levels=max_value)
-                    filter_fuzzy_variables_dict[key] = value._df
+                    filter_fuzzy_variables_dict[key] = value.df
             elif isinstance(value, phuzzy.FuzzyNumber):
                 # if number_of_alpha_levels are the same
-                filter_fuzzy_variables_dict[key] = value._df
+                filter_fuzzy_variables_dict[key] = value.df
 
         # extract fuzzy values from dict and safe as DataArray
         fuzzy_variables = {k: xr.DataArray(v, dims=['number_of_alpha_levels', 'alpha_level_bounds'])
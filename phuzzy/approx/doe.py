@@ -10,11 +10,15 @@ from sklearn.svm import SVR
 
 import phuzzy
 import phuzzy.contrib.pydoe as pydoe
+from phuzzy.shapes import ResultAccumulator
 
 
 class Expression(object):
     """Approximate an expression of fuzzy numbers
 
+    Training results fed in chunks (see update_training_results) are reduced to
+    the fuzzy result (see results_accumulator) and only kept with
+    keep_samples=True.
     """
 
     def __init__(self, **kwargs):
@@ -22,10 +26,13 @@ class Expression(object):
 
         self.name = kwargs.get("name", "DOE N.N.")
         self.function = kwargs.get("function")
+        self.keep_samples = kwargs.get("keep_samples", False)
         self._designvars = collections.OrderedDict()
         self.doe_training = None
         self.doe_prediction = None
         self.model = None
+        self._results_training = []
+        self.results_accumulator = ResultAccumulator()
 
         if "designvars" in kwargs:
             self.add_designvars(kwargs.get("designvars"))
@@ -64,13 +71,12 @@ class Expression(object):
         X = self.doe_prediction.samples[list(self.designvars.keys())]
         y = self.model.predict(X)
         self.results_prediction = pd.DataFrame({"res": y, "alpha": self.doe_prediction.samples.alpha})
-        print(1, self.results_training.head())
-        print(2, self.results_prediction.head())
-        df_res = pd.concat([self.results_training, self.results_prediction[["res", "alpha"]]], sort=False)
+        accumulator = self.results_accumulator.copy()
+        accumulator.update(self.results_prediction.alpha, self.results_prediction.res)
 
         if name is None:
             name = "z"
-        z = phuzzy.FuzzyNumber.from_results(df_res, name=name)
+        z = accumulator.get_fuzzynumber(name=name)
         z.convert_df(alpha_levels=11)
         return z
 
@@ -99,15 +105,41 @@ class Expression(object):
         for designvar in designvars:
             self._designvars[designvar.name] = designvar
 
+    def _get_results_training(self):
+        if not self._results_training:
+            if self.results_accumulator.count == 0:
+                return None
+            # min and max result of each alpha level
+            alpha, l, r = self.results_accumulator.values.T
+            return pd.DataFrame({"alpha": np.repeat(alpha, 2), "res": np.column_stack((l, r)).ravel()})
+        if len(self._results_training) > 1:
+            self._results_training = [pd.concat(self._results_training, sort=False)]
+        return self._results_training[0]
+
+    def _set_results_training(self, df):
+        self._results_training = []
+        self.results_accumulator = ResultAccumulator()
+        if df is not None:
+            self._results_training.append(df)
+            self.results_accumulator.update(df.alpha, df.res)
+
+    results_training = property(fget=_get_results_training, fset=_set_results_training,
+                                doc="training results (min and max of each alpha level if the samples are not kept)")
+
     def update_training_results(self, df):
-        """update training results for each data set of DoE sampling
+        """add training results (e.g. a chunk of finished jobs) of the DoE sampling
 
+        The fuzzy result (see results_accumulator) is updated with the new rows only,
+        the rows are kept only with keep_samples=True.
 
-        :param df:
+        :param df: results (columns alpha and res)
         :return: None
         """
-        # TODO: implement real update ()
-        self.results_training = df
+        if self.keep_samples:
+            self._results_training.append(df)
+        else:
+            self._results_training = []
+        self.results_accumulator.update(df.alpha, df.res)
 
     def eval(self):
         """evaluate (expensive) function
@@ -126,7 +158,7 @@ class Expression(object):
         df_res = pd.DataFrame({"alpha": self.doe_training.samples.alpha,
                                "res": f_approx})
 
-        self.update_training_results(df_res)
+        self.results_training = df_res
 
     def fit_model(self, model=None):
         """
@@ -134,6 +166,8 @@ class Expression(object):
         :return:
         """
 
+        if not self._results_training:
+            raise ValueError("no training results of the samples, use eval() or keep_samples=True")
         X = self.doe_training.samples[list(self.designvars.keys())].values
         y = self.results_training.res.values
 
@@ -169,7 +203,7 @@ class Expression(object):
         :return: FuzzyNumber
         """
 
-        fuzzynumber = phuzzy.approx.FuzzyNumber.from_results(self.results_training)
+        fuzzynumber = self.results_accumulator.get_fuzzynumber(cls=phuzzy.approx.FuzzyNumber)
         fuzzynumber.df_res = self.results_training.copy()
         fuzzynumber.samples = self.doe_training.samples.copy()
         if name is not None:
@@ -8,7 +8,8 @@ import logging
 import warnings
 import scipy.optimize
 import scipy.spatial
-import shgo.shgo_m.sobol_seq as sobol_seq
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import phuzzy.contrib.shgo.shgo_m.sobol_seq as sobol_seq
 from phuzzy.contrib.shgo.shgo_m.triangulation import Complex
 
 __all__ = ['shgo']
@@ -171,6 +172,18 @@ def shgo(func, bounds, args=(), constraints=None, n=100, iters=1, callback=None,
             Only evaluate a few of the best minimiser pool candiates every
             iteration. If False all potential points are passed to the local
             minimsation routine.
+        * vectorized : bool
+            If True then the objective function and the constraints are
+            evaluated once per generation of new sampling points with an
+            array of shape ``(dim, n)`` and must return ``n`` values. The
+            objective function must still accept a 1-D array for the local
+            minimisation. Defaults to False.
+        * workers : int
+            Number of concurrent local minimisations of the minimiser pool
+            (see SHGO.minimise_pool_parallel). Defaults to None (sequential).
+        * pool : str
+            ``thread`` (default) or ``process`` pool for ``workers``. The
+            process pool requires a picklable objective function.
         * infty_constraints: bool
             If True then any sampling points generated which are outside will
             the feasible domain will be saved and given an objective function
@@ -584,6 +597,9 @@ class SHGO(object):
             # Algorithm functionality
             self.local_iter = False
             self.infty_cons_sampl = True
+            self.vectorized = False
+            self.workers = None
+            self.pool = 'thread'
 
             # Feedback
             self.disp = False
@@ -792,6 +808,20 @@ class SHGO(object):
         else:
             self.infty_cons_sampl = True
 
+        if 'vectorized' in options:  # Batch evaluations of sampling points
+            self.vectorized = options['vectorized']
+        else:
+            self.vectorized = False
+
+        if 'workers' in options:  # Concurrent local minimisations
+            self.workers = options['workers']
+        else:
+            self.workers = None
+        if 'pool' in options:
+            self.pool = options['pool']
+        else:
+            self.pool = 'thread'
+
         # Feedback
         if 'disp' in options:
             self.disp = options['disp']
@@ -983,7 +1013,7 @@ class SHGO(object):
             # Initial triangulation of the hyper-rectangle
             self.HC = Complex(self.dim, self.func, self.args,
                               self.symmetry, self.bounds, self.g_cons,
-                              self.g_args)
+                              self.g_args, vectorized=self.vectorized)
         else:
             self.HC.split_generation()
 
@@ -1064,6 +1094,9 @@ class SHGO(object):
 
         """
 
+        if self.workers is not None and self.workers > 1:
+            return self.minimise_pool_parallel(force_iter)
+
         # Find first local minimum
         # NOTE: Since we always minimize this value regardless it is a waste to
         # build the topograph first before minimizing
@@ -1116,6 +1149,83 @@ class SHGO(object):
         self.stop_l_iter = False
         return
 
+    def minimise_pool_parallel(self, force_iter=False):
+        """
+        Minimise the minimiser pool with `workers` concurrent local
+        minimisations.
+
+        The starting points are processed in batches of `workers` points.
+        The first batch consists of the best candidates of the pool, the
+        following batches of the candidates with the greatest euclidean
+        distance from the best local minimum found so far. The results are
+        added to the local minima cache in the order of the batch, so the
+        result does not depend on the timing of the workers.
+
+        Parameters
+        ----------
+
+        force_iter : int
+                     Number of starting minimisers to process (can be sepcified
+                     globally or locally)
+
+        """
+        if force_iter:
+            self.local_iter = force_iter
+        if self.local_iter is None or self.local_iter is False:
+            n_max = numpy.inf
+        else:
+            n_max = self.local_iter
+
+        if self.pool == 'process':
+            executor = ProcessPoolExecutor(max_workers=self.workers)
+        else:
+            executor = ThreadPoolExecutor(max_workers=self.workers)
+
+        lres_f_min = None
+        n_done = 0
+        with executor:
+            while numpy.shape(self.X_min)[0] > 0 and n_done < n_max:
+                n_batch = int(min(self.workers, n_max - n_done,
+                                  numpy.shape(self.X_min)[0]))
+                if lres_f_min is None:
+                    batch = numpy.arange(n_batch)
+                else:
+                    dist = scipy.spatial.distance.cdist([lres_f_min.x],
+                                                        self.X_min)[0]
+                    batch = numpy.argsort(-dist, kind='mergesort')[:n_batch]
+
+                jobs = []
+                for i in batch:
+                    x_min = self.X_min[i]
+                    lres = self.LMC[x_min].lres
+                    g_bounds = None
+                    if lres is None:
+                        g_bounds = self.local_bounds(x_min,
+                                                     ind=self.minimizer_pool[i])
+                        kwargs = self.minimizer_kwargs.copy()
+                        if 'bounds' in self.min_solver_args:
+                            kwargs['bounds'] = g_bounds
+                        lres = executor.submit(scipy.optimize.minimize,
+                                               self.func, x_min, **kwargs)
+                    jobs.append((x_min, lres, g_bounds))
+
+                for x_min, lres, g_bounds in jobs:
+                    if g_bounds is not None:
+                        lres = self.add_local_result(x_min, lres.result(),
+                                                     g_bounds)
+                    if lres_f_min is None or lres.fun < lres_f_min.fun:
+                        lres_f_min = lres
+
+                self.trim_min_pool(batch)
+                n_done += n_batch
+
+                # Global stopping criteria:
+                if self.f_min_true is not None:
+                    if (lres_f_min.fun - self.f_min_true) / abs(
+                            self.f_min_true) <= self.f_tol:
+                        break
+        return
+
     def sort_min_pool(self):
         # Sort to find minimum func value in min_pool
         self.ind_f_min = numpy.argsort(self.minimizer_pool_F)
@@ -1252,28 +1362,58 @@ class SHGO(object):
             print('Starting '
                   'minimization at {}...'.format(x_min))
 
-        if self.sampling_method == 'simplicial':
-            x_min_t = tuple(x_min)
-            # Find the normalized tuple in the Vertex cache:
-            x_min_t_norm = self.X_min_cache[tuple(x_min_t)]
+        g_bounds = self.local_bounds(x_min, ind=ind)
+        if 'bounds' in self.min_solver_args:
+            self.minimizer_kwargs['bounds'] = g_bounds
 
-            x_min_t_norm = tuple(x_min_t_norm)
+        if self.disp and self.sampling_method == 'simplicial':
+            print('bounds in kwarg:')
+            print(self.minimizer_kwargs['bounds'])
 
-            g_bounds = self.contstruct_lcb_simplicial(self.HC.V[x_min_t_norm])
-            if 'bounds' in self.min_solver_args:
-                self.minimizer_kwargs['bounds'] = g_bounds
+        lres = scipy.optimize.minimize(self.func, x_min,
+                                       **self.minimizer_kwargs)
+        return self.add_local_result(x_min, lres, g_bounds)
 
-            if self.disp:
-                print('bounds in kwarg:')
-                print(self.minimizer_kwargs['bounds'])
+    def local_bounds(self, x_min, ind=None):
+        """
+        Locally convex bounds of a starting point of the minimiser pool
+
+        Parameters
+        ----------
+        x_min : vector of floats
+            Starting point.
+        ind : Vertex or int
+            Minimiser pool entry of the starting point (Delaunay sampling).
+
+        Returns
+        -------
+        cbounds : List of size dim with tuple of bounds for each dimension
+        """
+        if self.sampling_method == 'simplicial':
+            # Find the normalized tuple in the Vertex cache:
+            x_min_t_norm = tuple(self.X_min_cache[tuple(x_min)])
+            return self.contstruct_lcb_simplicial(self.HC.V[x_min_t_norm])
         else:
-            g_bounds = self.contstruct_lcb_delauney(x_min, ind=ind)
-            if 'bounds' in self.min_solver_args:
-                self.minimizer_kwargs['bounds'] = g_bounds
+            return self.contstruct_lcb_delauney(x_min, ind=ind)
 
-        lres = scipy.optimize.minimize(self.func, x_min,
-                                       **self.minimizer_kwargs)
+    def add_local_result(self, x_min, lres, g_bounds):
+        """
+        Count the evaluations of a local minimisation and add its result to
+        the local minima cache
+
+        Parameters
+        ----------
+        x_min : vector of floats
+            Starting point.
+        lres : OptimizeResult
+            Result of the local minimisation.
+        g_bounds : list
+            Bounds of the local minimisation.
 
+        Returns
+        -------
+        lres : OptimizeResult
+        """
         if self.disp:
             print('lres = {}'.format(lres))
 
@@ -1402,73 +1542,22 @@ class SHGO(object):
 
         Generate N sampling points in D dimensions
         """
-        points = self.Sobol.i4_sobol_generate(d, n, skip=0)
+        points = self.Sobol.i4_sobol_generate(d, n, skip=skip)
 
         return points
 
-    def sobol_points_10k(self, N, D):
+    def sobol_points_10k(self, N, D, skip=0):
         """
         sobol.cc by Frances Kuo and Stephen Joe translated to Python 3 by
         Carl Sandrock 2016-03-31
 
         The original program is available and described at
         http://web.maths.unsw.edu.au/~fkuo/sobol/
+
+        Wrapper for sobol_seq.sobol_points (Gray code order, direction
+        numbers of shgo_m/sobol_vec.gz are read once)
         """
-        import gzip
-        import os
-        path = os.path.join(os.path.dirname(__file__), 'shgo_m', 'sobol_vec.gz')
-        f = gzip.open(path, 'rb')
-        unsigned = "uint64"
-        # swallow header
-        buffer = next(f)
-
-        L = int(numpy.log(N) // numpy.log(2.0)) + 1
-
-        C = numpy.ones(N, dtype=unsigned)
-        for i in range(1, N):
-            value = i
-            while value & 1:
-                value >>= 1
-                C[i] += 1
-
-        points = numpy.zeros((N, D), dtype='double')
-
-        # XXX: This appears not to set the first element of V
-        V = numpy.empty(L + 1, dtype=unsigned)
-        for i in range(1, L + 1):
-            V[i] = 1 << (32 - i)
-
-        X = numpy.empty(N, dtype=unsigned)
-        X[0] = 0
-        for i in range(1, N):
-            X[i] = X[i - 1] ^ V[C[i - 1]]
-            points[i, 0] = X[i] / 2 ** 32
-
-        for j in range(1, D):
-            F_int = [int(item) for item in next(f).strip().split()]
-            (d, s, a), m = F_int[:3], [0] + F_int[3:]
-
-            if L <= s:
-                for i in range(1, L + 1):
-                    V[i] = m[i] << (32 - i)
-            else:
-                for i in range(1, s + 1):
-                    V[i] = m[i] << (32 - i)
-                for i in range(s + 1, L + 1):
-                    V[i] = V[i - s] ^ (
-                        V[i - s] >> numpy.array(s, dtype=unsigned))
-                    for k in range(1, s):
-                        V[i] ^= numpy.array(
-                            (((a >> (s - 1 - k)) & 1) * V[i - k]),
-                            dtype=unsigned)
-
-            X[0] = 0
-            for i in range(1, N):
-                X[i] = X[i - 1] ^ V[C[i - 1]]
-                points[i, j] = X[i] / 2 ** 32  # *** the actual points
-
-        f.close()
-        return points
+        return sobol_seq.sobol_points(N, D, skip=skip)
 
     def sampling_sobol(self, n, dim):
         """
@@ -1477,10 +1566,9 @@ class SHGO(object):
         """
         # Generate sampling points.
         # Generate uniform sample points in [0, 1]^m \subset R^m
-        if self.n_sampled == 0:
-            self.C = self.sobol_points(n, dim)
-        else:
-            self.C = self.sobol_points(n, dim, skip=self.n_sampled)
+        # n is the cumulative number of points (see sampled_surface), the
+        # points already evaluated are the leading rows of C
+        self.C = self.sobol_points(n, dim)
         # Distribute over bounds
         for i in range(len(self.bounds)):
             self.C[:, i] = (self.C[:, i] *
@@ -1537,22 +1625,38 @@ class SHGO(object):
             f_cache_bool = True
 
         self.F = numpy.zeros(numpy.shape(self.C)[0])
-        # NOTE: It might be easier to replace this with a cached
-        #      objective function
-        for i in range(self.fn, numpy.shape(self.C)[0]):
-            eval_f = True
+        if self.vectorized:
+            # Evaluate all new sampling points with one call
+            C = self.C[self.fn:]
+            feasible = numpy.ones(numpy.shape(C)[0], dtype=bool)
             if self.g_cons is not None:
-                for g in self.g_cons:
-                    if g(self.C[i, :], *self.args) < 0.0:
-                        eval_f = False
-                        break  # Breaks the g loop
-
-            if eval_f:
-                self.F[i] = self.func(self.C[i, :], *self.args)
-                self.fn += 1
-            elif self.infty_cons_sampl:
-                self.F[i] = numpy.inf
-                self.fn += 1
+                for ind, g in enumerate(self.g_cons):
+                    feasible &= numpy.asarray(g(C.T, *self.g_args[ind])) >= 0.0
+            F = self.F[self.fn:]
+            if feasible.any():
+                F[feasible] = self.func(C[feasible].T, *self.args)
+            if self.infty_cons_sampl:
+                F[~feasible] = numpy.inf
+                self.fn += numpy.shape(C)[0]
+            else:
+                self.fn += int(numpy.count_nonzero(feasible))
+        else:
+            # NOTE: It might be easier to replace this with a cached
+            #      objective function
+            for i in range(self.fn, numpy.shape(self.C)[0]):
+                eval_f = True
+                if self.g_cons is not None:
+                    for g in self.g_cons:
+                        if g(self.C[i, :], *self.args) < 0.0:
+                            eval_f = False
+                            break  # Breaks the g loop
+
+                if eval_f:
+                    self.F[i] = self.func(self.C[i, :], *self.args)
+                    self.fn += 1
+                elif self.infty_cons_sampl:
+                    self.F[i] = numpy.inf
+                    self.fn += 1
         if f_cache_bool:
             if fn_old > 0:  # Restore saved function evaluations
                 self.F[0:fn_old] = Ftemp
@@ -18,10 +18,125 @@
 
   Modifications:
     Wrapped into Python class [30.10.2017]
+    Vectorized Gray code generators, cached Joe-Kuo direction numbers
 """
+import gzip
+import os
+
 import numpy as np
 
-__all__ = ['Sobol']
+__all__ = ['Sobol', 'sobol_points']
+
+_direction_tables = {}
+
+
+def get_direction_table(source=None):
+    """
+    Joe-Kuo direction numbers (new-joe-kuo-6 format), parsed once per source.
+
+    Parameters:
+      Input, source, path of a gzipped direction number file or a callable
+      returning an open (binary) file object. Default: sobol_vec.gz.
+
+      Output, tuple (s, a, m) of the dimensions 2, 3, ...: degree s and
+      coefficients a of the primitive polynomials, initial direction numbers
+      m (zero padded).
+    """
+    if source is None:
+        source = os.path.join(os.path.dirname(__file__), 'sobol_vec.gz')
+    try:
+        return _direction_tables[source]
+    except KeyError:
+        pass
+    if callable(source):
+        f = source()
+    else:
+        f = gzip.open(source, 'rb')
+    with f:
+        # swallow header
+        next(f)
+        rows = [[int(item) for item in line.split()] for line in f if line.strip()]
+    s = np.array([row[1] for row in rows], dtype=np.int64)
+    a = np.array([row[2] for row in rows], dtype=np.int64)
+    m = np.zeros((len(rows), max(s.max(), 1)), dtype=np.uint64)
+    for i, row in enumerate(rows):
+        m[i, :len(row) - 3] = row[3:]
+    _direction_tables[source] = table = (s, a, m)
+    return table
+
+
+def get_direction_numbers(dim, bits=32, source=None):
+    """
+    Direction numbers V(bits, dim) of the Joe-Kuo Sobol sequence,
+    V[i - 1] = v_i * 2**bits.
+
+    Parameters:
+      Input, integer dim, the spatial dimension.
+      Input, integer bits, number of bits (max. 32).
+      Input, source, see get_direction_table.
+    """
+    s, a, m = get_direction_table(source)
+    if dim - 1 > len(s):
+        raise ValueError('dimension {} > {}'.format(dim, len(s) + 1))
+    s, a, m = s[:dim - 1], a[:dim - 1], m[:dim - 1]
+    V = np.zeros((bits + 1, dim), dtype=np.uint64)
+    i = np.arange(1, bits + 1, dtype=np.uint64)
+    # first dimension: van der Corput
+    V[1:, 0] = np.uint64(1) << (np.uint64(32) - i)
+    cols = np.arange(1, dim)
+    for i in range(1, bits + 1):
+        shift = np.uint64(32 - i)
+        init = i <= s
+        if i <= m.shape[1]:
+            V[i, cols[init]] = m[init, i - 1] << shift
+        rec = ~init
+        if rec.any():
+            c, sc, ac = cols[rec], s[rec], a[rec]
+            v = V[i - sc, c]
+            v = v ^ (v >> sc.astype(np.uint64))
+            for k in range(1, sc.max()):
+                use = (k < sc) & (((ac >> (sc - 1 - k)) & 1) == 1)
+                v[use] ^= V[i - k, c[use]]
+            V[i, c] = v
+    return V[1:]
+
+
+def _gray_code_xor(V, n, skip):
+    """
+    XOR of the direction numbers V(bits, dim) selected by the bits of the
+    Gray codes of the indices skip ... skip + n - 1 (Antonov-Saleev).
+    """
+    k = np.arange(skip, skip + n, dtype=np.uint64)
+    gray = k ^ (k >> np.uint64(1))
+    X = np.zeros((n, V.shape[1]), dtype=np.uint64)
+    for b in range(min(int(skip + n).bit_length(), V.shape[0])):
+        bit = ((gray >> np.uint64(b)) & np.uint64(1)).astype(bool)
+        X[bit] ^= V[b]
+    return X
+
+
+def sobol_points(n, dim, skip=0, source=None):
+    """
+    Joe-Kuo Sobol points generated in bulk (Gray code order).
+
+    Equals the sobol.cc translation of Frances Kuo and Stephen Joe.
+
+    Parameters:
+      Input, integer n, the number of points to generate.
+      Input, integer dim, the spatial dimension.
+      Input, integer skip, the number of initial points to skip.
+      Input, source, see get_direction_table.
+
+      Output, real R(n, dim), the points.
+    """
+    if skip + n >= 2 ** 32:
+        raise ValueError('too many points')
+    key = ('V', source)
+    V = _direction_tables.get(key)
+    if V is None or V.shape[1] < dim:
+        V = _direction_tables[key] = get_direction_numbers(dim, source=source)
+    return _gray_code_xor(V[:, :dim], n, skip) / 2. ** 32
+
 
 class Sobol:
     def __init__(self):
@@ -49,12 +164,12 @@ class Sobol:
 
           Output, real R(M,N), the points.
         """
-        r = np.full((n, dim_num), np.nan)
-        for j in range(n):
-            seed = j + skip
-            r[j, 0:dim_num], next_seed = self.i4_sobol(dim_num, seed)
-
-        return r
+        self.init_direction_numbers(dim_num)
+        skip = max(int(skip), 0)
+        if skip + n > self.atmost:
+            raise ValueError('I4_SOBOL_GENERATE - too many points')
+        V = self.v[:dim_num, :self.maxcol].T.astype(np.uint64)
+        return _gray_code_xor(V, n, skip) * self.recipd
 
     def i4_bit_hi1(self, n):
         """
@@ -192,6 +307,74 @@ class Sobol:
           Output, real QUASI(DIM_NUM), the next quasirandom vector.
         """
 
+        self.init_direction_numbers(dim_num)
+
+        seed = int(np.floor(seed))
+
+        if seed < 0:
+            seed = 0
+
+        lseed = 1
+        if seed == 0:
+            self.lastq = np.zeros(dim_num)
+
+        elif seed == self.seed_save + 1:
+
+            #  Find the position of the right-hand zero in SEED.
+            lseed = self.i4_bit_lo0(seed)
+
+        elif seed <= self.seed_save:
+
+            self.seed_save = 0
+            self.lastq = np.zeros(dim_num)
+
+            for seed_temp in range(int(self.seed_save), int(seed)):
+                lseed = self.i4_bit_lo0(seed_temp)
+                for i in range(1, dim_num + 1):
+                    self.lastq[i - 1] = np.bitwise_xor(
+                        int(self.lastq[i - 1]), int(self.v[i - 1, lseed - 1]))
+
+            lseed = self.i4_bit_lo0(seed)
+
+        elif self.seed_save + 1 < seed:
+
+            for seed_temp in range(int(self.seed_save + 1), int(seed)):
+                lseed = self.i4_bit_lo0(seed_temp)
+                for i in range(1, dim_num + 1):
+                    self.lastq[i - 1] = np.bitwise_xor(
+                        int(self.lastq[i - 1]), int(self.v[i - 1, lseed - 1]))
+
+            lseed = self.i4_bit_lo0(seed)
+
+        # Check that the user is not calling too many times!
+        if self.maxcol < lseed:
+            print('I4_SOBOL - Fatal error!')
+            print('  Too many calls!')
+            print('  MAXCOL = %d\n' % self.maxcol)
+            print('  L =      %d\n' % lseed)
+            return
+
+        # Calculate the new components of QUASI.
+        quasi = np.zeros(dim_num)
+        for i in range(1, dim_num + 1):
+            quasi[i - 1] = self.lastq[i - 1] * self.recipd
+            self.lastq[i - 1] = np.bitwise_xor(
+                int(self.lastq[i - 1]), int(self.v[i - 1, lseed - 1]))
+
+        self.seed_save = seed
+        seed += 1
+
+        return [quasi, seed]
+
+    def init_direction_numbers(self, dim_num):
+        """
+        init_direction_numbers initializes the direction numbers V of the
+        first DIM_NUM dimensions (Bratley and Fox).
+
+        Parameters:
+          Input, integer DIM_NUM, the number of spatial dimensions.
+          DIM_NUM must satisfy 1 <= DIM_NUM <= 40.
+        """
         # if 'self.initialized' not in list(globals().keys()):
         if self.initialized is None:
             self.initialized = 0
@@ -312,60 +495,3 @@ class Sobol:
             # RECIPD is 1/(common denominator of the elements in V).
             self.recipd = 1.0 / (2 * lseed)
             self.lastq = np.zeros(dim_num)
-
-        seed = int(np.floor(seed))
-
-        if seed < 0:
-            seed = 0
-
-        lseed = 1
-        if seed == 0:
-            self.lastq = np.zeros(dim_num)
-
-        elif seed == self.seed_save + 1:
-
-            #  Find the position of the right-hand zero in SEED.
-            lseed = self.i4_bit_lo0(seed)
-
-        elif seed <= self.seed_save:
-
-            self.seed_save = 0
-            self.lastq = np.zeros(dim_num)
-
-            for seed_temp in range(int(self.seed_save), int(seed)):
-                lseed = self.i4_bit_lo0(seed_temp)
-                for i in range(1, dim_num + 1):
-                    self.lastq[i - 1] = np.bitwise_xor(
-                        int(self.lastq[i - 1]), int(self.v[i - 1, lseed - 1]))
-
-            lseed = self.i4_bit_lo0(seed)
-
-        elif self.seed_save + 1 < seed:
-
-            for seed_temp in range(int(self.seed_save + 1), int(seed)):
-                lseed = self.i4_bit_lo0(seed_temp)
-                for i in range(1, dim_num + 1):
-                    self.lastq[i - 1] = np.bitwise_xor(
-                        int(self.lastq[i - 1]), int(self.v[i - 1, lseed - 1]))
-
-            lseed = self.i4_bit_lo0(seed)
-
-        # Check that the user is not calling too many times!
-        if self.maxcol < lseed:
-            print('I4_SOBOL - Fatal error!')
-            print('  Too many calls!')
-            print('  MAXCOL = %d\n' % self.maxcol)
-            print('  L =      %d\n' % lseed)
-            return
-
-        # Calculate the new components of QUASI.
-        quasi = np.zeros(dim_num)
-        for i in range(1, dim_num + 1):
-            quasi[i - 1] = self.lastq[i - 1] * self.recipd
-            self.lastq[i - 1] = np.bitwise_xor(
-                int(self.lastq[i - 1]), int(self.v[i - 1, lseed - 1]))
-
-        self.seed_save = seed
-        seed += 1
-
-        return [quasi, seed]
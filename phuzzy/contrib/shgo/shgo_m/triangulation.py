@@ -100,7 +100,7 @@ except ImportError:  # Python 2:
 
 class Complex:
     def __init__(self, dim, func, func_args=(), symmetry=False, bounds=None,
-                 g_cons=None, g_args=()):
+                 g_cons=None, g_args=(), vectorized=False):
         self.dim = dim
         self.bounds = bounds
         self.symmetry = symmetry  # TODO: Define the functions to be used
@@ -115,7 +115,8 @@ class Complex:
 
         self.H = []  # Storage structure of cells
         # Cache of all vertices
-        self.V = VertexCache(func, func_args, bounds, g_cons, g_args)
+        self.V = VertexCache(func, func_args, bounds, g_cons, g_args,
+                             vectorized=vectorized)
 
         # Generate n-cube here:
         self.n_cube(dim, symmetry=symmetry)
@@ -128,6 +129,7 @@ class Complex:
             # self.C0.centroid = self.centroid
         else:
             self.add_centroid()
+        self.V.process_pending()
 
         self.H.append([])
         self.H[0].append(self.C0)
@@ -354,6 +356,7 @@ class Complex:
                     self.sub_generate_cell(c, self.gen + 1)
         except IndexError:
             no_splits = True  # USED IN SHGO
+        self.V.process_pending()
 
         self.gen += 1
         return no_splits  # USED IN SHGO
@@ -822,15 +825,9 @@ class Vertex:
             self.nn.add(v)
             v.nn.add(self)
 
-            # self.min = self.minimiser()
-            if self.minimiser():
-                # if self.f > v.f:
-                #    self.min = False
-                # else:
-                v.min = False
-                v.check_min = False
-
-            # TEMPORARY
+            # The minimiser flags of both vertices are recalculated on the
+            # next call of minimiser() (the vertices may not be evaluated yet
+            # in vectorized mode)
             self.check_min = True
             v.check_min = True
 
@@ -863,7 +860,12 @@ class Vertex:
 
 class VertexCache:
     def __init__(self, func, func_args=(), bounds=None, g_cons=None,
-                 g_cons_args=(), indexed=True):
+                 g_cons_args=(), indexed=True, vectorized=False):
+        """
+        If vectorized is True the new vertices are evaluated in batches by
+        process_pending, func and g_cons are called with an array of shape
+        (dim, n) and must return n values.
+        """
 
         self.cache = {}
         # self.cache = set()
@@ -874,6 +876,8 @@ class VertexCache:
         self.bounds = bounds
         self.nfev = 0
         self.size = 0
+        self.vectorized = vectorized and func is not None
+        self.pending = []  # vertices to be evaluated (vectorized)
 
         if indexed:
             self.Index = -1
@@ -882,16 +886,18 @@ class VertexCache:
         try:
             return self.cache[x]
         except KeyError:
+            # vectorized: the evaluation is deferred to process_pending
+            func = None if self.vectorized else self.func
             if indexed:
                 self.Index += 1
                 xval = Vertex(x, bounds=self.bounds,
-                              func=self.func, func_args=self.func_args,
+                              func=func, func_args=self.func_args,
                               g_cons=self.g_cons,
                               g_cons_args=self.g_cons_args,
                               Ind=self.Index)
             else:
                 xval = Vertex(x, bounds=self.bounds,
-                              func=self.func, func_args=self.func_args,
+                              func=func, func_args=self.func_args,
                               g_cons=self.g_cons,
                               g_cons_args=self.g_cons_args)
 
@@ -899,6 +905,10 @@ class VertexCache:
             # NOTE: Surprisingly high performance increase if logging is commented out
             self.cache[x] = xval
 
+            if self.vectorized:
+                self.pending.append(xval)
+                return xval
+
             # TODO: Check
             if self.func is not None:
                 if self.g_cons is not None:
@@ -913,3 +923,27 @@ class VertexCache:
                     self.size += 1
 
             return self.cache[x]
+
+    def process_pending(self):
+        """
+        Evaluate the constraints and the objective function of all new
+        vertices with one call each (vectorized mode)
+        """
+        if not self.pending:
+            return
+        vertices = self.pending
+        self.pending = []
+        X = numpy.array([v.x_a for v in vertices]).T
+        feasible = numpy.ones(len(vertices), dtype=bool)
+        if self.g_cons is not None:
+            for ind, g in enumerate(self.g_cons):
+                feasible &= numpy.asarray(g(X, *self.g_cons_args[ind])) >= 0.0
+        F = numpy.full(len(vertices), numpy.inf)
+        if feasible.any():
+            F[feasible] = self.func(X[:, feasible], *self.func_args)
+        for v, f, v_feasible in zip(vertices, F, feasible):
+            v.f = f
+            if self.g_cons is not None:
+                v.feasible = bool(v_feasible)
+        self.nfev += int(numpy.count_nonzero(feasible))
+        self.size += len(vertices)
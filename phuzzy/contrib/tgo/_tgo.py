@@ -5,6 +5,7 @@
 from __future__ import division, print_function, absolute_import
 
 import base64
+import gzip
 # from . import __file__
 # import pkgutil
 from io import BytesIO
@@ -13,6 +14,7 @@ import numpy
 import scipy.optimize
 import scipy.spatial
 
+import phuzzy.contrib.shgo.shgo_m.sobol_seq as sobol_seq
 from .data import data
 
 try:
@@ -21,6 +23,12 @@ except ImportError:
     from multiprocessing import Pool
 
 
+def _open_direction_numbers():
+    """open the embedded Sobol direction numbers (new-joe-kuo-6.21201.gz)"""
+    # datastr = pkgutil.get_data('tgo', 'new-joe-kuo-6.21201.gz')
+    return gzip.GzipFile(fileobj=BytesIO(base64.b64decode(data)))
+
+
 def tgo(func, bounds, args=(), g_cons=None, g_args=(), n=100,
         k_t=None, callback=None, minimizer_kwargs=None, options=None,
         multiproc=False):
@@ -112,6 +120,11 @@ def tgo(func, bounds, args=(), g_cons=None, g_args=(), n=100,
                 Maximum number of iterations to perform in local solvers.
                 (Note only methods that support this option will terminate
                 tgo at the exact specified value)
+            vectorized : bool
+                If True the objective function is evaluated once for all
+                sampling points with an array of shape ``(dim, n)`` and must
+                return ``n`` values. The objective function must still accept
+                a 1-D array for the local minimisation. Defaults to False.
 
     multiproc : boolean, optional
         If True the local minimizations of the minimizer points will be pooled
@@ -352,11 +365,13 @@ class TGO(object):
         self.callback = callback
         self.maxfev = None
         self.disp = False
+        self.vectorized = False
         if options is not None:
             if 'maxfev' in options:
                 self.maxfev = options['maxfev']
             if 'disp' in options:
                 self.disp = options['disp']
+            self.vectorized = options.get('vectorized', False)
 
         # set bounds
         abound = numpy.array(bounds, float)
@@ -461,69 +476,18 @@ class TGO(object):
         self.res.nlfev = 0  # Local function evals for all minimisers
         self.res.nljev = 0  # Local jacobian evals for all minimisers
 
-    def sobol_points(self, N, D):
+    def sobol_points(self, N, D, skip=0):
         """
         sobol.cc by Frances Kuo and Stephen Joe translated to Python 3 by
         Carl Sandrock 2016-03-31
 
         The original program is available and described at
         http://web.maths.unsw.edu.au/~fkuo/sobol/
+
+        Wrapper for sobol_seq.sobol_points with the embedded direction
+        numbers (new-joe-kuo-6.21201), which are decoded once
         """
-        import gzip
-        # path = os.path.join(os.path.dirname(__file__), 'new-joe-kuo-6.21201.gz')
-        # gzipfile = gzip.open(path)
-        # datastr = pkgutil.get_data('tgo', 'new-joe-kuo-6.21201.gz')
-        datastr = base64.b64decode(data)
-        gzipfile = gzip.GzipFile(fileobj=BytesIO(datastr))
-        with gzipfile as f:
-            unsigned = "uint64"
-            # swallow header
-            buffer = next(f)
-
-            L = int(numpy.log(N) // numpy.log(2.0)) + 1
-
-            C = numpy.ones(N, dtype=unsigned)
-            for i in range(1, N):
-                value = i
-                while value & 1:
-                    value >>= 1
-                    C[i] += 1
-
-            points = numpy.zeros((N, D), dtype='double')
-
-            # XXX: This appears not to set the first element of V
-            V = numpy.empty(L + 1, dtype=unsigned)
-            for i in range(1, L + 1):
-                V[i] = 1 << (32 - i)
-
-            X = numpy.empty(N, dtype=unsigned)
-            X[0] = 0
-            for i in range(1, N):
-                X[i] = X[i - 1] ^ V[C[i - 1]]
-                points[i, 0] = X[i] / 2 ** 32
-
-            for j in range(1, D):
-                F_int = [int(item) for item in next(f).strip().split()]
-                (d, s, a), m = F_int[:3], [0] + F_int[3:]
-
-                if L <= s:
-                    for i in range(1, L + 1): V[i] = m[i] << (32 - i)
-                else:
-                    for i in range(1, s + 1): V[i] = m[i] << (32 - i)
-                    for i in range(s + 1, L + 1):
-                        V[i] = V[i - s] ^ (
-                            V[i - s] >> numpy.array(s, dtype=unsigned))
-                        for k in range(1, s):
-                            V[i] ^= numpy.array(
-                                (((a >> (s - 1 - k)) & 1) * V[i - k]),
-                                dtype=unsigned)
-
-                X[0] = 0
-                for i in range(1, N):
-                    X[i] = X[i - 1] ^ V[C[i - 1]]
-                    points[i, j] = X[i] / 2 ** 32  # *** the actual points
-
-            return points
+        return sobol_seq.sobol_points(N, D, skip=skip, source=_open_direction_numbers)
 
     def sampling(self):
         """
@@ -562,23 +526,62 @@ class TGO(object):
         """
         Returns the topographical matrix with True boolean values indicating
         positive entries and False ref. values indicating negative values.
+
+        Only the k nearest neighbours of each sampling point are ordered
+        (k = k_t, or enough columns for K_optimal), see nearest_neighbours.
         """
-        self.Y = scipy.spatial.distance.cdist(self.C, self.C, 'euclidean')
-        self.Z = numpy.argsort(self.Y, axis=-1)
-        # Topographical matrix without signs:
-        self.A = numpy.delete(self.Z, 0, axis=-1)
         # Obj. function returns to be used as reference table.:
-        self.F = numpy.zeros(numpy.shape(self.C)[0])
-        for i in range(numpy.shape(self.C)[0]):
-            self.F[i] = self.func(self.C[i, :], *self.args)
-        # TODO: see scipy.spatial.KDTree for F lookup?
+        if self.vectorized:
+            self.F = numpy.asarray(self.func(self.C.T, *self.args),
+                                   dtype=float).reshape(-1)
+        else:
+            self.F = numpy.zeros(numpy.shape(self.C)[0])
+            for i in range(numpy.shape(self.C)[0]):
+                self.F[i] = self.func(self.C[i, :], *self.args)
+
+        self.tree = scipy.spatial.cKDTree(self.C)
+        if self.k_t is None:
+            # K_optimal rarely needs more than 20 columns
+            k = 20
+        else:
+            k = self.k_t
+        self.nearest_neighbours(k)
+        return self.T, self.H, self.F
+
+    def nearest_neighbours(self, k):
+        """
+        Builds the k-t topograph from the k nearest neighbours of each
+        sampling point (ordered by distance and index).
+
+        Parameters
+        ----------
+        k : int
+            Number of columns.
+
+        Returns
+        -------
+        T : numpy.ndarray
+            The k-t topograph with Boolean entries.
+        """
+        n = numpy.shape(self.C)[0]
+        k = max(min(k, n - 1), 0)
+        if k == 0:
+            self.A = numpy.zeros((n, 0), dtype=int)
+        else:
+            Y, Z = self.tree.query(self.C, k=k + 1)
+            # Sort ties by index, the point itself first
+            order = numpy.lexsort((Z, Z != numpy.arange(n)[:, None], Y),
+                                  axis=-1)
+            Z = numpy.take_along_axis(Z, order, axis=-1)
+            # Topographical matrix without signs:
+            self.A = Z[:, 1:]
 
         # Create float value and bool topograph:
         # This replaces all index values in A with the function result:
         self.H = self.F[self.A]
         # Topograph with Boolean entries:
         self.T = (self.H.T > self.F.T).T
-        return self.T, self.H, self.F
+        return self.T
 
     def k_t_matrix(self, T, k):
         """Returns the k-t topograph matrix"""
@@ -596,11 +599,14 @@ class TGO(object):
         proposed by Henderson et. al. (2015)
         """
         # TODO: Recheck correct implementation, compare with HS19
+        n = numpy.shape(self.C)[0]
         K_1 = self.k_t_matrix(self.T, 1)  # 1-t topograph
         k_1 = len(self.minimizers(K_1))
         k_i = k_1
         i = 2
         while k_1 == k_i:
+            if numpy.shape(self.T)[1] < min(i, n - 1):
+                self.nearest_neighbours(2 * i)
             K_i = self.k_t_matrix(self.T, i)
             k_i = len(self.minimizers(K_i))
             i += 1
@@ -610,6 +616,8 @@ class TGO(object):
                           / 2.0)
 
         k_opt = int(k_c + 1)
+        if numpy.shape(self.T)[1] < min(k_opt, n - 1):
+            self.nearest_neighbours(k_opt)
         if k_opt > numpy.shape(self.T)[1]:
             # If size of k_opt exceeds t-graph size.
             k_opt = int(numpy.shape(self.T)[1])
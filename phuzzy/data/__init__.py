@@ -5,9 +5,14 @@ Classes to convert raw data to phuzzy numbers
 """
 # https://en.wikipedia.org/wiki/Probability_distribution_fitting
 
+import collections
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
 import pandas as pd
 
+from phuzzy.shapes import FuzzyNumber
+
 
 class Data():
     """Data"""
@@ -29,44 +34,81 @@ class Data():
             z_{i}=\Phi ^{{-1}}\left({\frac  {i-a}{n+1-2a}}\right)
 
         """
-        df = self.df
-        df.sort_values(by="x", ascending=True, inplace=True)
+        df = self.df.sort_values(by=self.df.columns[0], ascending=True)
         n = len(df)
-        if n <= 10:
-            a = 3. / 8.
-        else:
-            a = .5
-        df["p_blom"] = (np.linspace(1, n, n) - a) / (n + 1. - 2. * a)
-        df["p_weibull"] = (np.linspace(1, n, n)) / (n + 1)
-        df["p_rossow"] = (3 * np.linspace(1, n, n) - 1) / (3 * n + 1)
+        for col, p in get_plotting_positions(np.linspace(1, n, n), n).items():
+            df[col] = p
         return df
 
-    def bootstrap(self, n=10000):
-        """"""
+    def bootstrap(self, n=10000, seed=None, chunksize=2 ** 20, workers=None):
+        """mean and standard deviation of n bootstrap samples
+
+        :param n: number of bootstrap samples
+        :param seed: seed or numpy.random.Generator
+        :param chunksize: max. number of drawn points per block (memory budget)
+        :param workers: number of processes (default: no process pool)
+        :return: DataFrame (x_mean, x_std)
+        """
         n_points = len(self.df)
-        xbar = np.empty((n, 2))
-        for i in range(n):
-            idxs = np.random.randint(n_points, size=n_points)
-            sample = self.df.iloc[idxs]
-            xbar[i, 0] = np.mean(sample)
-            xbar[i, 1] = np.std(sample)
-        df = pd.DataFrame(xbar, columns=["x_mean", "x_std"])
-        return df
+        return self._resample(n, n_points, n_points, seed=seed, chunksize=chunksize, workers=workers)
+
+    def shuffling(self, n=10000, train_fraction=.8, seed=None, chunksize=2 ** 20, workers=None):
+        """shuffling data
 
-    def shuffling(self, n=10000, train_fraction=.8):
-        """shuffling data"""
+        :param n: number of samples
+        :param train_fraction: fraction of points to draw from
+        :param seed: seed or numpy.random.Generator
+        :param chunksize: max. number of drawn points per block (memory budget)
+        :param workers: number of processes (default: no process pool)
+        :return: DataFrame (x_mean, x_std)
+        """
         n_points = len(self.df)
-        xbar = np.empty((n, 2))
         sample_size = int(train_fraction * n_points)
-        for i in range(n):
-            idxs = np.random.randint(sample_size, size=n_points)
-            sample = self.df.iloc[idxs]
-            xbar[i, 0] = np.mean(sample)
-            xbar[i, 1] = np.std(sample)
+        return self._resample(n, sample_size, n_points, seed=seed, chunksize=chunksize, workers=workers)
+
+    def _resample(self, n, population_size, sample_size, seed=None, chunksize=2 ** 20, workers=None):
+        """mean and standard deviation of n samples (with replacement)
+
+        The samples are drawn as (rows, sample_size) index blocks, each block
+        with its own random stream, so the result does not depend on workers.
+
+        :param n: number of samples
+        :param population_size: draw from the first population_size points
+        :param sample_size: number of points per sample
+        :return: DataFrame (x_mean, x_std)
+        """
+        x = self.df.iloc[:, 0].values
+        rows = max(1, int(chunksize) // max(1, sample_size))
+        blocks = [min(rows, n - start) for start in range(0, n, rows)]
+        if isinstance(seed, np.random.Generator):
+            seed = seed.integers(2 ** 63)
+        seeds = np.random.SeedSequence(seed).spawn(len(blocks))
+        args = [(x, population_size, sample_size, rows, seed) for rows, seed in zip(blocks, seeds)]
+        if workers is not None and workers > 1 and len(blocks) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(_get_sample_moments, *zip(*args)))
+        else:
+            results = [_get_sample_moments(*arg) for arg in args]
+        xbar = np.concatenate(results) if results else np.empty((0, 2))
         df = pd.DataFrame(xbar, columns=["x_mean", "x_std"])
         return df
 
 
+def _get_sample_moments(x, population_size, sample_size, rows, seed):
+    """mean and standard deviation of samples (with replacement)
+
+    :param x: points
+    :param population_size: draw from the first population_size points
+    :param sample_size: number of points per sample
+    :param rows: number of samples
+    :param seed: seed
+    :return: array (rows, 2)
+    """
+    rng = np.random.default_rng(seed)
+    samples = x[rng.integers(population_size, size=(rows, sample_size))]
+    return np.column_stack((samples.mean(axis=1), samples.std(axis=1)))
+
+
 def get_histogram_data(values, bins=None, normed=False):
     if bins is None:
         bins = 'auto'
@@ -77,3 +119,236 @@ def get_histogram_data(values, bins=None, normed=False):
     df["cum_sum"] = df.frequency.cumsum()
     df["cdf"] = df.cum_sum / df.cum_sum.max()
     return df
+
+
+def get_plotting_positions(rank, n):
+    """plotting positions (Blom, Weibull, Rossow) of ranks 1 ... n
+
+    :param rank: ranks (mean rank for a group of points)
+    :param n: number of points
+    :return: dict {p_blom, p_weibull, p_rossow}
+    """
+    rank = np.asarray(rank, dtype=float)
+    if n <= 10:
+        a = 3. / 8.
+    else:
+        a = .5
+    return collections.OrderedDict([("p_blom", (rank - a) / (n + 1. - 2. * a)),
+                                    ("p_weibull", rank / (n + 1.)),
+                                    ("p_rossow", (3 * rank - 1) / (3 * n + 1.))])
+
+
+def _get_chunk(values):
+    """finite values of a chunk as flat float array"""
+    values = np.asarray(values, dtype=float).ravel()
+    return values[np.isfinite(values)]
+
+
+class Histogram(object):
+    """fixed bin histogram, updated chunkwise
+
+    Histograms with the same edges can be merged (e.g. from several processes).
+    Values outside of the edges are counted as underflow and overflow.
+    """
+
+    def __init__(self, edges=None, bins=10, range=None):
+        """Histogram(edges) or Histogram(bins, range)
+
+        :param edges: bin edges
+        :param bins: number of bins
+        :param range: (min, max)
+        """
+        if edges is None:
+            if range is None:
+                raise ValueError("edges or range are required")
+            edges = np.linspace(range[0], range[1], int(bins) + 1)
+        self.edges = np.asarray(edges, dtype=float)
+        self.frequency = np.zeros(len(self.edges) - 1, dtype=np.int64)
+        self.underflow = 0
+        self.overflow = 0
+
+    def __str__(self):
+        return "{}({} bins, n={})".format(self.__class__.__name__, len(self.frequency), self.count)
+
+    __repr__ = __str__
+
+    @property
+    def count(self):
+        """number of values (incl. under- and overflow)"""
+        return int(self.frequency.sum()) + self.underflow + self.overflow
+
+    def update(self, values):
+        """add values
+
+        :param values: values
+        :return: None
+        """
+        values = _get_chunk(values)
+        self.frequency += np.histogram(values, bins=self.edges)[0]
+        self.underflow += int(np.count_nonzero(values < self.edges[0]))
+        self.overflow += int(np.count_nonzero(values > self.edges[-1]))
+
+    def merge(self, other):
+        """add counts of other histogram
+
+        :param other: Histogram
+        :return: self
+        """
+        if len(other.edges) != len(self.edges) or not np.array_equal(other.edges, self.edges):
+            raise ValueError("histograms have different edges")
+        self.frequency += other.frequency
+        self.underflow += other.underflow
+        self.overflow += other.overflow
+        return self
+
+    def to_df(self):
+        """histogram data (see get_histogram_data)
+
+        :return: DataFrame
+        """
+        left, right = self.edges[:-1], self.edges[1:]
+        center = (right + left) / 2
+        df = pd.DataFrame({"frequency": self.frequency, "left": left, "right": right, "center": center})
+        df["cum_sum"] = df.frequency.cumsum()
+        df["cdf"] = df.cum_sum / df.cum_sum.max()
+        return df
+
+
+class QuantileSketch(object):
+    """mergeable quantile sketch (t-digest like)
+
+    The sorted values are summarized by centroids (mean, weight). The size of the
+    centroids follows an arcsine scale function, so the centroids are small in the
+    tails and the extreme quantiles remain accurate. Min, max, sum and count are exact.
+
+    .. code-block:: python
+
+        sketch = QuantileSketch()
+        for chunk in pd.read_csv("measurements.csv", chunksize=100000):
+            sketch.update(chunk.x)
+        df = sketch.estimate_probability()
+        x = sketch.get_fuzzynumber(name="x")
+
+    """
+
+    def __init__(self, compression=200):
+        """QuantileSketch(compression)
+
+        :param compression: number of centroids (approx.)
+        """
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.count = 0
+        self.total = 0.
+        self.min = np.inf
+        self.max = -np.inf
+
+    def __str__(self):
+        return "{}({} centroids, n={})".format(self.__class__.__name__, len(self.means), self.count)
+
+    __repr__ = __str__
+
+    @property
+    def mean(self):
+        """mean of all values"""
+        return self.total / self.count
+
+    def update(self, values):
+        """add values
+
+        :param values: values
+        :return: None
+        """
+        values = _get_chunk(values)
+        if len(values) == 0:
+            return
+        self.count += len(values)
+        self.total += values.sum()
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        self._compress(np.concatenate((self.means, values)),
+                       np.concatenate((self.weights, np.ones(len(values)))))
+
+    def merge(self, other):
+        """add centroids of other sketch
+
+        :param other: QuantileSketch
+        :return: self
+        """
+        if other.count == 0:
+            return self
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress(np.concatenate((self.means, other.means)),
+                       np.concatenate((self.weights, other.weights)))
+        return self
+
+    def _compress(self, means, weights):
+        """merge neighbouring centroids within one unit of the scale function
+
+        :param means: centroid means
+        :param weights: centroid weights
+        :return: None
+        """
+        order = np.argsort(means, kind="mergesort")
+        means = means[order]
+        weights = weights[order]
+        cum = np.cumsum(weights)
+        q = (cum - weights / 2.) / cum[-1]
+        k = np.floor(self.compression / np.pi * np.arcsin(np.clip(2 * q - 1, -1, 1)))
+        starts = np.flatnonzero(np.r_[True, k[1:] != k[:-1]])
+        self.weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / self.weights
+
+    def _get_grid(self):
+        """quantiles and values of the centroids incl. min and max"""
+        q = (np.cumsum(self.weights) - self.weights / 2.) / self.count
+        return np.r_[0., q, 1.], np.r_[self.min, self.means, self.max]
+
+    def ppf(self, q):
+        """quantiles (percent point function)
+
+        :param q: probabilities
+        :return: values
+        """
+        xp, fp = self._get_grid()
+        return np.interp(q, xp, fp)
+
+    def cdf(self, x):
+        """cumulative distribution function
+
+        :param x: values
+        :return: probabilities
+        """
+        xp, fp = self._get_grid()
+        return np.interp(x, fp, xp)
+
+    def estimate_probability(self):
+        """plotting positions of the centroids (see Data.estimate_probability)
+
+        :return: DataFrame (x, p_blom, p_weibull, p_rossow)
+        """
+        # mean rank of the points of each centroid
+        rank = np.cumsum(self.weights) - (self.weights - 1.) / 2.
+        df = pd.DataFrame({"x": self.means})
+        for col, p in get_plotting_positions(rank, self.count).items():
+            df[col] = p
+        return df
+
+    def get_fuzzynumber(self, number_of_alpha_levels=11, name="x"):
+        """fuzzy number from the quantiles
+
+        The alpha cut of level alpha is the central interval with probability
+        1 - alpha: [ppf(alpha / 2), ppf(1 - alpha / 2)].
+
+        :param number_of_alpha_levels: number of alpha levels
+        :param name: name
+        :return: FuzzyNumber
+        """
+        alpha = np.linspace(0, 1, int(number_of_alpha_levels))
+        p = FuzzyNumber(name=name, number_of_alpha_levels=len(alpha))
+        p.values = np.column_stack((alpha, self.ppf(alpha / 2.), self.ppf(1. - alpha / 2.)))
+        return p
@@ -0,0 +1,274 @@
+# -*- coding: utf-8 -*-
+
+"""Deferred fuzzy arithmetic
+
+Operators on :class:`Deferred` nodes build an expression graph instead of
+intermediate fuzzy numbers. :meth:`Deferred.evaluate` discretizes all fuzzy
+operands once on a common alpha level grid and evaluates the graph in one
+vectorized pass over all alpha levels. Shared sub expressions are evaluated once.
+
+.. code-block:: python
+
+    P, L, E, I = phuzzy.Deferred.variables_of(P, L, E, I)
+    w = P * L ** 3 / (48 * E * I)
+    w.repeated_variables()  # [] -> no dependency problem
+    w.evaluate().df
+
+The interval rules are the ones of :class:`phuzzy.FuzzyArray`.
+"""
+
+import numpy as np
+
+from phuzzy.shapes import FuzzyNumber, _get_alpha_grid
+from phuzzy.fuzzyarray import FuzzyArray, _interp_levels, _interval_operation, _interval_power, _interval_abs, \
+    _interval_neg, _make_convex
+
+_binary_operations = {"+": np.add,
+                      "-": np.subtract,
+                      "*": np.multiply,
+                      "/": np.true_divide,
+                      }
+
+
+class Deferred(object):
+    """node of a deferred fuzzy arithmetic expression"""
+
+    # let numpy defer to the reflected operators, e.g. np.array([1, 2]) * x
+    __array_ufunc__ = None
+
+    def __init__(self, value=None, op=None, operands=(), name=None):
+        """Deferred(value) or Deferred(op=..., operands=...)
+
+        :param value: phuzzy.FuzzyNumber, phuzzy.FuzzyArray or crisp number(s) (leaf)
+        :param op: operator symbol (+, -, *, /, ^, neg, abs)
+        :param operands: operand nodes
+        :param name: name
+        """
+        if op is None:
+            if isinstance(value, Deferred):
+                raise TypeError("value is already deferred")
+            if not isinstance(value, (FuzzyNumber, FuzzyArray)):
+                if name is None:
+                    name = str(value)
+                value = np.asarray(value, dtype=float)
+                if value.ndim > 1:
+                    raise ValueError("crisp operands must be scalars or 1d arrays")
+        elif op not in _binary_operations and op not in ("^", "neg", "abs"):
+            raise ValueError("unknown operator '{}'".format(op))
+        self.value = value
+        self.op = op
+        self.operands = tuple(operands)
+        if name is None:
+            name = self._get_name()
+        self.name = name
+
+    def __str__(self):
+        return "{0.__class__.__name__}({0.name})".format(self)
+
+    __repr__ = __str__
+
+    @classmethod
+    def variables_of(cls, *values):
+        """create leaf nodes
+
+        :param values: fuzzy numbers or fuzzy arrays
+        :return: list of Deferred
+        """
+        return [cls(value) for value in values]
+
+    @property
+    def is_leaf(self):
+        """node is an operand (no operation)"""
+        return self.op is None
+
+    @property
+    def is_fuzzy(self):
+        """leaf is a fuzzy number or fuzzy array"""
+        return isinstance(self.value, (FuzzyNumber, FuzzyArray))
+
+    def _get_name(self):
+        if self.is_leaf:
+            return self.value.name
+        names = [x.name if x.is_leaf else "({})".format(x.name) for x in self.operands]
+        if self.op == "neg":
+            return "-{}".format(*names)
+        if self.op == "abs":
+            return "|{}|".format(self.operands[0].name)
+        return "{}{}{}".format(names[0], self.op, names[1])
+
+    @staticmethod
+    def _as_node(other):
+        if isinstance(other, Deferred):
+            return other
+        if isinstance(other, (int, float, np.number, np.ndarray, list, tuple, FuzzyNumber, FuzzyArray)):
+            return Deferred(other)
+        raise TypeError
+
+    def _binary(self, other, op, reflected=False):
+        try:
+            other = self._as_node(other)
+        except (TypeError, ValueError):
+            return NotImplemented
+        if reflected:
+            return Deferred(op=op, operands=(other, self))
+        return Deferred(op=op, operands=(self, other))
+
+    def __add__(self, other):
+        return self._binary(other, "+")
+
+    def __radd__(self, other):
+        return self._binary(other, "+", reflected=True)
+
+    def __sub__(self, other):
+        return self._binary(other, "-")
+
+    def __rsub__(self, other):
+        return self._binary(other, "-", reflected=True)
+
+    def __mul__(self, other):
+        return self._binary(other, "*")
+
+    def __rmul__(self, other):
+        return self._binary(other, "*", reflected=True)
+
+    def __truediv__(self, other):
+        return self._binary(other, "/")
+
+    def __rtruediv__(self, other):
+        return self._binary(other, "/", reflected=True)
+
+    __div__ = __truediv__
+    __rdiv__ = __rtruediv__
+
+    def __pow__(self, other):
+        return self._binary(other, "^")
+
+    def __rpow__(self, other):
+        return self._binary(other, "^", reflected=True)
+
+    def __neg__(self):
+        return Deferred(op="neg", operands=(self,))
+
+    def __abs__(self):
+        return Deferred(op="abs", operands=(self,))
+
+    def abs(self):
+        """calculate absolute values
+
+        :return: Deferred
+        """
+        return self.__abs__()
+
+    def nodes(self):
+        """all nodes of the expression graph, operands before operations
+
+        :return: list of Deferred
+        """
+        nodes = []
+        visited = set()
+        stack = [(self, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if expanded:
+                nodes.append(node)
+            elif id(node) not in visited:
+                visited.add(id(node))
+                stack.append((node, True))
+                stack.extend((x, False) for x in reversed(node.operands))
+        return nodes
+
+    def _get_occurrences(self, nodes):
+        """number of occurrences of each fuzzy operand in the expanded expression
+
+        :param nodes: nodes (see nodes())
+        :return: dict {id(value): [value, occurrences]}
+        """
+        counts = {id(self): 1}
+        occurrences = {}
+        for node in reversed(nodes):
+            count = counts.get(id(node), 0)
+            if node.is_leaf:
+                if node.is_fuzzy:
+                    occurrences.setdefault(id(node.value), [node.value, 0])[1] += count
+            else:
+                for x in node.operands:
+                    counts[id(x)] = counts.get(id(x), 0) + count
+        return occurrences
+
+    def variables(self):
+        """fuzzy operands of the expression
+
+        :return: list of phuzzy.FuzzyNumber or phuzzy.FuzzyArray
+        """
+        return [value for value, count in self._get_occurrences(self.nodes()).values()]
+
+    def repeated_variables(self):
+        """fuzzy operands which occur more than once in the expression
+
+        Interval arithmetic treats every occurrence as independent, so the result
+        of an expression with repeated variables overestimates the exact range
+        (dependency problem).
+
+        :return: list of phuzzy.FuzzyNumber or phuzzy.FuzzyArray
+        """
+        return [value for value, count in self._get_occurrences(self.nodes()).values() if count > 1]
+
+    def evaluate(self, number_of_alpha_levels=None):
+        """evaluate the expression
+
+        :param number_of_alpha_levels: number of alpha levels (default: max of all fuzzy operands)
+        :return: phuzzy.FuzzyNumber, or phuzzy.FuzzyArray if any operand is an array
+        """
+        nodes = self.nodes()
+        leaves = [node.value for node in nodes if node.is_leaf and node.is_fuzzy]
+        as_array = any(isinstance(x, FuzzyArray) for x in leaves)
+        if number_of_alpha_levels is None:
+            number_of_alpha_levels = max([len(x.alpha) if isinstance(x, FuzzyArray) else len(x.values)
+                                          for x in leaves] or [2])
+        alpha = _get_alpha_grid(number_of_alpha_levels)
+
+        results = {}
+        for node in nodes:
+            if node.is_leaf:
+                bounds = self._get_leaf_bounds(node.value, alpha)
+                as_array = as_array or bounds.shape[0] > 1
+            elif node.op == "neg":
+                bounds = _interval_neg(results[id(node.operands[0])])
+            elif node.op == "abs":
+                bounds = _make_convex(_interval_abs(results[id(node.operands[0])]))
+            else:
+                x, y = [results[id(operand)] for operand in node.operands]
+                if node.op == "^":
+                    bounds = _make_convex(_interval_power(x, y))
+                else:
+                    bounds = _interval_operation(x, y, _binary_operations[node.op])
+            results[id(node)] = bounds
+
+        bounds = np.broadcast_to(results[id(self)], (results[id(self)].shape[0], len(alpha), 2))
+        if as_array:
+            return FuzzyArray(alpha=alpha, bounds=bounds.copy(), name=self.name)
+        new = FuzzyNumber(name=self.name, number_of_alpha_levels=len(alpha))
+        new.values = np.column_stack((alpha, bounds[0, :, 0], bounds[0, :, 1]))
+        return new
+
+    @staticmethod
+    def _get_leaf_bounds(value, alpha):
+        """bounds of an operand on the alpha level grid
+
+        :param value: phuzzy.FuzzyNumber, phuzzy.FuzzyArray or crisp number(s)
+        :param alpha: alpha levels
+        :return: bounds (N, number_of_alpha_levels, 2), crisp values (N, 1, 2)
+        """
+        if isinstance(value, FuzzyArray):
+            if len(value.alpha) == len(alpha) and np.array_equal(value.alpha, alpha):
+                return value.bounds
+            return _interp_levels(value.alpha, value.bounds, alpha)
+        if isinstance(value, FuzzyNumber):
+            if value._has_alpha_grid(alpha):
+                return value.values[None, :, 1:]
+            data = value.values
+            data = data[np.argsort(data[:, 0], kind="mergesort")]
+            return _interp_levels(data[:, 0], data[None, :, 1:], alpha)
+        # crisp values are degenerated intervals [x, x]
+        x = value.reshape(-1, 1, 1)
+        return np.concatenate((x, x), axis=-1)
@@ -1,7 +1,15 @@
 # -*- coding: utf-8 -*-
 
+import collections
+import hashlib
+import json
 import os
+import pickle
+import sqlite3
 import subprocess
+import types
+
+import numpy as np
 import numexpr
 
 class ExpressionBase(object):
@@ -63,21 +71,280 @@ class StrExpression(ExpressionBase):
 class CliExpression(ExpressionBase):
     """Approximate an expression of fuzzy numbers
 
+    The command is called with the arguments (see get_cmd), the result is read
+    from the last line of stdout or from resultfile (see read_result).
     """
 
     def __init__(self, **kwargs):
-        """Expression(kwargs)"""
+        """Expression(kwargs)
+
+        :param cmd: command (str or list, e.g. [sys.executable, "solver.py"])
+        :param workpath: working directory
+        :param resultfile: result file in workpath (default: stdout)
+        """
         ExpressionBase.__init__(self, **kwargs)
         self.cmd = kwargs.get("cmd")
         self.workpath = kwargs.get("workpath") or os.path.dirname(__file__)
+        self.resultfile = kwargs.get("resultfile")
+
+    def get_cmd(self, *args, **kwargs):
+        """command line of a call
+
+        :return: list of str
+        """
+        cmd = [self.cmd] if isinstance(self.cmd, str) else list(self.cmd)
+        return cmd + [str(x) for x in args] + ["--{}={}".format(k, v) for k, v in sorted(kwargs.items())]
+
+    def read_result(self, stdout):
+        """read the result of a call
+
+        :param stdout: output of the command
+        :return: float or list of floats
+        """
+        if self.resultfile is not None:
+            with open(os.path.join(self.workpath, self.resultfile)) as fh:
+                stdout = fh.read()
+        lines = [line for line in stdout.splitlines() if line.strip()]
+        if not lines:
+            raise ValueError("no result of {}".format(self.cmd))
+        values = [float(x) for x in lines[-1].replace(",", " ").split()]
+        return values[0] if len(values) == 1 else values
 
     def __call__(self, *args, **kwargs):
-        """"""
-        print(os.path.abspath(self.cmd))
-        print(self.cmd)
-        cmd = [self.cmd] + [str(x) for x in args]
-        print(cmd)
-        subprocess.call(cmd, shell=False, cwd=self.workpath)
+        """run the command and return its result"""
+        stdout = subprocess.check_output(self.get_cmd(*args, **kwargs), shell=False, cwd=self.workpath,
+                                         universal_newlines=True)
+        return self.read_result(stdout)
+
+
+class CachedExpression(ExpressionBase):
+    """Cache the results of an expression
+
+    Results are stored in memory (LRU) and optionally in a SQLite database, so
+    a restarted analysis does not recompute points. The cache key is a hash of
+    the expression identity and the arguments rounded to ``decimals`` digits.
+
+    .. code-block:: python
+
+        f = CachedExpression(expression=CliExpression(cmd=[sys.executable, "solver.py"]),
+                             filepath="solver_cache.sqlite")
+        f(1.5)
+        f.stats
+
+    The default key is derived when the CachedExpression is created:
+
+    * CliExpression: class and command
+    * functions: name, byte code, defaults and captured values
+    * ufuncs and builtins: module and name
+    * bound methods and other callables: name and the pickled state of the instance
+
+    Pass ``key`` if the identity cannot be derived (unpicklable state) or if the
+    results depend on state which changes later. Results ``None`` are not cached.
+    """
+
+    def __init__(self, **kwargs):
+        """CachedExpression(kwargs)
+
+        :param expression: expression (ExpressionBase or callable)
+        :param key: expression identity (default: derived from the expression, see above)
+        :param maxsize: max. number of results in memory
+        :param decimals: decimals of the rounded arguments
+        :param filepath: SQLite database (optional)
+        """
+        self.expression = kwargs.get("expression")
+        if self.expression is None:
+            raise Exception("expression not defined")
+        kwargs.setdefault("name", getattr(self.expression, "name", None))
+        ExpressionBase.__init__(self, **kwargs)
+        self.key = kwargs.get("key") or self._get_expression_key(self.expression)
+        self.maxsize = kwargs.get("maxsize", 1024)
+        self.decimals = kwargs.get("decimals", 12)
+        self.filepath = kwargs.get("filepath")
+        self._memory = collections.OrderedDict()
+        self._connection = None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_connection"] = None
+        return state
+
+    @staticmethod
+    def _get_expression_key(expression):
+        """identity of an expression
+
+        :param expression: expression
+        :return: str
+        """
+        if isinstance(expression, CliExpression):
+            identity = json.dumps([expression.cmd, expression.resultfile])
+        elif isinstance(expression, (Expression, StrExpression)):
+            identity = expression.function
+        else:
+            identity = expression
+        if callable(identity):
+            identity = CachedExpression._get_callable_key(identity)
+        return "{}:{}".format(expression.__class__.__name__, identity)
+
+    @staticmethod
+    def _get_state_key(obj, function):
+        """hash of the pickled state of an object (its attributes, the class is part of the key)
+
+        :param obj: object
+        :param function: callable depending on obj (error message)
+        :return: str
+        """
+        try:
+            data = pickle.dumps(getattr(obj, "__dict__", obj), protocol=2)
+        except Exception as exp:
+            raise ValueError("no cache key for {!r}, its state cannot be pickled ({}), "
+                             "pass key=...".format(function, exp))
+        return hashlib.sha1(data).hexdigest()
+
+    @staticmethod
+    def _get_callable_key(function):
+        """identity of a callable
+
+        :param function: callable
+        :return: str
+        """
+        if isinstance(function, types.FunctionType):
+            return CachedExpression._get_function_key(function)
+        if isinstance(function, (types.BuiltinFunctionType, np.ufunc)):
+            # stateless
+            return "{}.{}".format(getattr(function, "__module__", None) or "numpy", function.__name__)
+        if isinstance(function, types.MethodType):
+            return "{}@{}".format(CachedExpression._get_callable_key(function.__func__),
+                                  CachedExpression._get_state_key(function.__self__, function))
+        cls = function.__class__
+        return "{}.{}@{}".format(cls.__module__, cls.__qualname__, CachedExpression._get_state_key(function, function))
+
+    @staticmethod
+    def _get_function_key(function):
+        """identity of a plain function (name, byte code, defaults and captured values)
+
+        :param function: function
+        :return: str
+        """
+
+        def _get_value(value):
+            if value is None or isinstance(value, (bool, int, float, str)):
+                return value
+            if isinstance(value, (np.ndarray, np.number)):
+                return value.tolist()
+            if isinstance(value, tuple):
+                return [_get_value(x) for x in value]
+            if callable(value):
+                return CachedExpression._get_callable_key(value)
+            return CachedExpression._get_state_key(value, function)
+
+        state = [_get_value(function.__defaults__),
+                 [[k, _get_value(v)] for k, v in sorted((function.__kwdefaults__ or {}).items())]]
+        for cell in function.__closure__ or ():
+            try:
+                value = cell.cell_contents
+            except ValueError:
+                raise ValueError("no cache key for {!r} (empty closure cell), pass key=...".format(function))
+            state.append(_get_value(value))
+
+        code = function.__code__
+        identity = "{}.{}".format(function.__module__, function.__qualname__)
+        # different functions with the same name (e.g. lambdas) or different captured values
+        data = code.co_code + repr(code.co_consts).encode("utf-8") + json.dumps(state).encode("utf-8")
+        return identity + ":" + hashlib.sha1(data).hexdigest()
+
+    def _round(self, value):
+        if isinstance(value, (list, tuple, np.ndarray, float, int, np.number)):
+            value = np.round(np.asarray(value, dtype=float), self.decimals) + 0.  # -0. -> 0.
+            return value.tolist()
+        return value
+
+    def get_hash(self, *args, **kwargs):
+        """cache key of the arguments
+
+        :return: sha1 hex digest
+        """
+        data = [self.key,
+                [self._round(x) for x in args],
+                [[k, self._round(v)] for k, v in sorted(kwargs.items())]]
+        return hashlib.sha1(json.dumps(data, default=repr).encode("utf-8")).hexdigest()
+
+    @property
+    def connection(self):
+        """SQLite connection (None, if no filepath is defined)"""
+        if self._connection is None and self.filepath is not None:
+            self._connection = sqlite3.connect(self.filepath)
+            self._connection.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value BLOB)")
+            self._connection.commit()
+        return self._connection
+
+    def close(self):
+        """close the SQLite connection
+
+        :return: None
+        """
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _remember(self, key, value):
+        self._memory[key] = value
+        while len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+    def __call__(self, *args, **kwargs):
+        """evaluate expression or take the result from the cache"""
+        key = self.get_hash(*args, **kwargs)
+        if key in self._memory:
+            # least recently used entries are removed first
+            value = self._memory.pop(key)
+            self._memory[key] = value
+            self.hits += 1
+            return value
+
+        if self.connection is not None:
+            row = self.connection.execute("SELECT value FROM results WHERE key=?", (key,)).fetchone()
+            if row is not None:
+                value = pickle.loads(row[0])
+                self._remember(key, value)
+                self.hits += 1
+                self.disk_hits += 1
+                return value
+
+        self.misses += 1
+        value = self.expression(*args, **kwargs)
+        if value is not None:
+            self._remember(key, value)
+            if self.connection is not None:
+                self.connection.execute("INSERT OR REPLACE INTO results (key, value) VALUES (?, ?)",
+                                        (key, sqlite3.Binary(pickle.dumps(value, protocol=2))))
+                self.connection.commit()
+        return value
+
+    @property
+    def stats(self):
+        """cache statistics
+
+        :return: dict
+        """
+        calls = self.hits + self.misses
+        return {"hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": float(self.hits) / calls if calls > 0 else 0.,
+                "size": len(self._memory)}
+
+    def clear(self):
+        """clear the memory cache and the statistics (the SQLite database is kept)
+
+        :return: None
+        """
+        self._memory.clear()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
 
 
 if __name__ == '__main__':
@@ -96,29 +363,15 @@ if __name__ == '__main__':
 
 
     x2c = CliExpression(name="x2c", cmd="../tests/f2.py")
-    x2c(2)
+    print("x2c(2)", x2c(2))
 
 
     class F2(CliExpression):
-        def __init__(self, **kwargs):
-            CliExpression.__init__(self, **kwargs)
-
-        def __call__(self, *args, **kwargs):
-            """"""
-            try:
-                x = args[0]
-                cmd = [self.cmd, "-x", "{}".format(x)]
-                print(cmd)
-                subprocess.call(cmd, shell=False, cwd=self.workpath)
-                print(os.path.exists(os.path.join(self.workpath, "expensive_cli_expression.res")))
-
-                y = float(open(os.path.join(self.workpath, "expensive_cli_expression.res")).read())
-                return y
-            except Exception as exp:
-                print(exp)
+        def get_cmd(self, *args, **kwargs):
+            return [self.cmd, "-x", "{}".format(args[0])]
 
 
     f2bin = os.path.abspath("../tests/expensive_cli_expression.py")
-    f2 = F2(name="f2", cmd=f2bin, workpath="/tmp")
+    f2 = F2(name="f2", cmd=f2bin, workpath="/tmp", resultfile="expensive_cli_expression.res")
     y = f2(9)
     print("f2(2)", y)
@@ -0,0 +1,392 @@
+# -*- coding: utf-8 -*-
+
+"""Array of fuzzy numbers
+
+A :class:`FuzzyArray` holds N fuzzy numbers on a common alpha level grid in
+one array ``bounds`` of shape (N, number_of_alpha_levels, 2). The operators
+apply the interval rules of :class:`phuzzy.FuzzyNumber` to all fuzzy numbers
+and alpha levels at once.
+
+.. code-block:: python
+
+    P = FuzzyArray.from_trapezoids(alpha0=[[4950, 5050], [9900, 10100]], alpha1=[[5000, 5000], [10000, 10000]])
+    L = FuzzyArray.from_trapezoids(alpha0=[[1980, 2020], [2970, 3030]], alpha1=[[2000, 2000], [3000, 3000]])
+    E = FuzzyArray.from_trapezoids(alpha0=[[27000, 33000]] * 2, alpha1=[[30000, 30000]] * 2)
+    I = 1e9
+    w = P * L ** 3 / (48 * E * I)
+    w[1].df
+
+"""
+
+import numpy as np
+
+from phuzzy.shapes import FuzzyNumber, get_polygon_centroid
+
+
+def _interp_levels(alpha, bounds, alpha_new):
+    """interpolate bounds linearly onto new alpha levels
+
+    :param alpha: ascending alpha levels
+    :param bounds: bounds (..., len(alpha), 2)
+    :param alpha_new: new alpha levels
+    :return: bounds (..., len(alpha_new), 2)
+    """
+    alpha = np.asarray(alpha, dtype=float)
+    alpha_new = np.asarray(alpha_new, dtype=float)
+    if len(alpha) == 1:
+        return np.repeat(bounds, len(alpha_new), axis=-2)
+    idx = np.clip(np.searchsorted(alpha, alpha_new, side="right") - 1, 0, len(alpha) - 2)
+    da = alpha[idx + 1] - alpha[idx]
+    with np.errstate(all="ignore"):
+        w = np.where(da > 0, (alpha_new - alpha[idx]) / da, 0.)
+    w = np.clip(w, 0., 1.)[:, None]
+    return bounds[..., idx, :] * (1. - w) + bounds[..., idx + 1, :] * w
+
+
+def _interval_operation(x, y, op):
+    """apply a binary operation on intervals
+
+    :param x: bounds (..., 2)
+    :param y: bounds (..., 2)
+    :param op: binary function
+    :return: bounds (..., 2)
+    """
+    with np.errstate(all="ignore"):
+        quotients = np.stack([op(x[..., 0], y[..., 0]),
+                              op(x[..., 0], y[..., 1]),
+                              op(x[..., 1], y[..., 0]),
+                              op(x[..., 1], y[..., 1])])
+    # fmin/fmax ignore nans like np.nanmin/np.nanmax
+    return np.stack([np.fmin.reduce(quotients, axis=0),
+                     np.fmax.reduce(quotients, axis=0)], axis=-1)
+
+
+def _interval_power(x, y):
+    """apply power on intervals
+
+    x ** y is monotonic on both sides of zero, so the extremes of a base interval
+    containing zero are found at its bounds or at zero. Signed zeros give the
+    one sided limits for negative exponents, e.g. (-0.) ** -1 = -inf.
+
+    :param x: base bounds (..., 2)
+    :param y: exponent bounds (..., 2)
+    :return: bounds (..., 2)
+    """
+    l = x[..., 0]
+    r = x[..., 1]
+    x = np.stack([np.where(l == 0, 0., l), np.where((r == 0) & (l < 0), -0., r)], axis=-1)
+    bounds = _interval_operation(x, y, np.power)
+    inner_zero = (l < 0) & (r > 0)
+    if np.any(inner_zero):
+        zeros = np.stack([np.where(inner_zero, -0., np.nan), np.where(inner_zero, 0., np.nan)], axis=-1)
+        zero_bounds = _interval_operation(zeros, y, np.power)
+        bounds = np.stack([np.fmin(bounds[..., 0], zero_bounds[..., 0]),
+                           np.fmax(bounds[..., 1], zero_bounds[..., 1])], axis=-1)
+    return bounds
+
+
+def _interval_neg(x):
+    """negate intervals
+
+    :param x: bounds (..., 2)
+    :return: bounds (..., 2)
+    """
+    return -x[..., ::-1]
+
+
+def _interval_abs(x):
+    """absolute values of intervals
+
+    :param x: bounds (..., 2)
+    :return: bounds (..., 2)
+    """
+    l = x[..., 0]
+    r = x[..., 1]
+    has_zero = (l <= 0) & (r >= 0)
+    return np.stack([np.where(has_zero, 0., np.minimum(abs(l), abs(r))),
+                     np.maximum(abs(l), abs(r))], axis=-1)
+
+
+def _make_convex(bounds):
+    """make all fuzzy numbers convex
+
+    :param bounds: bounds (..., number_of_alpha_levels, 2)
+    :return: bounds
+    """
+    bounds = bounds.copy()
+    bounds[..., 0] = np.fmin.accumulate(bounds[..., ::-1, 0], axis=-1)[..., ::-1]
+    bounds[..., 1] = np.fmax.accumulate(bounds[..., ::-1, 1], axis=-1)[..., ::-1]
+    return bounds
+
+
+class FuzzyArray(object):
+    """array of fuzzy numbers with a common alpha level grid"""
+
+    # let numpy defer to the reflected operators, e.g. np.array([1, 2]) * x
+    __array_ufunc__ = None
+
+    def __init__(self, **kwargs):
+        """FuzzyArray(alpha=..., bounds=...)
+
+        :param alpha: alpha levels (number_of_alpha_levels,)
+        :param bounds: [l, r] of each fuzzy number and alpha level (N, number_of_alpha_levels, 2)
+        :param name: name
+        """
+        self.name = kwargs.get("name", "x")
+        bounds = np.asarray(kwargs.get("bounds"), dtype=float)
+        if bounds.ndim == 2:
+            bounds = bounds[None, :, :]
+        if bounds.ndim != 3 or bounds.shape[-1] != 2:
+            raise ValueError("bounds must have the shape (N, number_of_alpha_levels, 2)")
+        alpha = kwargs.get("alpha")
+        if alpha is None:
+            alpha = np.linspace(0., 1., bounds.shape[1])
+        self.alpha = np.asarray(alpha, dtype=float)
+        self.bounds = bounds
+
+    def __str__(self):
+        return "{0.__class__.__name__}({0.name}:{1} fuzzy numbers, {2} alpha levels)".format(self, len(self),
+                                                                                          len(self.alpha))
+
+    __repr__ = __str__
+
+    def __len__(self):
+        return self.bounds.shape[0]
+
+    def __getitem__(self, item):
+        """get a fuzzy number (int) or a sub array (slice, mask, index array)"""
+        if isinstance(item, (int, np.integer)):
+            return self.to_fuzzy_number(item)
+        return self.__class__(alpha=self.alpha, bounds=self.bounds[item], name=self.name)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.to_fuzzy_number(i)
+
+    @property
+    def number_of_alpha_levels(self):
+        """number of alpha levels"""
+        return len(self.alpha)
+
+    @property
+    def l(self):
+        """left bounds (N, number_of_alpha_levels)"""
+        return self.bounds[..., 0]
+
+    @property
+    def r(self):
+        """right bounds (N, number_of_alpha_levels)"""
+        return self.bounds[..., 1]
+
+    def min(self):
+        """minimum of each fuzzy number
+
+        :rtype: numpy.ndarray
+        :return: min values (N,)
+        """
+        return self.bounds.min(axis=(1, 2))
+
+    def max(self):
+        """maximum of each fuzzy number
+
+        :rtype: numpy.ndarray
+        :return: max values (N,)
+        """
+        return self.bounds.max(axis=(1, 2))
+
+    def has_zero(self):
+        """is zero in range
+
+        :rtype: numpy.ndarray
+        :return: bool array (N,)
+        """
+        return (self.min() <= 0) & (self.max() >= 0)
+
+    def defuzzification_centroid(self):
+        """center of gravity of each fuzzy number
+
+        :rtype: numpy.ndarray
+        :return: centroids (N,)
+        """
+        x = np.concatenate((self.l, self.r[:, ::-1]), axis=-1)
+        y = np.broadcast_to(np.concatenate((self.alpha, self.alpha[::-1])), x.shape)
+        return get_polygon_centroid(x, y)
+
+    def make_convex(self):
+        """make all fuzzy numbers convex
+
+        :return: None
+        """
+        self.bounds = _make_convex(self.bounds)
+
+    @classmethod
+    def from_fuzzy_numbers(cls, fuzzy_numbers, name=None, number_of_alpha_levels=None):
+        """stack fuzzy numbers
+
+        :param fuzzy_numbers: list of phuzzy.FuzzyNumber
+        :param name: name
+        :param number_of_alpha_levels: number of alpha levels (default: max of all fuzzy numbers)
+        :return: FuzzyArray
+        """
+        fuzzy_numbers = list(fuzzy_numbers)
+        if number_of_alpha_levels is None:
+            number_of_alpha_levels = max(len(x.values) for x in fuzzy_numbers)
+        alpha = np.linspace(0., 1., int(number_of_alpha_levels))
+        bounds = np.empty((len(fuzzy_numbers), len(alpha), 2))
+        for i, x in enumerate(fuzzy_numbers):
+            data = x.values
+            data = data[np.argsort(data[:, 0], kind="mergesort")]
+            bounds[i] = _interp_levels(data[:, 0], data[:, 1:], alpha)
+        if name is None:
+            name = "x"
+        return cls(alpha=alpha, bounds=bounds, name=name)
+
+    @classmethod
+    def from_trapezoids(cls, alpha0, alpha1, name=None, number_of_alpha_levels=11):
+        """create trapezoidal (or triangular) fuzzy numbers
+
+        :param alpha0: ranges at alpha=0 (N, 2)
+        :param alpha1: ranges at alpha=1 (N, 2) or values (N,) for triangles
+        :param name: name
+        :param number_of_alpha_levels: number of alpha levels
+        :return: FuzzyArray
+        """
+        alpha0 = np.asarray(alpha0, dtype=float).reshape(-1, 2)
+        alpha1 = np.asarray(alpha1, dtype=float)
+        if alpha1.ndim < 2 or alpha1.shape[-1] != 2:
+            alpha1 = np.repeat(alpha1.reshape(-1, 1), 2, axis=1)
+        alpha = np.linspace(0., 1., int(number_of_alpha_levels))
+        bounds = alpha0[:, None, :] + alpha[None, :, None] * (alpha1 - alpha0)[:, None, :]
+        if name is None:
+            name = "x"
+        return cls(alpha=alpha, bounds=bounds, name=name)
+
+    def to_fuzzy_number(self, i):
+        """get fuzzy number i
+
+        :param i: index
+        :return: phuzzy.FuzzyNumber
+        """
+        bounds = self.bounds[i]
+        new = FuzzyNumber(name="{}[{}]".format(self.name, i), number_of_alpha_levels=len(self.alpha))
+        new.values = np.column_stack((self.alpha, bounds[:, 0], bounds[:, 1]))
+        return new
+
+    def to_fuzzy_numbers(self):
+        """convert to a list of fuzzy numbers
+
+        :return: list of phuzzy.FuzzyNumber
+        """
+        return list(self)
+
+    def _get_bounds(self, other):
+        """get bounds of other on the alpha level grid of self
+
+        :param other: number, array of numbers, phuzzy.FuzzyNumber or FuzzyArray
+        :return: (alpha, bounds of self, bounds of other)
+        """
+        if isinstance(other, FuzzyArray):
+            alpha = other.alpha
+            bounds = other.bounds
+        elif isinstance(other, FuzzyNumber):
+            data = other.values
+            data = data[np.argsort(data[:, 0], kind="mergesort")]
+            alpha = data[:, 0]
+            bounds = data[None, :, 1:]
+        else:
+            # crisp values are degenerated intervals [x, x]
+            x = np.asarray(other, dtype=float)
+            if x.ndim > 1:
+                raise ValueError("crisp operands must be scalars or 1d arrays")
+            x = x.reshape(-1, 1, 1)
+            return self.alpha, self.bounds, np.concatenate((x, x), axis=-1)
+
+        if len(alpha) == len(self.alpha) and np.array_equal(alpha, self.alpha):
+            return self.alpha, self.bounds, bounds
+
+        levels = max(len(alpha), len(self.alpha))
+        alpha_new = np.linspace(0., 1., levels)
+        return (alpha_new,
+                _interp_levels(self.alpha, self.bounds, alpha_new),
+                _interp_levels(alpha, bounds, alpha_new))
+
+    def _binary(self, other, op, symbol, reflected=False):
+        """apply a binary interval operation
+
+        :param other: operand
+        :param op: binary function
+        :param symbol: operator symbol for the name
+        :param reflected: True, if self is the right operand
+        :return: FuzzyArray
+        """
+        try:
+            alpha, x, y = self._get_bounds(other)
+        except (TypeError, ValueError):
+            return NotImplemented
+        other_name = getattr(other, "name", other)
+        if reflected:
+            x, y = y, x
+            name = "{}{}{}".format(other_name, symbol, self.name)
+        else:
+            name = "{}{}{}".format(self.name, symbol, other_name)
+        if symbol == "^":
+            bounds = _make_convex(_interval_power(x, y))
+        else:
+            bounds = _interval_operation(x, y, op)
+        return self.__class__(alpha=alpha, bounds=bounds, name=name)
+
+    def __add__(self, other):
+        return self._binary(other, np.add, "+")
+
+    def __radd__(self, other):
+        return self._binary(other, np.add, "+", reflected=True)
+
+    def __sub__(self, other):
+        return self._binary(other, np.subtract, "-")
+
+    def __rsub__(self, other):
+        return self._binary(other, np.subtract, "-", reflected=True)
+
+    def __mul__(self, other):
+        return self._binary(other, np.multiply, "*")
+
+    def __rmul__(self, other):
+        return self._binary(other, np.multiply, "*", reflected=True)
+
+    def __truediv__(self, other):
+        return self._binary(other, np.true_divide, "/")
+
+    def __rtruediv__(self, other):
+        return self._binary(other, np.true_divide, "/", reflected=True)
+
+    __div__ = __truediv__
+    __rdiv__ = __rtruediv__
+
+    def __pow__(self, other):
+        return self._binary(other, np.power, "^")
+
+    def __rpow__(self, other):
+        return self._binary(other, np.power, "^", reflected=True)
+
+    def __neg__(self):
+        """apply unary neg operator to all fuzzy numbers
+
+        :return: FuzzyArray
+        """
+        bounds = _interval_neg(self.bounds)
+        return self.__class__(alpha=self.alpha, bounds=bounds, name="-{}".format(self.name))
+
+    def __abs__(self):
+        """apply abs operator to all fuzzy numbers
+
+        :return: FuzzyArray
+        """
+        bounds = _make_convex(_interval_abs(self.bounds))
+        return self.__class__(alpha=self.alpha, bounds=bounds, name="|{}|".format(self.name))
+
+    def abs(self):
+        """calculate absolute values
+
+        :return: FuzzyArray
+        """
+        return self.__abs__()
@@ -8,15 +8,186 @@ import sys
 
 is_py2 = sys.version_info.major == 2
 
+if is_py2:
+    import collections as collections_abc
+else:
+    import collections.abc as collections_abc
+
 import numpy as np
 import pandas as pd
 import copy
-from scipy.integrate import cumtrapz
 import scipy.stats
 
 
+def _get_alpha_level_array(df):
+    """extract alpha levels from a dataframe
+
+    :param df: DataFrame with columns=["alpha", "l", "r"]
+    :rtype: numpy.ndarray
+    :return: contiguous float array with columns [alpha, l, r]
+    """
+    return np.column_stack([np.asarray(df["alpha"], dtype=float),
+                            np.asarray(df["l"], dtype=float),
+                            np.asarray(df["r"], dtype=float)])
+
+
+_alpha_grids = {}
+
+
+def _get_alpha_grid(number_of_alpha_levels):
+    """get the shared (interned) equidistant alpha level grid
+
+    All fuzzy numbers discretized with the same number of alpha levels refer to the
+    same read-only array, so equal grids can be compared by identity.
+
+    :param number_of_alpha_levels: number of alpha levels
+    :rtype: numpy.ndarray
+    :return: alpha levels from 0 to 1
+    """
+    number_of_alpha_levels = int(number_of_alpha_levels)
+    grid = _alpha_grids.get(number_of_alpha_levels)
+    if grid is None:
+        grid = np.linspace(0., 1., number_of_alpha_levels)
+        grid.flags.writeable = False
+        grid = _alpha_grids.setdefault(number_of_alpha_levels, grid)
+    return grid
+
+
+def _get_cdf_table(data):
+    """segment table of the piecewise linear membership function
+
+    The membership function is linear between its breakpoints (the alpha level
+    bounds), so the cdf is piecewise quadratic. Jumps (e.g. vertical flanks) are
+    handled by taking the limits inside each segment.
+
+    :param data: alpha level array [alpha, l, r]
+    :return: (x0, y0, slope, area) of the segments, area is the cumulated area at x0
+    """
+    y_ = np.hstack((data[:, 0], data[::-1, 0]))
+    x_ = np.hstack((data[:, 1], data[::-1, 2]))
+    xmin = data[0, 1]
+    xmax = data[0, 2]
+    x0 = np.unique(np.hstack((xmin, x_[(x_ > xmin) & (x_ < xmax)], xmax)))
+    dx = np.diff(x0)
+    # membership is linear inside each segment: extrapolate to the segment bounds
+    v1 = np.interp(x0[:-1] + dx / 3., x_, y_)
+    v2 = np.interp(x0[:-1] + 2. * dx / 3., x_, y_)
+    y0 = 2. * v1 - v2
+    y1 = 2. * v2 - v1
+    with np.errstate(all="ignore"):
+        slope = np.where(dx > 0, (y1 - y0) / dx, 0.)
+    area = np.hstack((0., np.cumsum((y0 + y1) / 2. * dx)))
+    return x0, y0, slope, area
+
+
+def _get_membership_points(data):
+    """points of the membership function sorted by x (and alpha)
+
+    :param data: alpha level array [alpha, l, r]
+    :return: unique points [x, alpha]
+    """
+    xs = np.hstack([data[:, 1], data[:, 2]])
+    alphas = np.hstack([data[:, 0], data[:, 0]])
+    return np.unique(np.column_stack([xs, alphas]), axis=0)
+
+
+def _get_shape_points(data):
+    """shape polyline (l with increasing alpha, r with decreasing alpha)
+
+    :param data: alpha level array [alpha, l, r]
+    :return: (index, points [x, alpha]) without duplicate points
+    """
+    points = np.column_stack([np.hstack([data[:, 1], data[::-1, 2]]),
+                              np.hstack([data[:, 0], data[::-1, 0]])])
+    # keep the first occurrence like DataFrame.drop_duplicates
+    index = np.sort(np.unique(points, axis=0, return_index=True)[1])
+    return index, points[index]
+
+
+def get_polygon_centroid(x, y):
+    """x coordinate of the centroid of polygons (shoelace formula)
+
+    The polygons are closed automatically. Polygons without area (e.g. crisp
+    numbers) return the mean of the x coordinates.
+
+    :param x: x coordinates of the vertices (..., number_of_vertices)
+    :param y: y coordinates of the vertices (..., number_of_vertices)
+    :return: x coordinates of the centroids (...)
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    x1 = np.roll(x, -1, axis=-1)
+    y1 = np.roll(y, -1, axis=-1)
+    cross = x * y1 - x1 * y
+    area = cross.sum(axis=-1)
+    with np.errstate(all="ignore"):
+        cx = ((x + x1) * cross).sum(axis=-1) / (3. * area)
+    cx = np.where(area != 0, cx, x.mean(axis=-1))
+    if cx.ndim == 0:
+        return cx[()]
+    return cx
+
+
+def _reduce_alpha_bins(alpha, res, bins):
+    """reduce results to the min alpha, min and max result of each alpha bin
+
+    :param alpha: alpha values
+    :param res: results
+    :param bins: bins (see np.digitize)
+    :return: (bin ids, min alpha, min res, max res) of the used bins
+    """
+    alpha = np.asarray(alpha, dtype=float)
+    res = np.asarray(res, dtype=float)
+    ids = np.digitize(alpha, bins)
+    order = np.argsort(ids, kind="mergesort")
+    ids = ids[order]
+    if len(ids) == 0:
+        return ids, alpha, res, res
+    starts = np.flatnonzero(np.hstack((True, ids[1:] != ids[:-1])))
+    return (ids[starts],
+            np.minimum.reduceat(alpha[order], starts),
+            np.fmin.reduceat(res[order], starts),
+            np.fmax.reduceat(res[order], starts))
+
+
+def _get_ppf(table, x):
+    """invert the piecewise quadratic cdf
+
+    :param table: segment table (see _get_cdf_table)
+    :param x: percentiles
+    :return: x values
+    """
+    x0, y0, slope, area = table
+    x = np.asarray(x, dtype=float)
+    if area[-1] <= 0:
+        # crisp number
+        y = np.full(x.shape, x0[0])
+    else:
+        a = x * area[-1]
+        k = np.clip(np.searchsorted(area, a, side="right") - 1, 0, len(y0) - 1)
+        da = a - area[k]
+        # solve slope / 2 * t**2 + y0 * t = da (numerically stable for slope -> 0)
+        with np.errstate(all="ignore"):
+            den = y0[k] + np.sqrt(np.maximum(y0[k] ** 2 + 2. * slope[k] * da, 0.))
+            t = np.where(den > 0, 2. * da / den, 0.)
+        y = np.clip(x0[k] + t, x0[k], x0[k + 1])
+    y = np.where(x < 0, 0., np.where(x > 1, 1., y))
+    if y.ndim == 0:
+        return y[()]
+    return y
+
+
 class FuzzyNumber(object):
-    """convex fuzzy number"""
+    """convex fuzzy number
+
+    The alpha levels are stored as contiguous float array with the columns
+    [alpha, l, r] (see :attr:`values`). :attr:`df` is a DataFrame view which is
+    created on demand and cached.
+    """
+
+    # __dict__ remains available for shape parameters, mixins and user attributes
+    __slots__ = ("name", "_data", "_df", "_df_data", "_alpha_grid", "_cache", "_number_of_alpha_levels",
+                 "__dict__", "__weakref__")
 
     def __init__(self, **kwargs):
         """base fuzzy number
@@ -24,7 +195,11 @@ class FuzzyNumber(object):
         :param kwargs:
         """
         self.name = kwargs.get("name", "x")
-        self._df = pd.DataFrame(columns=["alpha", "low", "high"])
+        self._data = None
+        self._df = None
+        self._df_data = None
+        self._alpha_grid = None
+        self._cache = {}
         self._number_of_alpha_levels = kwargs.get("number_of_alpha_levels", 11)
         self.df = kwargs.get("df")
 
@@ -50,18 +225,90 @@ class FuzzyNumber(object):
     number_of_alpha_levels = property(fget=_get_number_of_alpha_levels, fset=_set_number_of_alpha_levels,
                                       doc="number of alpha levels")
 
+    def _get_values(self):
+        """returns alpha levels
+
+        :rtype: numpy.ndarray
+        :return: alpha level array with columns [alpha, l, r]
+        """
+        if self._df is not None:
+            self._sync_df()
+        return self._data
+
+    def _sync_df(self):
+        """take over in place modifications of the cached dataframe
+
+        The dataframe is compared with the array it was created from, the alpha
+        level array is only rebuilt if the dataframe has been modified.
+
+        :return: None
+        """
+        df = self._df
+        data = self._df_data
+        if df.shape == data.shape:
+            try:
+                if (df.values == data).all():
+                    return
+            except (TypeError, ValueError):
+                pass
+        data = _get_alpha_level_array(df)
+        self._data = data
+        self._df_data = data.copy()
+        self._alpha_grid = None
+
+    def _set_values(self, value):
+        self._df = None
+        self._df_data = None
+        self._alpha_grid = None
+        # new dict, shallow copies (see _unify) share the old one
+        self._cache = {}
+        if value is None:
+            self._data = None
+        else:
+            self._data = np.ascontiguousarray(value, dtype=float).reshape(-1, 3)
+
+    values = property(fget=_get_values, fset=_set_values, doc="alpha level array [alpha, l, r]")
+
     def _get_df(self):
         """returns alpha levels
 
         :rtype: pandas.Dataframe
         :return: alpha level dataframe
         """
+        if self._df is not None:
+            self._sync_df()
+            if not np.array_equal(self._data, self._df_data):
+                # values have been modified in place
+                self._df = None
+        if self._df is None and self._data is not None:
+            self._df_data = self._data.copy()
+            self._df = pd.DataFrame(self._data.copy(), columns=["alpha", "l", "r"])
         return self._df
 
     def _set_df(self, value):
-        self._df = value
+        if value is None:
+            self.values = None
+        else:
+            self.values = _get_alpha_level_array(value)
+
+    df = property(fget=_get_df, fset=_set_df, doc="alpha level dataframe")
+
+    def _get_cached(self, key, function):
+        """get a cached quantity derived from the alpha levels
 
-    df = property(fget=_get_df, fset=_set_df, doc="number of alpha levels")
+        The alpha levels are compared with the ones used for the cached value, so
+        in place modifications of values or df are detected.
+
+        :param key: cache key
+        :param function: function(alpha level array) calculating the quantity
+        :return: cached quantity
+        """
+        data = self.values
+        cached = self._cache.get(key)
+        if cached is None or not np.array_equal(cached[0], data):
+            cached = (data.copy(), function(data))
+            self._cache[key] = cached
+        return cached[1]
 
     def discretize(self, alpha0, alpha1, alpha_levels):
         """discretize shape function
@@ -75,45 +322,66 @@ class FuzzyNumber(object):
 
     def alpha(self, x):
         """get alpha from x"""
-        df = pd.concat([self.df[["l", "alpha"]].rename(columns={"l":"x"}), self.df[["alpha", "r"]].rename(columns={"r":"x"})]).sort_values(by=["x", "alpha"])
-        df = df.drop_duplicates()
-        return np.interp(x, df.x, df.alpha, left=0., right=0.)
+        points = self._get_cached("alpha", _get_membership_points)
+        return np.interp(x, points[:, 0], points[:, 1], left=0., right=0.)
 
     def convert_df(self, alpha_levels=None, zero=0):
-        df = self.df.copy()
         if alpha_levels is not None:
             self._number_of_alpha_levels = int(alpha_levels)
-        df.sort_values(['alpha'], ascending=[True], inplace=True)
-        # print("!",df)
-        xs_l = df.l.values
+        data = self.values
+        data = data[np.argsort(data[:, 0], kind="mergesort")]
+        xs_l = data[:, 1].copy()
         xs_l[xs_l == 0] = zero
-        alphas_l = df["alpha"].values
-        xs_r = df.r.values[::-1]
+        xs_r = data[:, 2].copy()
         xs_r[xs_r == 0] = zero
-        alphas_r = df["alpha"].values[::-1]
-
-        alphas_new = np.linspace(0., 1., int(self.number_of_alpha_levels))
-        xs_l_new = np.interp(alphas_new, alphas_l, xs_l)
-        xs_r_new = np.interp(alphas_new, alphas_r[::-1], xs_r[::-1])
-        #
-        # print((xs_l, alphas_l, xs_l_new))
-        # print((xs_r, alphas_r, xs_r_new))
-        #
-        # print((np.vstack((alphas_new, xs_l_new, xs_r_new[::-1]))))
-        data = np.vstack((alphas_new, xs_l_new, xs_r_new)).T
-        self.df = pd.DataFrame(columns=["alpha", "l", "r"], data=data, dtype=np.float)
+        alphas = data[:, 0]
+
+        alphas_new = _get_alpha_grid(self.number_of_alpha_levels)
+        xs_l_new = np.interp(alphas_new, alphas, xs_l)
+        xs_r_new = np.interp(alphas_new, alphas, xs_r)
+        self.values = np.column_stack((alphas_new, xs_l_new, xs_r_new))
+        self._alpha_grid = alphas_new
+
+    def _has_alpha_grid(self, grid, data=None):
+        """check if the alpha levels are the (interned) alpha grid
+
+        :param grid: alpha grid (see _get_alpha_grid)
+        :param data: alpha level array, if values has just been read
+        :rtype: bool
+        :return: True or False
+        """
+        # in place modifications of the cached dataframe reset the alpha grid
+        if data is None:
+            data = self.values
+        if self._alpha_grid is grid:
+            return True
+        if data is None or len(data) != len(grid) or not np.array_equal(data[:, 0], grid):
+            return False
+        self._alpha_grid = grid
+        return True
 
     def _unify(self, other):
         """equalize number of alpha levels
 
+        Fuzzy numbers which are already discretized on the common alpha grid are
+        returned as they are (no copy), the callers must not modify them. Otherwise
+        a shallow copy is converted, convert_df does not modify the alpha levels
+        in place.
+
         :param other:
         :return: (fuzzy_number_1, fuzzy_number_2)
         """
-        old0 = copy.deepcopy(self)
-        old1 = copy.deepcopy(other)
-        levels = max(len(old0.df), len(old1.df))
-        old0.convert_df(levels)
-        old1.convert_df(levels)
+        data0 = self.values
+        data1 = other.values
+        grid = _get_alpha_grid(max(len(data0), len(data1)))
+        old0 = self
+        if not self._has_alpha_grid(grid, data0):
+            old0 = copy.copy(self)
+            old0.convert_df(len(grid))
+        old1 = other
+        if not other._has_alpha_grid(grid, data1):
+            old1 = copy.copy(other)
+            old1.convert_df(len(grid))
         return old0, old1
 
     @staticmethod
@@ -137,6 +405,81 @@ class FuzzyNumber(object):
         else:
             return FuzzyNumber
 
+    @staticmethod
+    def _from_values(cls, data, name):
+        """create fuzzy number from alpha level array
+
+        :param cls: class of the new fuzzy number
+        :param data: alpha level array [alpha, l, r]
+        :param name: name of the new fuzzy number
+        :return: fuzzy number
+        """
+        new = cls(alpha0=data[0, 1:], alpha1=data[-1, 1:], number_of_alpha_levels=len(data))
+        new.values = data
+        new.name = name
+        return new
+
+    def _apply_scalar(self, op):
+        """apply an operation with a scalar on all alpha levels
+
+        :param op: function(x) applied to the [l, r] columns
+        :return: alpha level array
+        """
+        data = self.values.copy()
+        with np.errstate(all="ignore"):
+            res = op(data[:, 1:])
+        # like DataFrame.update, undefined results keep the old values
+        mask = np.isnan(res)
+        res[mask] = data[:, 1:][mask]
+        data[:, 1:] = res
+        return data
+
+    def _apply_interval(self, other, op):
+        """apply an operation with another fuzzy number on all alpha levels
+
+        :param other: phuzzy.FuzzyNumber
+        :param op: binary function
+        :return: alpha level array
+        """
+        old0, old1 = self._unify(other)
+        # values are synchronized with the dataframes by _unify
+        x = old0._data
+        y = old1._data
+        with np.errstate(all="ignore"):
+            quotients = np.vstack([op(x[:, 1], y[:, 1]),
+                                   op(x[:, 1], y[:, 2]),
+                                   op(x[:, 2], y[:, 1]),
+                                   op(x[:, 2], y[:, 2])])
+            data = np.column_stack((x[:, 0],
+                                    np.nanmin(quotients, axis=0),
+                                    np.nanmax(quotients, axis=0)))
+        return data
+
+    @staticmethod
+    def _interval_power(data, exponent):
+        """apply a crisp exponent on all alpha levels
+
+        x ** exponent is monotonic on both sides of zero, so the extremes of an
+        alpha level are found at l, r or at zero. Signed zeros give the one sided
+        limits for negative exponents, e.g. (-0.) ** -1 = -inf.
+
+        :param data: alpha level array [alpha, l, r]
+        :param exponent: crisp exponent
+        :return: alpha level array
+        """
+        l = data[:, 1]
+        r = data[:, 2]
+        inner_zero = (l < 0) & (r > 0)
+        with np.errstate(all="ignore"):
+            quotients = np.vstack([np.power(np.where(l == 0, 0., l), exponent),
+                                   np.power(np.where((r == 0) & (l < 0), -0., r), exponent),
+                                   np.where(inner_zero, np.power(-0., exponent), np.nan),
+                                   np.where(inner_zero, np.power(0., exponent), np.nan)])
+        new = data.copy()
+        new[:, 1] = np.fmin.reduce(quotients, axis=0)
+        new[:, 2] = np.fmax.reduce(quotients, axis=0)
+        return new
+
     def has_zero(self):
         """is zero in range
 
@@ -155,30 +498,17 @@ class FuzzyNumber(object):
         :return: fuzzy number
         """
 
+        if not isinstance(other, (int, float, FuzzyNumber)):
+            return NotImplemented
+
         if isinstance(other, (int, float)):
             cls = self.__class__
-            df = self.df.copy()
-            df.update(df[["l", "r"]] + other)
-            new = cls(alpha0=df.iloc[0][["l", "r"]].values,
-                      alpha1=df.iloc[-1][["l", "r"]].values,
-                      number_of_alpha_levels=len(df))
-            new.df = df
-            new.name = "{}+{}".format(self.name, other)
+            data = self._apply_scalar(lambda x: x + other)
+            new = self._from_values(cls, data, "{}+{}".format(self.name, other))
         else:
-            old0, old1 = self._unify(other)
-            quotients = np.vstack([old0.df.l + old1.df.l,
-                                   old0.df.l + old1.df.r,
-                                   old0.df.r + old1.df.l,
-                                   old0.df.r + old1.df.r])
-            df = pd.DataFrame.from_dict({"alpha": old0.df.alpha,
-                                         "l"    : np.nanmin(quotients, axis=0),
-                                         "r"    : np.nanmax(quotients, axis=0)})
+            data = self._apply_interval(other, np.add)
             cls = self._get_cls(self, other)
-            new = cls(alpha0=df.iloc[0][["l", "r"]].values,
-                      alpha1=df.iloc[-1][["l", "r"]].values,
-                      number_of_alpha_levels=len(df))
-            new.df = df
-            new.name = "{}+{}".format(self.name, other.name)
+            new = self._from_values(cls, data, "{}+{}".format(self.name, other.name))
         return new
 
     def __radd__(self, other):
@@ -191,30 +521,17 @@ class FuzzyNumber(object):
         :return: fuzzy number
         """
 
+        if not isinstance(other, (int, float, FuzzyNumber)):
+            return NotImplemented
+
         if isinstance(other, (int, float)):
             cls = self.__class__
-            df = self.df.copy()
-            df.update(df[["l", "r"]] - other)
-            new = cls(alpha0=df.iloc[0][["l", "r"]].values,
-                      alpha1=df.iloc[-1][["l", "r"]].values,
-                      number_of_alpha_levels=len(df))
-            new.df = df
-            new.name = "{}-{}".format(self.name, other)
+            data = self._apply_scalar(lambda x: x - other)
+            new = self._from_values(cls, data, "{}-{}".format(self.name, other))
         else:
             cls = self._get_cls(self, other)
-            old0, old1 = self._unify(other)
-            quotients = np.vstack([old0.df.l - old1.df.l,
-                                   old0.df.l - old1.df.r,
-                                   old0.df.r - old1.df.l,
-                                   old0.df.r - old1.df.r])
-            df = pd.DataFrame.from_dict({"alpha": old0.df.alpha,
-                                         "l"    : np.nanmin(quotients, axis=0),
-                                         "r"    : np.nanmax(quotients, axis=0)})
-            new = cls(alpha0=df.iloc[0][["l", "r"]].values,
-                      alpha1=df.iloc[-1][["l", "r"]].values,
-                      number_of_alpha_levels=len(df))
-            new.df = df
-            new.name = "{}-{}".format(self.name, other.name)
+            data = self._apply_interval(other, np.subtract)
+            new = self._from_values(cls, data, "{}-{}".format(self.name, other.name))
         return new
 
     def __rsub__(self, other):
@@ -227,31 +544,17 @@ class FuzzyNumber(object):
         :return: fuzzy number
         """
 
+        if not isinstance(other, (int, float, FuzzyNumber)):
+            return NotImplemented
+
         # fixme: zeros, infs, nans
         cls = self._get_cls(self, other)
         if isinstance(other, (int, float)):
-            df = self.df.copy()
-            df.update(df[["l", "r"]] * other)
-            new = cls(alpha0=df.iloc[0][["l", "r"]].values,
-                      alpha1=df.iloc[-1][["l", "r"]].values,
-                      number_of_alpha_levels=len(df))
-            new.df = df
-            new.name = "{}*{}".format(self.name, other)
+            data = self._apply_scalar(lambda x: x * other)
+            new = self._from_values(cls, data, "{}*{}".format(self.name, other))
         else:
-            old0, old1 = self._unify(other)
-            quotients = np.vstack([old0.df.l * old1.df.l,
-                                   old0.df.l * old1.df.r,
-                                   old0.df.r * old1.df.l,
-                                   old0.df.r * old1.df.r])
-            df = pd.DataFrame.from_dict({"alpha": old0.df.alpha,
-                                         "l"    : np.nanmin(quotients, axis=0),
-                                         "r"    : np.nanmax(quotients, axis=0)})
-            cls = self._get_cls(self, other)
-            new = cls(alpha0=df.iloc[0][["l", "r"]].values,
-                      alpha1=df.iloc[-1][["l", "r"]].values,
-                      number_of_alpha_levels=len(df))
-            new.df = df
-            new.name = "{}*{}".format(self.name, other.name)
+            data = self._apply_interval(other, np.multiply)
+            new = self._from_values(cls, data, "{}*{}".format(self.name, other.name))
         return new
 
     def __rmul__(self, other):
@@ -264,31 +567,17 @@ class FuzzyNumber(object):
         :return: fuzzy number
         """
 
+        if not isinstance(other, (int, float, FuzzyNumber)):
+            return NotImplemented
+
         # fixme: zeros, infs, nans
         cls = self._get_cls(self, other)
         if isinstance(other, (int, float)):
-            df = self.df.copy()
-            df.update(df[["l", "r"]] / other)
-            new = cls(alpha0=df.iloc[0][["l", "r"]].values,
-                      alpha1=df.iloc[-1][["l", "r"]].values,
-                      number_of_alpha_levels=len(df))
-            new.df = df
-            new.name = "{}/{}".format(self.name, other)
+            data = self._apply_scalar(lambda x: x / other)
+            new = self._from_values(cls, data, "{}/{}".format(self.name, other))
         else:
-            old0, old1 = self._unify(other)
-            quotients = np.vstack([old0.df.l / old1.df.l,
-                                   old0.df.l / old1.df.r,
-                                   old0.df.r / old1.df.l,
-                                   old0.df.r / old1.df.r])
-            df = pd.DataFrame.from_dict({"alpha": old0.df.alpha,
-                                         "l"    : np.nanmin(quotients, axis=0),
-                                         "r"    : np.nanmax(quotients, axis=0)})
-            cls = self._get_cls(self, other)
-            new = cls(alpha0=df.iloc[0][["l", "r"]].values,
-                      alpha1=df.iloc[-1][["l", "r"]].values,
-                      number_of_alpha_levels=len(df))
-            new.df = df
-            new.name = "{}/{}".format(self.name, other.name)
+            data = self._apply_interval(other, np.true_divide)
+            new = self._from_values(cls, data, "{}/{}".format(self.name, other.name))
         return new
 
     __div__ = __truediv__
@@ -305,71 +594,46 @@ class FuzzyNumber(object):
         :return: fuzzy number
         """
 
+        if not isinstance(other, (int, float, FuzzyNumber)):
+            return NotImplemented
+
         # fixme: zeros, infs, nans
         cls = FuzzyNumber  # self._get_cls(self, other)
+        monotone = False
         if isinstance(other, (int, float)):
             if isinstance(self, Uniform):
                 cls = Uniform
             if self.has_zero() is False:
-                df = self.df.copy()
-                df.update(df[["l", "r"]] ** other)
-                new = cls(alpha0=df.iloc[0][["l", "r"]].values,
-                          alpha1=df.iloc[-1][["l", "r"]].values,
-                          number_of_alpha_levels=len(df))
+                data = self._apply_scalar(lambda x: x ** other)
+                monotone = self.min() > 0 and other >= 0
             else:
-                df = self.df.copy()
-                x = self._disretize_range()
-                _t = pd.DataFrame({"x": x, "res": x ** other})
-                for i, row in df.iterrows():
-                    r = _t[(_t.x >= row.l) & (_t.x <= row.r)]
-                    l = np.nanmin(r.res.values)
-                    r = np.nanmax(r.res.values)
-                    df.loc[i, "l"] = l
-                    df.loc[i, "r"] = r
-                new = cls(alpha0=df.iloc[0][["l", "r"]].values,
-                          alpha1=df.iloc[-1][["l", "r"]].values,
-                          number_of_alpha_levels=len(df))
-            new.df = df
-            new.name = "{}^{}".format(self.name, other)
+                data = self._interval_power(self.values, other)
+            new = self._from_values(cls, data, "{}^{}".format(self.name, other))
         else:
             if self.has_zero() is False and other.has_zero() is False:
+                data = self._apply_interval(other, np.power)
+                monotone = self.min() > 0 and other.is_convex()
+            elif other.min() == other.max():
+                # crisp exponent
                 old0, old1 = self._unify(other)
-                quotients = np.vstack([old0.df.l ** old1.df.l,
-                                       old0.df.l ** old1.df.r,
-                                       old0.df.r ** old1.df.l,
-                                       old0.df.r ** old1.df.r])
-                df = pd.DataFrame.from_dict({"alpha": old0.df.alpha,
-                                             "l"    : np.nanmin(quotients, axis=0),
-                                             "r"    : np.nanmax(quotients, axis=0)})
-                new = cls(alpha0=df.iloc[0][["l", "r"]].values,
-                          alpha1=df.iloc[-1][["l", "r"]].values,
-                          number_of_alpha_levels=len(df))
+                data = self._interval_power(old0.values, other.min())
             else:
-                # FIXME:
+                # FIXME: sampling with the exponent range of alpha=0
                 old0, old1 = self._unify(other)
-                df = old1.df.copy()
+                data = old1.values.copy()
                 x = old0._disretize_range()
-                # print("old1.min", old1.min())
-                _t = pd.DataFrame({"x"    : x,
-                                   "res_l": x ** old1.min(),
-                                   "res_r": x ** old1.max()
-                                   })
-                if old1.has_zero is True:
-                    _t["res_0"] = 1
-                else:
-                    _t["res_0"] = np.nan
-                for i, row in old0.df.iterrows():
-                    df.loc[i, "l"] = np.nanmin(
-                        _t[(_t.x >= row.l) & (_t.x <= row.r)][["res_l", "res_r", "res_0"]].values)
-                    df.loc[i, "r"] = np.nanmax(
-                        _t[(_t.x >= row.l) & (_t.x <= row.r)][["res_l", "res_r", "res_0"]].values)
-                new = cls(alpha0=df.iloc[0][["l", "r"]].values,
-                          alpha1=df.iloc[-1][["l", "r"]].values,
-                          number_of_alpha_levels=len(df))
-            new.df = df
-            new.name = "{}^{}".format(self.name, other)
-
-        new.make_convex()
+                x0 = old0.values
+                with np.errstate(all="ignore"):
+                    res = np.hstack([x ** old1.min(), x ** old1.max()])
+                    xx = np.hstack([x, x])
+                    inside = (xx >= x0[:, 1:2]) & (xx <= x0[:, 2:3])
+                    res = np.where(inside, res, np.nan)
+                    data[:, 1] = np.nanmin(res, axis=1)
+                    data[:, 2] = np.nanmax(res, axis=1)
+            new = self._from_values(cls, data, "{}^{}".format(self.name, other))
+
+        if not (monotone and self.is_convex()):
+            new.make_convex()
         return new
 
     def __rpow__(self, other):
@@ -379,33 +643,23 @@ class FuzzyNumber(object):
         :return: fuzzy number
         """
 
+        if not isinstance(other, (int, float, FuzzyNumber)):
+            return NotImplemented
+
         # fixme: zeros, infs, nans
         cls = FuzzyNumber  # self._get_cls(self, other)
+        monotone = False
         if isinstance(other, (int, float)):
             if isinstance(self, Uniform):
                 cls = Uniform
-            df = self.df.copy()
-            df.update(other ** df[["l", "r"]])
-            new = cls(alpha0=df.iloc[0][["l", "r"]].values,
-                      alpha1=df.iloc[-1][["l", "r"]].values,
-                      number_of_alpha_levels=len(df))
-            new.df = df
-            new.name = "{}^{}".format(self.name, other)
+            data = self._apply_scalar(lambda x: other ** x)
+            new = self._from_values(cls, data, "{}^{}".format(self.name, other))
+            monotone = other >= 1
         else:
-            old0, old1 = self._unify(other)
-            quotients = np.vstack([old0.df.l ** old1.df.l,
-                                   old0.df.l ** old1.df.r,
-                                   old0.df.r ** old1.df.l,
-                                   old0.df.r ** old1.df.r])
-            df = pd.DataFrame.from_dict({"alpha": old0.df.alpha,
-                                         "l"    : np.nanmin(quotients, axis=0),
-                                         "r"    : np.nanmax(quotients, axis=0)})
-            new = cls(alpha0=df.iloc[0][["l", "r"]].values,
-                      alpha1=df.iloc[-1][["l", "r"]].values,
-                      number_of_alpha_levels=len(df))
-            new.df = df
-            new.name = "{}^{}".format(self.name, other.name)
-        new.make_convex()
+            data = self._apply_interval(other, np.power)
+            new = self._from_values(cls, data, "{}^{}".format(self.name, other.name))
+        if not (monotone and self.is_convex()):
+            new.make_convex()
         return new
 
     def __neg__(self):
@@ -415,16 +669,14 @@ class FuzzyNumber(object):
         :return: fuzzy number
         """
         cls = self.__class__
-        quotients = np.vstack([-self.df.l, -self.df.r])
-        df = pd.DataFrame.from_dict({"alpha": self.df.alpha,
-                                     "l"    : np.nanmin(quotients, axis=0),
-                                     "r"    : np.nanmax(quotients, axis=0)})
-        new = cls(alpha0=df.iloc[0][["l", "r"]].values,
-                  alpha1=df.iloc[-1][["l", "r"]].values,
-                  number_of_alpha_levels=len(df))
-        new.df = df
-        new.name = "-{}".format(self.name)
-        new.make_convex()
+        data = self.values
+        quotients = np.vstack([-data[:, 1], -data[:, 2]])
+        data = np.column_stack((data[:, 0],
+                                np.nanmin(quotients, axis=0),
+                                np.nanmax(quotients, axis=0)))
+        new = self._from_values(cls, data, "-{}".format(self.name))
+        if not self.is_convex():
+            new.make_convex()
         return new
 
     def __abs__(self):
@@ -433,27 +685,27 @@ class FuzzyNumber(object):
         :param other: phuzzy.FuzzyNumber
         :return: fuzzy number
         """
-        dfl0 = self.df.l.copy()
+        data = self.values
+        dfl0 = data[:, 1].copy()
         dfl0[dfl0 <= 0] = 0
-        dfr0 = self.df.r.copy()
+        dfr0 = data[:, 2].copy()
         dfr0[dfr0 <= 0] = 0
 
-        if ((self.df[["l", "r"]].values <= 0).all()) or ((self.df[["l", "r"]].values >= 0).all()):
+        if ((data[:, 1:] <= 0).all()) or ((data[:, 1:] >= 0).all()):
             cls = self.__class__
-            quotients = np.vstack([abs(self.df.l), abs(self.df.r)])
+            monotone = True
+            quotients = np.vstack([abs(data[:, 1]), abs(data[:, 2])])
         else:
             cls = FuzzyNumber
-            quotients = np.vstack([dfl0, dfr0, abs(self.df.l), abs(self.df.r)])
-
-        df = pd.DataFrame.from_dict({"alpha": self.df.alpha,
-                                     "l"    : np.nanmin(quotients, axis=0),
-                                     "r"    : np.nanmax(quotients, axis=0)})
-        new = cls(alpha0=df.iloc[0][["l", "r"]].values,
-                  alpha1=df.iloc[-1][["l", "r"]].values,
-                  number_of_alpha_levels=len(df))
-        new.df = df
-        new.name = "|{}|".format(self.name)
-        new.make_convex()
+            monotone = False
+            quotients = np.vstack([dfl0, dfr0, abs(data[:, 1]), abs(data[:, 2])])
+
+        data = np.column_stack((data[:, 0],
+                                np.nanmin(quotients, axis=0),
+                                np.nanmax(quotients, axis=0)))
+        new = self._from_values(cls, data, "|{}|".format(self.name))
+        if not (monotone and self.is_convex()):
+            new.make_convex()
         return new
 
     def __lt__(self, other):
@@ -489,7 +741,7 @@ class FuzzyNumber(object):
         if isinstance(other, (int, float)):
             return False  # (self.min() >= other) and (self.max() <= other)
         elif other.__class__ is self.__class__:
-            return np.allclose(self.df.values, other.df.values)
+            return np.allclose(self.values, other.values)
         else:
             return NotImplemented
 
@@ -546,12 +798,13 @@ class FuzzyNumber(object):
         :param n:
         :return: x values within range
         """
-        x = np.linspace(self.df.loc[0].l, self.df.loc[0].r, int(n))
+        data = self.values
+        x = np.linspace(data[0, 1], data[0, 2], int(n))
         if self.has_zero():
             # x = np.hstack([x, [0, -1e-10, 1e-10], self.df.l.values, self.df.r.values])
-            x = np.hstack([x, [0], self.df.l.values, self.df.r.values])
+            x = np.hstack([x, [0], data[:, 1], data[:, 2]])
         else:
-            x = np.hstack([x, self.df.l.values, self.df.r.values])
+            x = np.hstack([x, data[:, 1], data[:, 2]])
         x = np.unique(x)
         return x
 
@@ -568,7 +821,7 @@ class FuzzyNumber(object):
         :rtype: float
         :return: min value of df
         """
-        return self.df[["l", "r"]].values.min()
+        return self.values[:, 1:].min()
 
     def max(self):
         """maximal
@@ -576,7 +829,7 @@ class FuzzyNumber(object):
         :rtype: float
         :return: max value of df
         """
-        return self.df[["l", "r"]].values.max()
+        return self.values[:, 1:].max()
 
     def mean(self):
         """mean value
@@ -586,17 +839,30 @@ class FuzzyNumber(object):
         """
         return self.ppf(.5)
 
+    def is_convex(self):
+        """are the alpha levels nested
+
+        Monotonic operations (e.g. neg, abs, pow of positive numbers) keep
+        convex fuzzy numbers convex, so make_convex can be skipped.
+
+        :rtype: bool
+        :return: True, if l increases and r decreases with alpha
+        """
+        data = self.values
+        return bool(np.all(np.diff(data[:, 1]) >= 0) and np.all(np.diff(data[:, 2]) <= 0))
+
     def make_convex(self):
         """make fuzzy number convex
 
+        l and r are replaced by the reverse cumulative min and max over the
+        alpha levels (nans are ignored).
+
         :return: None
         """
-        for i in self.df.index:
-            self.df.loc[i, "l"] = self.df.loc[i:, "l"].min()
-            self.df.loc[i, "r"] = self.df.loc[i:, "r"].max()
-            # self.df.loc[i, "l"] = np.nanmin(self.df.loc[i:, "l"])
-            # self.df.loc[i, "r"] = np.nanmax(self.df.loc[i:, "r"])
-            # print(i, self.df.loc[i:, "l"].min(), self.df.loc[i:, "r"].max())
+        data = self.values.copy()
+        data[:, 1] = np.fmin.accumulate(data[::-1, 1])[::-1]
+        data[:, 2] = np.fmax.accumulate(data[::-1, 2])[::-1]
+        self.values = data
 
     @property
     def alpha0(self):
@@ -690,8 +956,9 @@ class FuzzyNumber(object):
         :return:
         """
 
-        y_ = np.hstack((self.df.alpha, self.df.alpha[::-1]))
-        x_ = np.hstack((self.df.l, self.df.r[::-1]))
+        data = self.values
+        y_ = np.hstack((data[:, 0], data[::-1, 0]))
+        x_ = np.hstack((data[:, 1], data[::-1, 2]))
         I = np.trapz(y_, x_)
         y = np.interp(x, x_, y_ / I, left=0., right=0.)
         return y
@@ -699,49 +966,53 @@ class FuzzyNumber(object):
     def cdf(self, x, **kwargs):
         """Cumulative distribution function
 
+        The cdf of the piecewise linear membership function is integrated exactly.
+
         :param x: x values
-        :param n: number of integration points
+        :param n: not used (formerly number of integration points)
         :return: y
         """
-
-        n = kwargs.get("n", 1e6)
-        y_ = np.hstack((self.df.alpha, self.df.alpha[::-1]))
-        x_ = np.hstack((self.df.l, self.df.r[::-1]))
-
-        x__ = np.linspace(self.alpha0.l, self.alpha0.r, int(n))
-        y__ = np.interp(x__, x_, y_)
-
-        I = cumtrapz(y__, x__, initial=0)
-        I /= I[-1]
-        y = np.interp(x, x__, I, left=0., right=1.)
+        x0, y0, slope, area = self._get_cached("cdf", _get_cdf_table)
+        x = np.asarray(x, dtype=float)
+        if area[-1] <= 0:
+            # crisp number
+            return np.where(x < x0[0], 0., 1.)
+        k = np.clip(np.searchsorted(x0, x, side="right") - 1, 0, len(y0) - 1)
+        t = x - x0[k]
+        y = (area[k] + y0[k] * t + slope[k] * t ** 2 / 2.) / area[-1]
+        y = np.where(x < x0[0], 0., np.where(x >= x0[-1], 1., y))
+        if y.ndim == 0:
+            return y[()]
         return y
 
     def ppf(self, x, **kwargs):
         """Percent point function (inverse of cdf-percentiles).
 
+        The piecewise quadratic cdf is inverted exactly.
+
         :param x: x values
-        :param n: number of integration points
+        :param n: not used (formerly number of integration points)
         :return: y
         """
+        return _get_ppf(self._get_cached("cdf", _get_cdf_table), x)
 
-        n = kwargs.get("n", 1e6)
-        y_ = np.hstack((self.df.alpha, self.df.alpha[::-1]))
-        x_ = np.hstack((self.df.l, self.df.r[::-1]))
-
-        x__ = np.linspace(float(self.alpha0.l), float(self.alpha0.r), int(n))
-        y__ = np.interp(x__, x_, y_)
+    def sampler(self, seed=None):
+        """sampler drawing random points according membership function
 
-        I = cumtrapz(y__, x__, initial=0)
-        I /= I[-1]
-        y = np.interp(x, I, x__, left=0., right=1.)
-        return y
+        :param seed: seed or numpy.random.Generator
+        :return: Sampler
+        """
+        return Sampler(self, seed=seed)
 
     def rvs(self, size, seed=None):
         """Sample points according membership function
 
         :param size: number of sample points
+        :param seed: positive int (global seed), negative int (equidistant percentiles) or numpy.random.Generator
         :return: sample points
         """
+        if isinstance(seed, np.random.Generator):
+            return self.sampler(seed=seed).rvs(size)
         if seed is not None and isinstance(seed, int) and np.sign(seed) == 1:
             np.random.seed(seed=seed)
         if seed is not None and isinstance(seed, int) and np.sign(seed) == -1:
@@ -757,8 +1028,9 @@ class FuzzyNumber(object):
 
         :return: [[a0_l, a0_r], [a1_l, a1_r]]
         """
-        if self.df is not None and len(self.df) > 1:
-            return self.df.iloc[[0, -1]][["l", "r"]].values.tolist()
+        data = self.values
+        if data is not None and len(data) > 1:
+            return data[[0, -1], 1:].tolist()
         else:
             return []
 
@@ -768,8 +1040,9 @@ class FuzzyNumber(object):
 
         :return: [[a0_l, a0_r], [a1_l, a1_r]]
         """
-        if self.df is not None and len(self.df) > 1:
-            return np.array2string(self.df.iloc[[0, -1]][["l", "r"]].values,
+        data = self.values
+        if data is not None and len(data) > 1:
+            return np.array2string(data[[0, -1], 1:],
                                    separator=",",
                                    formatter={'float_kind': lambda x: "%.3g" % x}).replace("\n", "")
         else:
@@ -783,38 +1056,32 @@ class FuzzyNumber(object):
         :return: FuzzyNumber
         """
 
-        self = cls()
-        if name is not None:
-            self.name = name
-
-        df = df_res.sort_values(by="alpha", ascending=False)
-        df["r"] = df.res.cummax()
-        df["l"] = df.res.cummin()
-
-        df.sort_values(by=["alpha", "l", "r"], inplace=True, ascending=True)
-        # FIXME: reduce rows with equal alpha levels
-        bins = np.linspace(0., 1., int(number_of_alpha_levels + 1))
-        groups = df.groupby(np.digitize(df.alpha, bins))
-        bins_results = []
-        for _, dfb in groups:
-            # print(i, len(dfb), dfb.alpha.min(), dfb.alpha.max())
-            bins_results.append([dfb.alpha.min(), dfb.l.min(), dfb.r.max()])
-
-        self.df = pd.DataFrame(bins_results, columns=["alpha", "l", "r"])
-        # self.convert_df(alpha_levels=number_of_alpha_levels)
-        # print(self.df)
-        return self
+        return cls.from_results_chunks([df_res], name=name, number_of_alpha_levels=number_of_alpha_levels)
+
+    @classmethod
+    def from_results_chunks(cls, chunks, name=None, number_of_alpha_levels=11):
+        """create FuzzyNumber from chunks of results
+
+        The results are reduced chunk by chunk, so all results are never held in
+        memory at once. The FuzzyNumber is the same as from_results of all chunks.
+
+        :param chunks: iterable of DataFrame("alpha", "res") (or dicts of arrays)
+        :param name: name
+        :param number_of_alpha_levels: number of alpha bins
+        :return: FuzzyNumber
+        """
+        accumulator = ResultAccumulator(number_of_alpha_levels=number_of_alpha_levels)
+        for chunk in chunks:
+            accumulator.update(chunk["alpha"], chunk["res"])
+        return accumulator.get_fuzzynumber(cls=cls, name=name)
 
     def get_shape(self):
         """get shape dataframe
 
         :return: pandas.DataFrame(columns=["alpha", "x"])
         """
-        x = np.hstack([self.df["l"].values, self.df["r"].values[::-1]])
-        alpha = np.hstack([self.df["alpha"].values, self.df["alpha"].values[::-1]])
-        df = pd.DataFrame({"x": x, "alpha": alpha})
-        df.drop_duplicates(inplace=True)
-        return df
+        index, points = self._get_cached("shape", _get_shape_points)
+        return pd.DataFrame({"x": points[:, 0], "alpha": points[:, 1]}, index=index)
 
     def get_alpha_from_value(self, x):
         """get alpha values from given x values
@@ -822,8 +1089,8 @@ class FuzzyNumber(object):
         :param x: x values
         :return: alpha values
         """
-        shape = self.get_shape()
-        return np.interp(x, shape.x, shape.alpha)
+        index, points = self._get_cached("shape", _get_shape_points)
+        return np.interp(x, points[:, 0], points[:, 1])
 
     def defuzzification_alpha_one(self):
         """defuzzification
@@ -837,31 +1104,23 @@ class FuzzyNumber(object):
 
     def defuzzification_mean(self):
         """defuzzification mean with discrete values"""
-        return self.df[["l", "r"]].values.mean()
+        return self.values[:, 1:].mean()
 
     def defuzzification_p50(self):
         """defuzzification mean my means of ppf(0.5)"""
         return self.ppf(.5)
 
     def defuzzification_centroid2(self):
-        """defuzzification center of gravity"""
-        # x = self.df[["l", "r"]].values.flatten()
-        x = np.linspace(self.min(), self.max(), 100001)
-        m = self.alpha(x)
-        cg = np.sum(x * m) / np.sum(m)
-        return cg
+        """defuzzification center of gravity (see defuzzification_centroid)"""
+        return self.defuzzification_centroid()
 
     def defuzzification_centroid(self):
-        """defuzzification center of gravity"""
-        df = pd.concat([self.df[["l", "alpha"]].rename(columns={"l":"x"}), self.df[["alpha", "r"]].rename(columns={"r":"x"})]).sort_values(by=["x", "alpha"])
-        df = df.drop_duplicates(subset="x", keep="last")
-        d = pd.DataFrame()
-        d["alpha"] = df.alpha.rolling(2).mean()
-        d["dx"] = (df.x.rolling(2).max() - df.x.rolling(2).min())
-        d["x"] = df.x.rolling(2).mean()
-        d["A"] = d.dx * d.alpha
-        d["Ax"] = d.x * d.A
-        return d.Ax.sum()/d.A.sum()
+        """defuzzification center of gravity
+
+        exact centroid of the area below the (piecewise linear) membership function
+        """
+        index, points = self._get_cached("shape", _get_shape_points)
+        return get_polygon_centroid(points[:, 0], points[:, 1])
 
     def defuzzification(self, method='centroid'):
 
@@ -873,6 +1132,147 @@ class FuzzyNumber(object):
         elif method == 'centroid':
             return self.defuzzification_centroid()
 
+
+class Sampler(object):
+    """random sampling according membership function of a fuzzy number
+
+    The inverse cdf is calculated once, later changes of the fuzzy number are not
+    considered.
+
+    .. code-block:: python
+
+        sampler = x.sampler(seed=42)
+        for samples in sampler.iter_rvs(10 ** 9, chunksize=10 ** 6):
+            ...
+
+    """
+
+    def __init__(self, fuzzy_number, seed=None):
+        """Sampler(fuzzy_number, seed)
+
+        :param fuzzy_number: fuzzy number
+        :param seed: seed or numpy.random.Generator
+        """
+        self.name = fuzzy_number.name
+        self._table = fuzzy_number._get_cached("cdf", _get_cdf_table)
+        if isinstance(seed, np.random.Generator):
+            self.random_state = seed
+        else:
+            self.random_state = np.random.default_rng(seed)
+
+    def __str__(self):
+        return "{}({})".format(self.__class__.__name__, self.name)
+
+    __repr__ = __str__
+
+    def ppf(self, x):
+        """Percent point function (inverse of cdf-percentiles).
+
+        :param x: percentiles
+        :return: x values
+        """
+        return _get_ppf(self._table, x)
+
+    def rvs(self, size=None):
+        """draw random points
+
+        :param size: number (or shape) of sample points
+        :return: sample points
+        """
+        return self.ppf(self.random_state.random(size))
+
+    def iter_rvs(self, size, chunksize=65536):
+        """draw random points in chunks
+
+        :param size: total number of sample points
+        :param chunksize: max. number of sample points per chunk
+        :return: iterator of sample point arrays
+        """
+        remaining = int(size)
+        chunksize = int(chunksize)
+        while remaining > 0:
+            n = min(chunksize, remaining)
+            yield self.rvs(n)
+            remaining -= n
+
+
+class ResultAccumulator(object):
+    """running reduction of results (alpha, res) to a fuzzy number
+
+    Only the min alpha, min and max result of each alpha bin are kept, so an
+    update costs O(len(res)) and the fuzzy number is available at any time.
+
+    .. code-block:: python
+
+        accumulator = ResultAccumulator(number_of_alpha_levels=11)
+        for df in results:
+            accumulator.update(df.alpha, df.res)
+            z = accumulator.get_fuzzynumber(name="z")
+
+    """
+
+    def __init__(self, number_of_alpha_levels=11):
+        """ResultAccumulator(number_of_alpha_levels)
+
+        :param number_of_alpha_levels: number of alpha bins
+        """
+        self.bins = np.linspace(0., 1., int(number_of_alpha_levels + 1))
+        # results of bins 0 ... len(bins) (see np.digitize)
+        self._alpha = np.full(len(self.bins) + 1, np.inf)
+        self._l = np.full(len(self.bins) + 1, np.nan)
+        self._r = np.full(len(self.bins) + 1, np.nan)
+        self.count = 0
+
+    def __str__(self):
+        return "{}({} results)".format(self.__class__.__name__, self.count)
+
+    __repr__ = __str__
+
+    def copy(self):
+        """return a copy
+
+        :return: ResultAccumulator
+        """
+        return copy.deepcopy(self)
+
+    def update(self, alpha, res):
+        """add results
+
+        :param alpha: alpha values
+        :param res: results
+        :return: None
+        """
+        ids, alpha, l, r = _reduce_alpha_bins(alpha, res, self.bins)
+        self._alpha[ids] = np.fmin(self._alpha[ids], alpha)
+        self._l[ids] = np.fmin(self._l[ids], l)
+        self._r[ids] = np.fmax(self._r[ids], r)
+        self.count += len(np.atleast_1d(res))
+
+    @property
+    def values(self):
+        """alpha level array [alpha, l, r] of the results so far"""
+        # each alpha level contains all results of the higher alpha levels
+        used = np.isfinite(self._alpha)
+        l = np.fmin.accumulate(self._l[used][::-1])[::-1]
+        r = np.fmax.accumulate(self._r[used][::-1])[::-1]
+        return np.column_stack((self._alpha[used], l, r))
+
+    def get_fuzzynumber(self, cls=None, name=None):
+        """fuzzy number of the results so far
+
+        :param cls: class of the fuzzy number (default: FuzzyNumber)
+        :param name: name
+        :return: fuzzy number
+        """
+        if cls is None:
+            cls = FuzzyNumber
+        z = cls()
+        if name is not None:
+            z.name = name
+        z.values = self.values
+        return z
+
+
 class Triangle(FuzzyNumber):
     """triange fuzzy number"""
 
@@ -895,35 +1295,68 @@ class Triangle(FuzzyNumber):
         self._a = alpha0[0]
         self._b = alpha0[1]
         self._c = alpha1[0]
-        self.df = pd.DataFrame(columns=["alpha", "l", "r"],
-                               data=[[0., alpha0[0], alpha0[1]], [1., alpha1[0], alpha1[0]]], dtype=np.float)
-        self.df.sort_values(['alpha'], ascending=[True], inplace=True)
+        self.values = [[0., alpha0[0], alpha0[1]], [1., alpha1[0], alpha1[0]]]
         self.convert_df(alpha_levels=alpha_levels)
 
     @classmethod
     def from_data(cls, **kwargs):
-        """instantiate fuzzy number from attributes
+        """instantiate fuzzy number from data
 
-        :param kwargs:
+        The mode follows from mean = (min + mode + max) / 3 (single pass over the data).
+        The mode is averaged with the estimates of n poisson bootstrap samples (each
+        point is drawn 50 times on average), which are drawn in blocks of at most
+        chunksize values. n=0 gives the closed form estimate only.
+
+        :param data: data or iterator of data chunks (e.g. pandas.read_csv(..., chunksize=...))
+        :param n: number of bootstrap samples (default: 100)
+        :param seed: seed of the bootstrap samples
+        :param chunksize: max. number of bootstrap weights per block
         :rtype: phuzzy.FuzzyNumber or derived object
         :return: fuzzy number
         """
 
-        n = kwargs.get("n", 100)
-        data = kwargs.get("data")
-        data = np.asarray(data, float)
-        datamin = data.min()
-        datamax = data.max()
-        kwargs["alpha0"] = [datamin, datamax]
-        means = []
-        mean = 3 * data.mean() - datamin - datamax
-        means.append(mean)
-        for _ in range(n):
-            train_data = np.random.choice(data, int(len(data) * 50))
-            # mean = 3 * train_data.mean() - train_data.min() - train_data.max()
-            mean = 3 * train_data.mean() - (train_data.min() + datamin) / 2 - (train_data.max() + datamax) / 2
-            means.append(mean)
+        n = kwargs.pop("n", 100)
+        data = kwargs.pop("data")
+        if isinstance(data, collections_abc.Iterator):
+            chunks = (np.asarray(chunk, float).ravel() for chunk in data)
+        else:
+            chunks = [np.asarray(data, float).ravel()]
+        rng = np.random.default_rng(kwargs.pop("seed", None))
+        chunksize = int(kwargs.pop("chunksize", 2 ** 20))
+
+        count = 0
+        total = 0.
+        datamin = np.inf
+        datamax = -np.inf
+        # bootstrap samples: number of points, sum, min and max
+        counts = np.zeros(n)
+        totals = np.zeros(n)
+        mins = np.full(n, np.inf)
+        maxs = np.full(n, -np.inf)
+        for chunk in chunks:
+            if len(chunk) == 0:
+                continue
+            count += len(chunk)
+            total += chunk.sum()
+            datamin = min(datamin, chunk.min())
+            datamax = max(datamax, chunk.max())
+            if n > 0:
+                size = max(1, chunksize // n)
+                for i in range(0, len(chunk), size):
+                    x = chunk[i:i + size]
+                    weights = rng.poisson(50., size=(n, len(x)))
+                    counts += weights.sum(axis=1)
+                    totals += weights.dot(x)
+                    drawn = weights > 0
+                    mins = np.minimum(mins, np.where(drawn, x, np.inf).min(axis=1))
+                    maxs = np.maximum(maxs, np.where(drawn, x, -np.inf).max(axis=1))
+        if count == 0:
+            raise ValueError("no data")
 
+        kwargs["alpha0"] = [datamin, datamax]
+        means = [3 * total / count - datamin - datamax]
+        if n > 0:
+            means.extend(3 * totals / counts - (mins + datamin) / 2 - (maxs + datamax) / 2)
         mean = np.array(means).mean()
         kwargs["alpha1"] = [mean]
         p = cls(**kwargs)
@@ -963,8 +1396,9 @@ class Triangle(FuzzyNumber):
         return np.select(condlist, choicelist)
 
     def to_str(self):
-        if len(self.df) > 0:
-            return "tri[{:.3g}, {:.3g}, {:.3g}]".format(self.df.iloc[0].l, self.df.iloc[0].r, self.df.iloc[-1].l)
+        data = self.values
+        if len(data) > 0:
+            return "tri[{:.3g}, {:.3g}, {:.3g}]".format(data[0, 1], data[0, 2], data[-1, 1])
         else:
             return "tri[nan, nan, nan]"
 
@@ -994,9 +1428,7 @@ class Trapezoid(FuzzyNumber):
         self._c = alpha1[1]
         self._d = alpha0[1]
         # todo: check a <= c <= d <= b
-        self.df = pd.DataFrame(columns=["alpha", "l", "r"],
-                               data=[[0., alpha0[0], alpha0[1]], [1., alpha1[0], alpha1[1]]], dtype=np.float)
-        self.df.sort_values(['alpha'], ascending=[True], inplace=True)
+        self.values = [[0., alpha0[0], alpha0[1]], [1., alpha1[0], alpha1[1]]]
         self.convert_df(alpha_levels=alpha_levels)
 
     def pdf(self, x):
@@ -1041,9 +1473,10 @@ class Trapezoid(FuzzyNumber):
         return np.select(condlist, choicelist)
 
     def to_str(self):
-        if len(self.df) > 0:
-            return "trap[{:.3g}, {:.3g}, {:.3g}, {:.3g}]".format(self.df.iloc[0].l, self.df.iloc[0].r,
-                                                                 self.df.iloc[-1].l, self.df.iloc[-1].r)
+        data = self.values
+        if len(data) > 0:
+            return "trap[{:.3g}, {:.3g}, {:.3g}, {:.3g}]".format(data[0, 1], data[0, 2],
+                                                                 data[-1, 1], data[-1, 2])
         else:
             return "trap[nan, nan, nan, nan]"
 
@@ -1068,9 +1501,7 @@ class Uniform(FuzzyNumber):
         # assert isinstance(alpha0, collections.Sequence) and len(alpha0) == 2
         self._a = alpha0[0]
         self._b = alpha0[1]
-        self.df = pd.DataFrame(columns=["alpha", "l", "r"],
-                               data=[[0., alpha0[0], alpha0[1]], [1., alpha0[0], alpha0[1]]], dtype=np.float)
-        self.df.sort_values(['alpha'], ascending=[True], inplace=True)
+        self.values = [[0., alpha0[0], alpha0[1]], [1., alpha0[0], alpha0[1]]]
         self.convert_df(alpha_levels=alpha_levels)
 
     def pdf(self, x):
@@ -1102,7 +1533,7 @@ class Uniform(FuzzyNumber):
         return np.select(condlist, choicelist)
 
     def to_str(self):
-        return "Uniform[{:.4g},{:.4g}]".format(self.alpha0.l, self.alpha0.r)
+        return "Uniform[{:.4g},{:.4g}]".format(self.values[0, 1], self.values[0, 2])
 
     # @classmethod
     # def from_str(cls, s):
@@ -15,9 +15,8 @@
 """
 
 import numpy as np
-import pandas as pd
 
-from phuzzy.shapes import FuzzyNumber
+from phuzzy.shapes import FuzzyNumber, _get_alpha_grid
 
 
 class Superellipse(FuzzyNumber):
@@ -88,15 +87,12 @@ class Superellipse(FuzzyNumber):
         """
         self._a = alpha0[0]
         self._b = alpha0[1]
-        # assert isinstance(alpha0, collections.Sequence) and len(alpha0) == 2
-        nn = 501
-        x = np.linspace(alpha0[0], alpha0[1], nn)
-        shape = self.shape(x)
-        alphas = shape / shape.max()
-        data = []
-        for i in range(len(x) // 2):
-            data.append([alphas[i], x[i], x[::-1][i]])
-        data.append([alphas[i + 1], x[i + 1], x[::-1][i + 1]])
-        self.df = pd.DataFrame(columns=["alpha", "l", "r"], data=data, dtype=np.float)
-        self.convert_df(alpha_levels=alpha_levels)
-        self.df.sort_values(['alpha'], ascending=[True], inplace=True)
+        # inverse of the shape function
+        alpha = _get_alpha_grid(int(alpha_levels))
+        r = (self._b - self._a) / 2.
+        m = (self._a + self._b) / 2.
+        width = r * (1. - alpha ** self.n) ** (1. / self.m)
+        self.values = np.column_stack((alpha, m - width, m + width))
+        # values are already on the alpha grid
+        self._number_of_alpha_levels = len(alpha)
+        self._alpha_grid = alpha
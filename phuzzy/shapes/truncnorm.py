@@ -25,9 +25,8 @@
 
 """
 
-from phuzzy.shapes import FuzzyNumber
+from phuzzy.shapes import FuzzyNumber, _get_alpha_grid
 import numpy as np
-import pandas as pd
 from scipy.stats import truncnorm, gennorm
 
 class TruncNorm(FuzzyNumber):
@@ -101,29 +100,45 @@ class TruncNorm(FuzzyNumber):
         return self._distr
 
     def discretize(self, alpha0, alpha1, alpha_levels):
-        # print("alpha0", alpha0)
-        # assert isinstance(alpha0, collections.Sequence) and len(alpha0) == 2
-        # assert isinstance(alpha1, collections.Sequence) and len(alpha1) > 0
-        nn = 501
-        # pp = np.linspace(0, 1, nn)
-        # ppf = self.distr.ppf(pp)
-        x = np.linspace(alpha0[0], alpha0[1], nn)
-        pdf = self.distr.pdf(x)
-        # alphas = np.linspace(0,pdf/pdf.max(),alpha_levels)
-        alphas = pdf / pdf.max()
-        data = []
-        for i in range(len(x) // 2):
-            data.append([alphas[i], x[i], x[::-1][i]])
-        data.append([alphas[i + 1], x[i + 1], x[::-1][i + 1]])
-        # print(alphas)
-        # print(self.distr.mean(), self.distr.std())
-        # print("x", x)
-        # print("ppf", ppf)
-        # print("pdf", pdf)
-        self.df = pd.DataFrame(columns=["alpha", "l", "r"], data=data, dtype=np.float)
-        self.convert_df(alpha_levels)
-        self.df.sort_values(['alpha'], ascending=[True], inplace=True)
-        self.convert_df(alpha_levels=alpha_levels)
+        """discretize shape function
+
+        The membership function is the pdf of the truncated normal distribution
+        scaled to 1, the alpha cuts follow from its inverse.
+
+        :param alpha0: range at alpha=0
+        :param alpha1: not used
+        :param alpha_levels: number of alpha levels
+        :return: None
+        """
+        alpha = _get_alpha_grid(int(alpha_levels))
+        peak = np.clip(self.mean, alpha0[0], alpha0[1])
+        with np.errstate(divide="ignore"):
+            width = np.sqrt((peak - self.mean) ** 2 - 2. * self.std ** 2 * np.log(alpha))
+        self.values = _get_truncated_cuts(alpha, alpha0, self.mean, width)
+        # values are already on the alpha grid
+        self._number_of_alpha_levels = len(alpha)
+        self._alpha_grid = alpha
+
+
+_gennorm_quantiles = {}
+
+
+def _get_gennorm_quantile(beta, p):
+    """quantile of the standard generalized normal distribution (memoized)
+
+    The scale of a gennorm distribution is affine in the width of its quantile
+    range, so only the standard quantile has to be calculated per (beta, p).
+
+    :param beta: shape parameter
+    :param p: probability
+    :rtype: float
+    :return: quantile
+    """
+    key = (float(beta), float(p))
+    quantile = _gennorm_quantiles.get(key)
+    if quantile is None:
+        quantile = _gennorm_quantiles[key] = float(gennorm.ppf(p, beta))
+    return quantile
 
 
 class TruncGenNorm(FuzzyNumber):
@@ -172,38 +187,55 @@ class TruncGenNorm(FuzzyNumber):
 
     std = scale = property(fget=_get_scale, fset=_set_scale)
 
+    def _get_distr_scale(self):
+        """scale of the generalized normal distribution with ppf(.001) = alpha0[0] and ppf(.999) = alpha0[1]
+
+        :rtype: float
+        :return: scale
+        """
+        return (self.clip[1] - self.clip[0]) / 2. / _get_gennorm_quantile(self.beta, .999)
+
     @property
     def distr(self):
-        def obj(s, args=None):
-            """args = [min, max, beta, ppf]"""
-
-            loc = (args[1]+args[0])/2.
-            beta = args[2]
-            ppf = args[3]
-            d = gennorm(loc=loc, scale=s, beta=beta)
-            r = sum((d.ppf([1.-ppf, .5,  ppf]) - np.array([args[0], loc, args[1]]))**2)
-            return r
+        """generalized normal distribution
+
+        :return: distribution object
+        """
         if self._distr is None:
-            from scipy.optimize import minimize
-            res = minimize(obj, [.1], method='Nelder-Mead', tol=1e-6, args=[self.clip[0],self.clip[1], self.beta, .999])
-            # res = scipy.optimize.minimize_scalar(obj, bounds=[1e-10, 1], args=[1.,4., beta, .999], tol=1e-10)
-            # print("res", res.x)
-            self._distr = gennorm(loc=self.mean, scale=res.x, beta=self.beta)
+            self._distr = gennorm(loc=self.mean, scale=self._get_distr_scale(), beta=self.beta)
         return self._distr
 
     def discretize(self, alpha0, alpha1, alpha_levels):
-        # assert isinstance(alpha0, collections.Sequence) and len(alpha0) == 2
-        nn = 501
-        # pp = np.linspace(0., 1., nn)
-        # ppf = self.distr.ppf(pp)
-        x = np.linspace(alpha0[0], alpha0[1], nn)
-        pdf = self.distr.pdf(x)
-        alphas = pdf / pdf.max()
-        data = []
-        for i in range(len(x) // 2):
-            data.append([alphas[i], x[i], x[::-1][i]])
-        data.append([alphas[i + 1], x[i + 1], x[::-1][i + 1]])
-        self.df = pd.DataFrame(columns=["alpha", "l", "r"], data=data, dtype=np.float)
-        self.convert_df(alpha_levels=alpha_levels)
-        self.df.sort_values(['alpha'], ascending=[True], inplace=True)
+        """discretize shape function
+
+        The membership function is the pdf of the generalized normal distribution
+        scaled to 1 and truncated to alpha0, the alpha cuts follow from its inverse.
 
+        :param alpha0: range at alpha=0
+        :param alpha1: not used
+        :param alpha_levels: number of alpha levels
+        :return: None
+        """
+        alpha = _get_alpha_grid(int(alpha_levels))
+        scale = self._get_distr_scale()
+        peak = np.clip(self.mean, alpha0[0], alpha0[1])
+        with np.errstate(divide="ignore"):
+            width = (abs(peak - self.mean) ** self.beta - scale ** self.beta * np.log(alpha)) ** (1. / self.beta)
+        self.values = _get_truncated_cuts(alpha, alpha0, self.mean, width)
+        # values are already on the alpha grid
+        self._number_of_alpha_levels = len(alpha)
+        self._alpha_grid = alpha
+
+
+def _get_truncated_cuts(alpha, alpha0, loc, width):
+    """alpha cuts of a symmetric membership function truncated to alpha0
+
+    :param alpha: alpha levels
+    :param alpha0: range at alpha=0
+    :param loc: center of the membership function
+    :param width: half widths of the alpha cuts
+    :return: alpha level array [alpha, l, r]
+    """
+    return np.column_stack((alpha,
+                            np.clip(loc - width, alpha0[0], alpha0[1]),
+                            np.clip(loc + width, alpha0[0], alpha0[1])))
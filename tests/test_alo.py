@@ -1,8 +1,12 @@
 # -*- coding: utf-8 -*-
 import sys
 is_py2 = sys.version_info.major == 2
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 import phuzzy
 import phuzzy.analysis.alo
+import phuzzy.expression
 
 def test_alo():
     v1 = phuzzy.Triangle(alpha0=[0,4], alpha1=[1], number_of_alpha_levels=5)
@@ -24,5 +28,73 @@ def test_alo():
     alo.calculation()
     print(alo)
 
+
+def test_objective_pool():
+    obj_function = '(x[0] - 1) ** 2 + x[1] * x[2]'
+    f = phuzzy.analysis.alo._Objective(obj_function, sign=-1, x_glob=np.array([[1., 3.]]))
+    f = pickle.loads(pickle.dumps(f))
+    assert np.isclose(f(np.array([2., 4.])), -13)
+
+    bounds = np.array([[1., 1.], [2., 2.], [3., 3.]])
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        res_min, res_max = pool.map(phuzzy.analysis.alo._optimize_level, [obj_function] * 2, [bounds] * 2,
+                                    [1, -1], [60] * 2, [3] * 2, ['sobol'] * 2)
+    assert np.isclose(res_min['fun'], 6)
+    assert np.isclose(res_max['fun'], -6)
+    assert res_min['nfev'] == 0
+    assert np.allclose(res_max['x'], [1, 2, 3])
+
+    # optimization with constant and non-constant bounds
+    bounds = np.array([[0., 4.], [-1., -1.], [1., 1.]])
+    res = phuzzy.analysis.alo._optimize_level(obj_function, bounds, 1, 60, 3, 'sobol')
+    assert res['nfev'] > 0
+    assert np.isclose(res['fun'], -1, atol=1e-4)
+    assert np.allclose(res['x'], [1, -1, 1], atol=1e-3)
+
+
+def test_parallel_calculation():
+    def calculation(obj_function='(x[0] - 2) ** 2 + x[0] * x[1]', **kwargs):
+        v1 = phuzzy.Triangle(alpha0=[0, 4], alpha1=[1], number_of_alpha_levels=4)
+        v2 = phuzzy.Trapezoid(alpha0=[-1, 2], alpha1=[0, 1], number_of_alpha_levels=4)
+        alo = phuzzy.analysis.alo.Alpha_Level_Optimization(var1=v1, var2=v2, name="z", obj_function=obj_function)
+        alo.calculation(n=30, iters=2, **kwargs)
+        return alo
+
+    alo = calculation()
+    assert np.allclose(alo.df[['l', 'r']].values, [[-2.25, 12], [-13 / 9., 6], [-2 / 3., 8 / 3.], [1, 2]],
+                       atol=1e-4)
+    for parallel in ['levels', 'hybrid']:
+        alo_parallel = calculation(workers=2, parallel=parallel)
+        assert np.allclose(alo_parallel.df.values, alo.df.values, atol=1e-4)
+        assert all(nfev > 0 for nfev in alo_parallel.nfev_list_min + alo_parallel.nfev_list_max)
+
+    # cached objective, points shared by the alpha levels are evaluated once
+    cached = phuzzy.expression.CachedExpression(expression=lambda x: (x[0] - 2) ** 2 + x[0] * x[1])
+    alo_cached = calculation(obj_function=cached)
+    assert np.allclose(alo_cached.df.values, alo.df.values, atol=1e-4)
+    assert cached.stats["hits"] > 0
+
+
+def test_compiled_expression():
+    f = phuzzy.analysis.alo.CompiledExpression('(x[0] - 1) ** 2 + sin(x[1])')
+    assert np.isclose(f(np.array([3., 0.])), 4)
+    X = np.random.RandomState(0).uniform(size=(50, 2))
+    assert np.allclose(f.evaluate(X), [f(x) for x in X])
+    f = pickle.loads(pickle.dumps(f))
+    assert np.allclose(f.evaluate(X), (X[:, 0] - 1) ** 2 + np.sin(X[:, 1]))
+
+    # not vectorized
+    f = phuzzy.analysis.alo.CompiledExpression('max(x[0], x[1])')
+    assert np.allclose(f.evaluate(X), X.max(axis=1))
+    f = phuzzy.analysis.alo.CompiledExpression('sum(x)')
+    assert np.allclose(f.evaluate(X), X.sum(axis=1))
+
+    # batch of points in the shgo objective, constant x[1] is inserted
+    obj = phuzzy.analysis.alo._Objective('(x[0] - 1) ** 2 + sin(x[1])', sign=-1., x_glob=np.array([[1, 0.5]]))
+    assert obj.vectorized
+    assert np.allclose(obj(X[:, :1].T), [obj(x) for x in X[:, :1]])
+    assert np.allclose(obj(X[:, :1].T), -((X[:, 0] - 1) ** 2 + np.sin(.5)))
+
+
 if __name__ == '__main__':
     test_alo()
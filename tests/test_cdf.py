@@ -17,6 +17,27 @@ def test_uniform():
     print(ppf)
 
 
+def test_exact_cdf():
+    t = phuzzy.Triangle(alpha0=[1, 4], alpha1=[2], number_of_alpha_levels=5)
+    x = np.linspace(0, 5, 51)
+    # generic piecewise linear cdf vs. closed form of the triangle
+    assert np.allclose(phuzzy.FuzzyNumber.cdf(t, x), t.cdf(x))
+    q = np.linspace(0, 1, 21)
+    assert np.allclose(phuzzy.FuzzyNumber.cdf(t, t.ppf(q)), q)
+    assert np.isclose(t.ppf(.5), 4 - np.sqrt(3))
+
+    p = phuzzy.Uniform(alpha0=[1, 2], number_of_alpha_levels=5)
+    assert np.allclose(p.ppf([0, .25, .5, 1]), [1, 1.25, 1.5, 2])
+    assert np.isclose(p.mean(), 1.5)
+
+    # cache is updated after in place modifications
+    p.df.loc[:, "r"] = 3.
+    assert np.isclose(p.mean(), 2)
+    p.values = [[0, 1, 1], [1, 1, 1]]
+    assert np.isclose(p.ppf(.3), 1)
+    assert np.allclose(phuzzy.FuzzyNumber.cdf(p, [0, 1, 2]), [0, 1, 1])
+
+
 def plot_traz_cdf():
 
     import matplotlib.pyplot as plt
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 import os
 import matplotlib.pyplot as plt
+import numpy as np
 
 import phuzzy.data
 import phuzzy.data.plots
@@ -18,6 +19,21 @@ def test_bootstrapping():
     # phuzzy.data.plots.bootstrapping(data, df_boot, show=True)
 
 
+def test_bootstrapping_seed():
+    raw_data = [84, 81, 72, 69, 61, 69, 74, 57, 65, 76, 56, 87, 99, 44, 46, 63]
+    data = phuzzy.data.Data(raw_data)
+    df_boot = data.bootstrap(n=1000, seed=1, chunksize=100)
+    assert df_boot.shape == (1000, 2)
+    assert np.isclose(df_boot.x_mean.mean(), np.mean(raw_data), rtol=.01)
+    assert (df_boot.x_std <= np.ptp(raw_data)).all()
+    assert np.array_equal(df_boot.values, data.bootstrap(n=1000, seed=1, chunksize=100).values)
+    assert np.array_equal(df_boot.values, data.bootstrap(n=1000, seed=1, chunksize=100, workers=2).values)
+
+    df_shuffle = data.shuffling(n=100, train_fraction=.5, seed=np.random.default_rng(1))
+    assert df_shuffle.shape == (100, 2)
+    assert df_shuffle.x_mean.max() <= max(raw_data[:8])
+
+
 def test_shuffling():
     raw_data = [84, 81, 72, 69, 61, 69, 74, 57, 65, 76, 56, 87, 99, 44, 46, 63]
     # raw_data = [84, 81, 72, 46, 63]
@@ -64,3 +80,47 @@ def test_histogram():
     axcdf.set_xlabel("x")
     axcdf.set_ylabel("p")
     # plt.show()
+
+
+def test_quantile_sketch():
+    raw_data = [84, 81, 72, 69, 61, 69, 74, 57, 45, 65, 76, 56, 87, 99, 44, 46, 63]
+    data = phuzzy.data.Data(raw_data)
+    sketch = phuzzy.data.QuantileSketch()
+    sketch.update(raw_data[:5])
+    sketch.update(raw_data[5:])
+    assert sketch.count == len(raw_data)
+    df = data.estimate_probability()
+    df_sketch = sketch.estimate_probability()
+    for col in ["x", "p_blom", "p_weibull", "p_rossow"]:
+        assert np.allclose(df[col].values, df_sketch[col].values)
+
+    x = np.random.default_rng(0).normal(size=100000)
+    a = phuzzy.data.QuantileSketch(compression=100)
+    b = phuzzy.data.QuantileSketch(compression=100)
+    for i, chunk in enumerate(np.array_split(x, 10)):
+        (a if i % 2 else b).update(chunk)
+    a.merge(b)
+    assert a.count == len(x)
+    assert len(a.means) <= 100
+    assert a.min == x.min() and a.max == x.max()
+    assert np.isclose(a.mean, x.mean())
+    q = [.01, .1, .5, .9, .99]
+    assert np.allclose(a.ppf(q), np.quantile(x, q), atol=.01)
+    assert np.allclose(a.cdf(a.ppf(q)), q)
+    p = a.get_fuzzynumber(number_of_alpha_levels=5)
+    assert np.allclose(p.alpha0[["l", "r"]], [x.min(), x.max()])
+    assert np.allclose(p.alpha1[["l", "r"]], np.median(x), atol=.01)
+
+
+def test_streaming_histogram():
+    x = np.random.default_rng(0).normal(size=10000)
+    a = phuzzy.data.Histogram(bins=20, range=(-3, 3))
+    b = phuzzy.data.Histogram(edges=a.edges)
+    a.update(x[:5000])
+    b.update(x[5000:])
+    a.merge(b)
+    assert a.count == len(x)
+    inside = x[(x >= -3) & (x <= 3)]
+    df = phuzzy.data.get_histogram_data(inside, bins=a.edges)
+    assert np.array_equal(a.to_df().frequency.values, df.frequency.values)
+    assert a.underflow + a.overflow == len(x) - len(inside)
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pytest
+
+import phuzzy
+
+
+def test_deferred():
+    P = phuzzy.TruncNorm(alpha0=[4950, 5050], name="P")
+    L = phuzzy.Triangle(alpha0=[1980, 2020], alpha1=[2000], name="L", number_of_alpha_levels=5)
+    E = phuzzy.Trapezoid(alpha0=[200000, 215000], alpha1=[205000, 210000], name="E")
+    I = phuzzy.Uniform(alpha0=[1e6, 1.1e6], name="I")
+    w = P * L ** 3 / (48 * E * I)
+
+    dP, dL, dE, dI = phuzzy.Deferred.variables_of(P, L, E, I)
+    d = dP * dL ** 3 / (48 * dE * dI)
+    assert d.name == "(P*(L^3))/((48*E)*I)"
+    assert len(d.variables()) == 4
+    assert d.repeated_variables() == []
+    z = d.evaluate()
+    assert isinstance(z, phuzzy.FuzzyNumber)
+    assert np.allclose(z.values, w.values)
+
+    # fuzzy numbers can be used as operands directly
+    z = (dP * L - 2).evaluate()
+    assert np.allclose(z.values, (P * L - 2).values)
+    assert np.allclose(abs(2000 - dL).evaluate().values, abs(L - 2000).values)
+
+
+def test_repeated_variables():
+    L = phuzzy.Triangle(alpha0=[1, 3], alpha1=[2], name="L", number_of_alpha_levels=5)
+    x = phuzzy.Deferred(L)
+    y = x - x
+    assert y.repeated_variables() == [L]
+    assert np.allclose(y.evaluate().values[0], [0, -2, 2])
+
+    # shared sub expressions are evaluated once, but count for each occurrence
+    z = x + 1
+    z = z * z
+    assert len(z.nodes()) == 4
+    assert z.repeated_variables() == [L]
+    assert np.allclose(z.evaluate().values[0], [0, 4, 16])
+
+
+def test_deferred_array():
+    L = phuzzy.Triangle(alpha0=[1, 3], alpha1=[2], name="L", number_of_alpha_levels=5)
+    A = phuzzy.FuzzyArray.from_trapezoids(alpha0=[[1, 4], [0, 4]], alpha1=[[2, 2], [2, 3]], number_of_alpha_levels=3)
+    z = (phuzzy.Deferred(A) * L - np.array([1., 2.])).evaluate()
+    assert isinstance(z, phuzzy.FuzzyArray)
+    assert z.number_of_alpha_levels == 5
+    assert np.allclose(z[1].values, (A * L - np.array([1., 2.]))[1].values)
+
+    z = (phuzzy.Deferred(L) * np.array([1., 2.])).evaluate(number_of_alpha_levels=3)
+    assert z.bounds.shape == (2, 3, 2)
+    assert np.allclose(z.bounds[1, 0], [2, 6])
+
+
+def test_invalid():
+    x = phuzzy.Deferred(phuzzy.Uniform(alpha0=[1, 2]))
+    with pytest.raises(TypeError):
+        x + "a"
+    with pytest.raises(ValueError):
+        phuzzy.Deferred(op="%", operands=(x, x))
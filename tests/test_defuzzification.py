@@ -1,5 +1,8 @@
+import numpy as np
+
 import phuzzy
 from phuzzy.mpl import mix_mpl
+from phuzzy.shapes import get_polygon_centroid
 
 
 def test_defuzzification():
@@ -8,5 +11,22 @@ def test_defuzzification():
     x = p.defuzzification(method='alpha_one')
     print(x)
 
+
+def test_defuzzification_centroid():
+    t = phuzzy.Triangle(alpha0=[1, 4], alpha1=[2], number_of_alpha_levels=5)
+    assert np.isclose(t.defuzzification(method='centroid'), 7. / 3)
+    assert np.isclose(t.defuzzification_centroid2(), 7. / 3)
+    u = phuzzy.Uniform(alpha0=[1, 4], number_of_alpha_levels=5)
+    assert np.isclose(u.defuzzification_centroid(), 2.5)
+    p = phuzzy.Trapezoid(alpha0=[0, 4], alpha1=[2, 3], number_of_alpha_levels=5)
+    assert np.isclose(p.defuzzification_centroid(), 2.2)
+
+    x = phuzzy.FuzzyArray.from_fuzzy_numbers([t, u, p])
+    assert np.allclose(x.defuzzification_centroid(), [7. / 3, 2.5, 2.2])
+
+    # polygons without area
+    assert np.isclose(get_polygon_centroid([2, 2], [0, 1]), 2)
+
+
 if __name__ == '__main__':
     test_defuzzification()
@@ -1,5 +1,8 @@
 # -*- coding: utf-8 -*-
 
+import numpy as np
+import pytest
+
 import phuzzy
 import phuzzy.approx.doe
 
@@ -31,3 +34,38 @@ def test_doe_lhs():
     assert y.min() <= doe.samples.iloc[:,1].min()
     assert y.max() >= doe.samples.iloc[:,1].max()
 
+
+def test_update_training_results():
+    x = phuzzy.TruncNorm(alpha0=[1, 2], name="x")
+    y = phuzzy.Triangle(alpha0=[3, 6], alpha1=[4], name="y")
+
+    expr = phuzzy.approx.doe.Expression(designvars=[x, y], function=lambda x, y: x + y, name="x+y")
+    expr.generate_training_doe(n=100, method="lhs")
+    expr.eval()
+    df = expr.results_training
+    z = phuzzy.FuzzyNumber.from_results(df)
+    assert np.allclose(expr.get_fuzzynumber_from_results().values, z.values)
+
+    # feed the results in chunks
+    expr.results_training = None
+    assert expr.results_training is None
+    for i in range(0, len(df), 30):
+        expr.update_training_results(df.iloc[i:i + 30])
+        zi = phuzzy.FuzzyNumber.from_results(df.iloc[:i + 30])
+        assert np.allclose(expr.results_accumulator.values, zi.values)
+    assert expr.results_accumulator.count == len(df)
+    # only min and max of each alpha level are kept
+    assert len(expr.results_training) < len(df)
+    assert np.allclose(phuzzy.FuzzyNumber.from_results(expr.results_training).values, z.values)
+    assert np.allclose(expr.get_fuzzynumber_from_results().values, z.values)
+    with pytest.raises(ValueError):
+        expr.fit_model()
+
+    doe_training = expr.doe_training
+    expr = phuzzy.approx.doe.Expression(designvars=[x, y], function=lambda x, y: x + y, name="x+y",
+                                        keep_samples=True)
+    expr.doe_training = doe_training
+    for i in range(0, len(df), 30):
+        expr.update_training_results(df.iloc[i:i + 30])
+    assert len(expr.results_training) == len(df)
+    assert np.allclose(expr.get_fuzzynumber_from_results().values, z.values)
@@ -1,7 +1,16 @@
 # -*- coding: utf-8 -*-
 
+import os
+import sys
+import threading
+
+import numpy as np
+import pytest
+
 import phuzzy
+import phuzzy.analysis
 import phuzzy.approx.doe
+import phuzzy.expression
 
 
 def f(x1, x2):
@@ -38,3 +47,114 @@ def test_expression():
     # assert x.max() >= doe.samples.iloc[:,0].max()
     # assert y.min() <= doe.samples.iloc[:,1].min()
     # assert y.max() >= doe.samples.iloc[:,1].max()
+
+
+def test_cached_expression(tmpdir):
+    calls = []
+
+    def g(x1, x2=0.):
+        calls.append((x1, x2))
+        return x1 ** 2 + x2
+
+    filepath = str(tmpdir.join("cache.sqlite"))
+    expr = phuzzy.expression.Expression(name="g", function=g)
+    cached = phuzzy.expression.CachedExpression(expression=expr, filepath=filepath, maxsize=2, key="g")
+    assert cached.name == "g"
+    assert cached(2., x2=1.) == 5
+    assert cached(2. + 1e-15, x2=1.) == 5
+    assert cached(np.array([1., 2.])).tolist() == [1, 4]
+    assert cached(3.) == 9
+    assert cached(3) == 9
+    assert len(calls) == 3
+    assert cached.stats["hits"] == 2
+    assert cached.stats["misses"] == 3
+    assert cached.stats["size"] == 2
+
+    # restart
+    cached.close()
+    cached = phuzzy.expression.CachedExpression(expression=expr, filepath=filepath, key="g")
+    assert cached(2., x2=1.) == 5
+    assert cached.stats["disk_hits"] == 1
+    assert len(calls) == 3
+    cached.close()
+
+    # other expression, same arguments
+    cached = phuzzy.expression.CachedExpression(expression=phuzzy.expression.Expression(function=lambda x1: x1),
+                                                filepath=filepath)
+    assert cached(3.) == 3
+    assert cached.stats["misses"] == 1
+    cached.close()
+
+
+def test_cached_expression_key(tmpdir):
+    def mk(a):
+        return lambda x: a * x
+
+    filepath = str(tmpdir.join("cache.sqlite"))
+    cached = phuzzy.expression.CachedExpression(expression=phuzzy.expression.Expression(function=mk(2)),
+                                                filepath=filepath)
+    assert cached(2.) == 4
+    cached.close()
+    cached = phuzzy.expression.CachedExpression(expression=phuzzy.expression.Expression(function=mk(3)),
+                                                filepath=filepath)
+    assert cached(2.) == 6
+    assert cached.stats["misses"] == 1
+    cached.close()
+
+    class Model(object):
+        def __init__(self, a):
+            self.a = a
+
+        def f(self, x):
+            return self.a * x
+
+    # bound methods are identified by the state of their instance
+    cached = phuzzy.expression.CachedExpression(expression=Model(2).f)
+    assert cached.key == phuzzy.expression.CachedExpression(expression=Model(2).f).key
+    assert cached.key != phuzzy.expression.CachedExpression(expression=Model(3).f).key
+    assert cached(2.) == 4
+    cached = phuzzy.expression.CachedExpression(expression=np.sin)
+    assert cached.key == "ufunc:numpy.sin"
+
+    # unpicklable state
+    lock = threading.Lock()
+    with pytest.raises(ValueError, match="key="):
+        phuzzy.expression.CachedExpression(expression=lambda x: lock is None)
+    cached = phuzzy.expression.CachedExpression(expression=lambda x: lock is None, key="lock")
+    assert cached(1.) is False
+
+
+def test_cached_cli_expression(tmpdir):
+    path = os.path.dirname(__file__)
+    expr = phuzzy.expression.CliExpression(cmd=[sys.executable, "f2.py"], workpath=path)
+    assert expr(3) == 9
+    cached = phuzzy.expression.CachedExpression(expression=expr, filepath=str(tmpdir.join("cache.sqlite")))
+    assert cached(3) == 9
+    assert cached(3) == 9
+    assert cached.stats["misses"] == 1
+    cached.close()
+
+    # result file
+    expr = phuzzy.expression.CliExpression(cmd=[sys.executable, os.path.join(path, "expensive_cli_expression.py"), "-x"],
+                                           workpath=str(tmpdir), resultfile="expensive_cli_expression.res")
+    assert expr(4) == 16
+
+
+def test_cached_fuzzy_analysis():
+    calls = []
+
+    def f(x):
+        calls.append(x)
+        return x[0] ** 2 + x[1]
+
+    x = phuzzy.Triangle(alpha0=[1, 3], alpha1=[2], number_of_alpha_levels=5)
+    y = phuzzy.Uniform(alpha0=[0, 1], number_of_alpha_levels=5)
+    z = phuzzy.analysis.FuzzyAnalysis(designvars=[x, y], function=f).eval(method="vertex")
+    n_calls = len(calls)
+    cached = phuzzy.expression.CachedExpression(expression=f, key="f")
+    z_cached = phuzzy.analysis.FuzzyAnalysis(designvars=[x, y], function=cached).eval(method="vertex")
+    assert np.allclose(z_cached.values, z.values)
+    # the vertices of y are shared by all alpha levels, the alpha=1 vertices are shared by pairs
+    assert cached.stats["misses"] == len(calls) - n_calls == 2 * 9
+    z_cached = phuzzy.analysis.FuzzyAnalysis(designvars=[x, y], function=cached).eval(method="vertex")
+    assert cached.stats["misses"] == 18
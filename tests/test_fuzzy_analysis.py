@@ -3,6 +3,7 @@
 import phuzzy
 import phuzzy.analysis
 import numpy as np
+import pytest
 import phuzzy as ph
 
 def test_fuzzy_analysis():
@@ -24,6 +25,51 @@ def test_fuzzy_analysis():
     assert np.isclose(z.min(), a)
 
 
+def test_fuzzy_analysis_vertex():
+    def f(x):
+        P = x[0]
+        L = x[1]
+        E = x[2]
+        return P * L ** 3 / (48 * E)
+
+    P = phuzzy.Triangle(alpha0=[4950, 5050], alpha1=[5000], name="P", number_of_alpha_levels=5)
+    L = phuzzy.TruncNorm(alpha0=[1980, 2020], name="L", number_of_alpha_levels=11)
+    E = phuzzy.Uniform(alpha0=[27000, 33000], name="E", number_of_alpha_levels=3)
+
+    pa = phuzzy.analysis.FuzzyAnalysis(designvars=[P, L, E], function=f)
+    z = pa.eval(method="vertex", check_monotonicity=True, seed=1)
+    assert len(z.df) == 11
+    assert np.allclose(z.values, f([P, L, E]).values)
+
+    # not vectorized
+    calls = []
+
+    def g(x):
+        calls.append(x)
+        return f(x)
+
+    pa = phuzzy.analysis.FuzzyAnalysis(designvars=[P, L, E], function=g)
+    z2 = pa.eval(method="vertex", vectorized=False)
+    assert len(calls) == 11 * 2 ** 3
+    assert np.allclose(z.values, z2.values)
+
+
+def test_fuzzy_analysis_vertex_not_monotonic():
+    def f(x):
+        return (x[0] - 1) ** 2 + x[1]
+
+    x = phuzzy.Triangle(alpha0=[0, 2], alpha1=[1], name="x", number_of_alpha_levels=3)
+    y = phuzzy.Uniform(alpha0=[0, 1], name="y", number_of_alpha_levels=3)
+    pa = phuzzy.analysis.FuzzyAnalysis(designvars=[x, y], function=f)
+    z = pa.eval(method="vertex")
+    # the minimum at x=1 is missed on alpha=0
+    assert np.isclose(z.df.l[0], 1)
+    with pytest.raises(ValueError):
+        pa.eval(method="vertex", check_monotonicity=True)
+    with pytest.raises(ValueError):
+        pa.eval(method="foo")
+
+
 def test_lcefa():
 
     a = 1.23
@@ -5,6 +5,7 @@ is_py2 = sys.version_info.major == 2
 import pytest
 import phuzzy
 import numpy as np
+import pandas as pd
 from io import StringIO
 
 def test_number_of_alpha_levels():
@@ -128,6 +129,21 @@ def test_unify():
     a, b = x._unify(y)
     assert len(a.df) == 7
     assert len(b.df) == 7
+    assert b is y
+    assert a is not x
+    assert len(x.df) == 5
+
+    z = phuzzy.Triangle(alpha0=[1, 4], alpha1=[2], number_of_alpha_levels=7)
+    b, c = y._unify(z)
+    assert b is y
+    assert c is z
+    assert y._alpha_grid is z._alpha_grid
+
+    # modified alpha levels are not taken from the cache
+    y.df.loc[1, "alpha"] = .1
+    b, c = y._unify(z)
+    assert b is not y
+    assert np.allclose(b.df.alpha, c.df.alpha)
 
 
 def test_discretize():
@@ -168,5 +184,117 @@ def test_from_data():
     print(x.__class__.__name__)
 
 
+def test_triangle_from_data():
+    data = np.random.default_rng(0).triangular(-3, -1, 8, 10000)
+    t = phuzzy.Triangle.from_data(data=data, n=0)
+    assert np.allclose(t.alpha0[["l", "r"]], [data.min(), data.max()])
+    assert np.isclose(t.alpha1.l, 3 * data.mean() - data.min() - data.max())
+
+    chunks = iter(np.array_split(data, 7))
+    assert np.allclose(phuzzy.Triangle.from_data(data=chunks, n=0).values, t.values)
+    # bootstrap averaging by default
+    assert np.isclose(phuzzy.Triangle.from_data(data=data, seed=1).alpha1.l, t.alpha1.l, atol=.05)
+
+    b1 = phuzzy.Triangle.from_data(data=data, n=20, seed=1, chunksize=1000)
+    assert np.allclose(b1.values, phuzzy.Triangle.from_data(data=data, n=20, seed=1, chunksize=1000).values)
+    assert np.isclose(b1.alpha1.l, t.alpha1.l, atol=.05)
+    b2 = phuzzy.Triangle.from_data(data=iter(np.array_split(data, 3)), n=20, seed=1, chunksize=1000)
+    assert np.isclose(b2.alpha1.l, t.alpha1.l, atol=.05)
+
+
+def test_values():
+    t = phuzzy.Triangle(alpha0=[1, 3], alpha1=[2], number_of_alpha_levels=5)
+    assert t.values.shape == (5, 3)
+    assert t.values.dtype == np.float64
+    assert t.values.flags["C_CONTIGUOUS"]
+    assert np.allclose(t.values, t.df.values)
+    assert t.df is t.df
+
+    t.df.loc[0, "l"] = 0.
+    assert np.isclose(t.values[0, 1], 0.)
+    assert np.isclose(t.min(), 0.)
+
+    # reading df keeps the alpha level array and the alpha grid
+    data = t.values
+    str(t)
+    assert t.values is data
+    grid = phuzzy.shapes._get_alpha_grid(5)
+    assert t._has_alpha_grid(grid) and t._alpha_grid is grid
+    df = t.df
+    df.loc[4, "alpha"] = .9
+    assert not t._has_alpha_grid(grid)
+    df.loc[4, "alpha"] = 1.
+    t.values[4, 2] = 2.5
+    assert np.isclose(t.df.r[4], 2.5)
+
+    t.values = [[0., 1., 3.], [1., 2., 2.]]
+    assert len(t.df) == 2
+    assert np.allclose(t.df.l, [1, 2])
+
+    n = phuzzy.FuzzyNumber()
+    assert n.values is None
+    assert n.df is None
+
+
+def test_make_convex():
+    x = phuzzy.FuzzyNumber(name="x")
+    x.values = [[0., 1., 5.], [.25, 2., 3.], [.5, 1.5, 4.], [.75, np.nan, np.nan], [1., 3., 3.5]]
+    assert not x.is_convex()
+    x.make_convex()
+    assert np.allclose(x.df.l, [1, 1.5, 1.5, 3, 3])
+    assert np.allclose(x.df.r, [5, 4, 4, 3.5, 3.5])
+    assert x.is_convex()
+
+    t = phuzzy.Triangle(alpha0=[1, 3], alpha1=[2], number_of_alpha_levels=5)
+    assert t.is_convex()
+    assert (-t).is_convex()
+    assert (t ** 2).is_convex()
+
+
+def test_alpha():
+    t = phuzzy.Trapezoid(alpha0=[1, 4], alpha1=[2, 3], number_of_alpha_levels=5)
+    x = [0, 1, 1.5, 2.5, 3.5, 5]
+    assert np.allclose(t.alpha(x), [0, 0, .5, 1, .5, 0])
+    assert np.allclose(t.get_alpha_from_value(x), [0, 0, .5, 1, .5, 0])
+    assert len(t.get_shape()) == 10
+
+    # modified alpha levels
+    t.df.loc[:, "r"] = [5, 4.5, 4, 3.5, 3]
+    assert np.allclose(t.alpha(4), .5)
+    assert np.allclose(t.get_alpha_from_value(4), .5)
+    t.values = [[0, 1, 1], [1, 1, 1]]
+    assert np.allclose(t.alpha([0, 1, 2]), [0, 1, 0])
+    assert len(t.get_shape()) == 2
+
+
+def test_from_results():
+    df = pd.DataFrame({"alpha": [0., .1, .5, .55, 1., 1.],
+                       "res": [0., 5., 2., 1.5, 3., 2.5]})
+    z = phuzzy.FuzzyNumber.from_results(df, name="z", number_of_alpha_levels=2)
+    assert z.name == "z"
+    assert np.allclose(z.values, [[0, 0, 5], [.5, 1.5, 3], [1, 2.5, 3]])
+
+    chunks = [df.iloc[:3], df.iloc[3:4], df.iloc[4:], df.iloc[:0]]
+    z2 = phuzzy.FuzzyNumber.from_results_chunks(chunks, number_of_alpha_levels=2)
+    assert np.allclose(z.values, z2.values)
+
+
+def test_sampler():
+    t = phuzzy.Triangle(alpha0=[1, 4], alpha1=[2], number_of_alpha_levels=5)
+    sampler = t.sampler(seed=1)
+    x = sampler.rvs(10000)
+    assert x.shape == (10000,)
+    assert t.min() <= x.min() and x.max() <= t.max()
+    assert abs(np.median(x) - t.ppf(.5)) < .05
+    assert sampler.rvs((2, 3)).shape == (2, 3)
+
+    # reproducible with seeds and generators
+    assert np.allclose(t.sampler(seed=2).rvs(10), t.rvs(10, seed=np.random.default_rng(2)))
+
+    chunks = list(t.sampler(seed=3).iter_rvs(25, chunksize=10))
+    assert [len(c) for c in chunks] == [10, 10, 5]
+    assert np.allclose(np.hstack(chunks), t.sampler(seed=3).rvs(25))
+
+
 if __name__ == '__main__':
     test_fuzzy()
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pytest
+
+import phuzzy
+
+
+def test_from_fuzzy_numbers():
+    t = phuzzy.Triangle(alpha0=[1, 4], alpha1=[2], number_of_alpha_levels=5)
+    p = phuzzy.Trapezoid(alpha0=[0, 4], alpha1=[2, 3], number_of_alpha_levels=3)
+    x = phuzzy.FuzzyArray.from_fuzzy_numbers([t, p], name="x")
+    assert len(x) == 2
+    assert x.bounds.shape == (2, 5, 2)
+    assert np.allclose(x[0].values, t.values)
+    p.number_of_alpha_levels = 5
+    assert np.allclose(x[1].values, p.values)
+    assert len(x.to_fuzzy_numbers()) == 2
+    assert len(x[:1]) == 1
+
+
+def test_from_trapezoids():
+    x = phuzzy.FuzzyArray.from_trapezoids(alpha0=[[1, 4], [0, 4]], alpha1=[[2, 2], [2, 3]], number_of_alpha_levels=5)
+    t = phuzzy.Triangle(alpha0=[1, 4], alpha1=[2], number_of_alpha_levels=5)
+    p = phuzzy.Trapezoid(alpha0=[0, 4], alpha1=[2, 3], number_of_alpha_levels=5)
+    assert np.allclose(x[0].values, t.values)
+    assert np.allclose(x[1].values, p.values)
+
+    y = phuzzy.FuzzyArray.from_trapezoids(alpha0=[[1, 4], [0, 4]], alpha1=[2, 3], number_of_alpha_levels=5)
+    assert np.allclose(y.bounds[:, -1], [[2, 2], [3, 3]])
+
+
+def test_operators():
+    t = phuzzy.Triangle(alpha0=[1, 4], alpha1=[2], number_of_alpha_levels=5)
+    p = phuzzy.Trapezoid(alpha0=[0.5, 4], alpha1=[2, 3], number_of_alpha_levels=5)
+    u = phuzzy.Uniform(alpha0=[2, 3], number_of_alpha_levels=5)
+    x = phuzzy.FuzzyArray.from_fuzzy_numbers([t, p])
+    y = phuzzy.FuzzyArray.from_fuzzy_numbers([u, t])
+
+    for z, zs in [(x + y, [t + u, p + t]),
+                  (x - y, [t - u, p - t]),
+                  (x * y, [t * u, p * t]),
+                  (x / y, [t / u, p / t]),
+                  (x ** y, [t ** u, p ** t]),
+                  (x * 2., [t * 2., p * 2.]),
+                  (x + u, [t + u, p + u]),
+                  (u * x, [u * t, u * p]),
+                  (x ** 2, [t ** 2, p ** 2]),
+                  (-x, [-t, -p]),
+                  (abs(x - 2), [abs(t - 2), abs(p - 2)])]:
+        for i, zi in enumerate(zs):
+            assert np.allclose(z[i].values, zi.values)
+
+
+def test_crisp_operands():
+    x = phuzzy.FuzzyArray.from_trapezoids(alpha0=[[1, 4], [0, 4]], alpha1=[[2, 2], [2, 3]], number_of_alpha_levels=3)
+    z = x * np.array([1., -2.])
+    assert np.allclose(z.bounds[1, 0], [-8, 0])
+    z = np.array([1., -2.]) * x
+    assert np.allclose(z.bounds[1, 0], [-8, 0])
+    z = 5 - x
+    assert np.allclose(z.bounds[0, 0], [1, 4])
+    z = 1. / x
+    assert np.allclose(z.bounds[0, 0], [.25, 1])
+
+
+def test_zero_power():
+    p = phuzzy.Trapezoid(alpha0=[-2, 2], alpha1=[-1, 1], number_of_alpha_levels=5)
+    x = phuzzy.FuzzyArray.from_fuzzy_numbers([p])
+    y = x ** 2
+    assert np.isclose(y.min()[0], 0)
+    assert np.isclose(y.max()[0], 4)
+    assert np.allclose(y.bounds[0, -1], [0, 1])
+    y = x ** 3
+    assert np.allclose(y.bounds[0, 0], [-8, 8])
+
+
+def test_alpha_levels():
+    t = phuzzy.Triangle(alpha0=[1, 4], alpha1=[2], number_of_alpha_levels=3)
+    p = phuzzy.Trapezoid(alpha0=[0, 4], alpha1=[2, 3], number_of_alpha_levels=5)
+    x = phuzzy.FuzzyArray.from_fuzzy_numbers([t])
+    z = x + p
+    assert z.number_of_alpha_levels == 5
+    assert np.allclose(z[0].values, (t + p).values)
+
+
+def test_invalid():
+    with pytest.raises(ValueError):
+        phuzzy.FuzzyArray(bounds=np.zeros((2, 3, 3)))
+    x = phuzzy.FuzzyArray.from_trapezoids(alpha0=[[1, 4]], alpha1=[2])
+    with pytest.raises(TypeError):
+        x + "a"
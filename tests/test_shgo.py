@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+
+from phuzzy.contrib.shgo import shgo
+
+
+def f(x):
+    return (x[0] - .3) ** 2 + (x[1] + .2) ** 2 + np.sin(5 * x[0])
+
+
+def g(x):
+    return x[0] + x[1] - .2
+
+
+def test_vectorized():
+    bounds = [(-1, 1), (-1, 1)]
+    calls = []
+
+    def f_counted(x):
+        calls.append(np.shape(x))
+        return f(x)
+
+    for kwargs in [dict(sampling_method="simplicial", iters=3),
+                   dict(sampling_method="simplicial", iters=3, constraints={"type": "ineq", "fun": g}),
+                   dict(sampling_method="sobol", n=60),
+                   dict(sampling_method="sobol", n=60, constraints={"type": "ineq", "fun": g})]:
+        del calls[:]
+        res = shgo(f_counted, bounds, **kwargs)
+        n_calls = len(calls)
+        del calls[:]
+        res_vectorized = shgo(f_counted, bounds, options={"vectorized": True}, **kwargs)
+        assert np.allclose(res_vectorized.x, res.x)
+        assert np.isclose(res_vectorized.fun, res.fun)
+        assert res_vectorized.nfev == res.nfev
+        # sampling points are evaluated in batches (dim, n)
+        batches = [shape for shape in calls if len(shape) == 2]
+        assert batches and all(shape[0] == 2 for shape in batches)
+        assert len(calls) < n_calls
+        assert sum(shape[1] if len(shape) == 2 else 1 for shape in calls) == n_calls
+
+
+def test_workers():
+    bounds = [(-1, 1), (-1, 1)]
+    for kwargs in [dict(sampling_method="simplicial", iters=3),
+                   dict(sampling_method="sobol", n=60, constraints={"type": "ineq", "fun": g})]:
+        res = shgo(f, bounds, **kwargs)
+        for options in [{"workers": 3}, {"workers": 2, "pool": "process"}]:
+            res_parallel = shgo(f, bounds, options=options, **kwargs)
+            assert np.allclose(res_parallel.x, res.x)
+            assert np.isclose(res_parallel.fun, res.fun)
+            assert np.allclose(res_parallel.funl, res.funl)
+            assert np.allclose(res_parallel.xl, res.xl)
+            assert res_parallel.nlfev == res.nlfev
+            # reproducible order of the local minima
+            assert np.array_equal(shgo(f, bounds, options=options, **kwargs).xl, res_parallel.xl)
+
+    res = shgo(f, bounds, iters=3, options={"workers": 2, "local_iter": 1})
+    assert len(res.xl) == 1
+
+
+def test_sobol_points():
+    from phuzzy.contrib.shgo.shgo_m import sobol_seq
+
+    # Bratley-Fox direction numbers (dim <= 40)
+    points = sobol_seq.Sobol().i4_sobol_generate(3, 16, skip=0)
+    assert np.allclose(points[:4], [[0, 0, 0], [.5, .5, .5], [.75, .25, .75], [.25, .75, .25]])
+    assert np.array_equal(sobol_seq.Sobol().i4_sobol_generate(3, 10, skip=6), points[6:])
+    # Joe-Kuo direction numbers, the first two dimensions coincide
+    assert np.array_equal(sobol_seq.sobol_points(16, 3)[:, :2], points[:, :2])
+
+    points = sobol_seq.sobol_points(300, 50)
+    assert points.shape == (300, 50)
+    assert np.array_equal(sobol_seq.sobol_points(200, 50, skip=100), points[100:])
+    assert np.array_equal(sobol_seq.sobol_points(300, 10), points[:, :10])
+    # balanced: each coordinate of the first 256 points hits every bin of width 1/256 once
+    assert np.all(np.sort(points[:256], axis=0) == np.arange(256)[:, None] / 256.)
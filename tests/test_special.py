@@ -105,3 +105,31 @@ def test_pow_zero():
     print(y.df.values.tolist())
     assert np.isclose(y.min(), 1)
     assert np.isclose(y.max(), 1)
+
+
+def test_pow_zero_analytic():
+    p = phuzzy.Trapezoid(alpha0=[-2, 2], alpha1=[-1, 1], number_of_alpha_levels=5)
+    y = p ** 3
+    assert np.allclose(y.df.iloc[0][["l", "r"]], [-8, 8])
+    assert np.allclose(y.df.iloc[-1][["l", "r"]], [-1, 1])
+
+    y = p ** -1
+    assert np.all(np.isneginf(y.df.l))
+    assert np.all(np.isposinf(y.df.r))
+
+    y = p ** -2
+    assert np.isclose(y.min(), .25)
+    assert np.isposinf(y.max())
+
+    x = phuzzy.Trapezoid(alpha0=[-1, 4], alpha1=[.5, .8], number_of_alpha_levels=5)
+    y = x ** .5
+    assert np.isclose(y.min(), 0)
+    assert np.isclose(y.max(), 2)
+
+    # crisp fuzzy exponent
+    e = phuzzy.Uniform(alpha0=[3, 3], number_of_alpha_levels=5)
+    assert np.allclose((p ** e).values, (p ** 3).values)
+
+    x = phuzzy.FuzzyArray.from_fuzzy_numbers([p])
+    for e in [3, -1, -2]:
+        assert np.allclose((x ** e)[0].values, (p ** e).values)
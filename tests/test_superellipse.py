@@ -10,10 +10,11 @@ def test_superellipse():
     print(p)
     print(p.df)
     print(p.df.values.tolist())
-    ref = [[0.0, -1.0, 2.0], [0.16666666666666666, -0.9115491552521021, 1.9115491552521022],
-           [0.3333333333333333, -0.8103641352538279, 1.810364135253828], [0.5, -0.6905434026749685, 1.6905434026749686],
-           [0.6666666666666666, -0.5400341501766197, 1.54003415017662],
-           [0.8333333333333333, -0.3254711824961655, 1.3254711824961656], [1.0, 0.5, 0.5]]
+    # r = 1.5 * (1 - alpha) ** (1 / 3)
+    ref = [[0.0, -1.0, 2.0], [0.16666666666666666, -0.9115540433215428, 1.911554043321543],
+           [0.3333333333333333, -0.8103706971044484, 1.810370697104448], [0.5, -0.6905507889761497, 1.69055078897615],
+           [0.6666666666666666, -0.540041911525952, 1.540041911525952],
+           [0.8333333333333333, -0.3254818122236569, 1.325481812223657], [1.0, 0.5, 0.5]]
 
     assert np.allclose(p.df.values.tolist(), ref)
 
@@ -15,3 +15,30 @@ def test_tgo():
     res = phuzzy.contrib.tgo.tgo(f, bounds, args=(), g_cons=None, g_args=(), n=50)
     print(res)
     assert np.allclose(res.x, [1, -.4])
+
+
+def test_tgo_nearest_neighbours():
+    bounds = [(-6, 6), (-6, 6)]
+    calls = []
+
+    def f_counted(x):
+        calls.append(np.shape(x))
+        return f(x)
+
+    res = phuzzy.contrib.tgo.tgo(f_counted, bounds, n=100)
+    n_calls = len(calls)
+    del calls[:]
+    res_vectorized = phuzzy.contrib.tgo.tgo(f_counted, bounds, n=100, options={"vectorized": True})
+    assert calls[0] == (2, 100)
+    assert len(calls) == n_calls - 99
+    assert np.allclose(res_vectorized.x, res.x)
+    assert np.allclose(res_vectorized.xl, res.xl)
+
+    # no dense distance matrix, the topograph has only the needed columns
+    TGOc = phuzzy.contrib.tgo._tgo.TGO(f, bounds, n=20000, k_t=3)
+    TGOc.sampling()
+    T, H, F = TGOc.topograph()
+    assert T.shape == (20000, 3)
+    assert not hasattr(TGOc, "Y")
+    res = phuzzy.contrib.tgo.tgo(f, bounds, n=20000, k_t=3)
+    assert np.allclose(res.x, [1, -.4])
@@ -1,6 +1,11 @@
+# -*- coding: utf-8 -*-
+
 import matplotlib.pyplot as plt
 
 import numpy as np
+import scipy.stats
+
+import phuzzy
 from phuzzy.mpl import TruncNorm
 
 
@@ -12,10 +17,10 @@ def test_truncnorm():
     print(p)
     print(p.df)
     print(p.df.values.tolist())
-    ref = [[0.0, 0.0, 2.0], [0.16666666666666666, 0.36898774621220265, 1.6310122537877976],
-           [0.3333333333333333, 0.505893899432985, 1.4941061005670149], [0.5, 0.6075291624853785, 1.3924708375146215],
-           [0.6666666666666666, 0.6998279866511387, 1.3001720133488615],
-           [0.8333333333333333, 0.7987198538648325, 1.2012801461351676], [1.0, 1.0, 1.0]]
+    ref = [[0.0, 0.0, 2.0], [0.16666666666666666, 0.3689938423917182, 1.6310061576082817],
+           [0.3333333333333333, 0.5058987308774963, 1.4941012691225037], [0.5, 0.6075299924948419, 1.3924700075051581],
+           [0.6666666666666666, 0.6998277871664835, 1.3001722128335165],
+           [0.8333333333333333, 0.798714378283575, 1.201285621716425], [1.0, 1.0, 1.0]]
     assert np.allclose(p.df.values.tolist(), ref)
 
 
@@ -25,3 +30,34 @@ def plot():
     p = TruncNorm(alpha0=alpha0, alpha1=None, number_of_alpha_levels=17, std=(alpha0[1] - alpha0[0]) / 6.)
     p.plot(show=True)
     plt.show()
+
+
+def test_truncnorm_membership():
+    t = phuzzy.TruncNorm(alpha0=[1, 3], number_of_alpha_levels=5)
+    assert np.allclose(t.alpha0[["l", "r"]], [1, 3])
+    assert np.allclose(t.alpha1[["l", "r"]], [2, 2])
+    # the membership function is the scaled normal pdf
+    d = scipy.stats.norm(loc=2, scale=2 / 6.)
+    alpha, l, r = t.values[1:].T
+    assert np.allclose(d.pdf(l) / d.pdf(2), alpha)
+    assert np.allclose(d.pdf(r) / d.pdf(2), alpha)
+
+
+def test_truncgennorm():
+    t = phuzzy.TruncGenNorm(alpha0=[1, 4], beta=5, number_of_alpha_levels=5)
+    assert np.allclose(t.alpha0[["l", "r"]], [1, 4])
+    assert np.allclose(t.alpha1[["l", "r"]], [2.5, 2.5])
+    d = t.distr
+    alpha, l, r = t.values[1:].T
+    assert np.allclose(d.pdf(l) / d.pdf(2.5), alpha)
+    assert np.allclose(d.pdf(r) / d.pdf(2.5), alpha)
+
+
+def test_truncgennorm_scale():
+    from phuzzy.shapes.truncnorm import _gennorm_quantiles
+
+    for alpha0, beta in [([1, 4], 5), ([-10, 30], 5), ([1, 4], 1.5)]:
+        t = phuzzy.TruncGenNorm(alpha0=alpha0, beta=beta)
+        assert np.allclose(t.distr.ppf([.001, .5, .999]), [alpha0[0], np.mean(alpha0), alpha0[1]])
+    assert (5., .999) in _gennorm_quantiles
+    assert (1.5, .999) in _gennorm_quantiles